@@ -3,6 +3,7 @@ import { GoogleAuth } from "google-auth-library";
 
 import configs from "../configs.js";
 import { type GenerationInput } from "../models/generations.js";
+import { signGcsUri, signImageVariants } from "./storage.js";
 
 const auth = new GoogleAuth();
 
@@ -69,6 +70,13 @@ export async function sendGeneration(request: GenerationInput) {
 
         const data = runResponse.data;
 
+        // One-shot run: nothing reads the session afterwards
+        client
+            .request({ url: sessionUrl, method: "DELETE" })
+            .catch((error) =>
+                console.warn(`Could not delete session ${sessionId}:`, error),
+            );
+
         // get final answer
         const builderData = Array.isArray(data) ? data[data.length - 1] : data;
 
@@ -79,6 +87,14 @@ export async function sendGeneration(request: GenerationInput) {
             id: string;
             final_image_gcs_path: string;
             final_audio_gcs_path: string;
+            final_image_variants?: Record<string, string>;
+            siblings?: {
+                id: string;
+                language: string;
+                final_image_gcs_path: string;
+                final_audio_gcs_path: string;
+                final_image_variants?: Record<string, string>;
+            }[];
         };
 
         return answer;
@@ -90,3 +106,89 @@ export async function sendGeneration(request: GenerationInput) {
         return null;
     }
 }
+
+export type GenerationProgressEvent = {
+    type:
+        | "sentence_persisted"
+        | "audio_ready"
+        | "raw_image_ready"
+        | "composite_ready"
+        | "completed"
+        | "failed";
+    id?: string;
+    final_image_gcs_path?: string;
+    final_audio_gcs_path?: string;
+    final_image_variants?: Record<string, string>;
+    [key: string]: unknown;
+};
+
+export async function signProgressEvent(
+    event: GenerationProgressEvent,
+): Promise<GenerationProgressEvent> {
+    const [audioUrl, imageUrl, imageVariants] = await Promise.all([
+        signGcsUri(event.final_audio_gcs_path),
+        signGcsUri(event.final_image_gcs_path),
+        signImageVariants(event.final_image_variants),
+    ]);
+
+    return {
+        ...event,
+        ...(audioUrl && { final_audio_gcs_path: audioUrl }),
+        ...(imageUrl && { final_image_gcs_path: imageUrl }),
+        ...(imageVariants && { final_image_variants: imageVariants }),
+    };
+}
+
+// Calls the agent's server-sent events route and hands over each progress
+// event as soon as it arrives. Resolves with the final event (completed or
+// failed), or null if the stream ended without one.
+export async function streamGeneration(
+    request: GenerationInput,
+    onEvent: (event: GenerationProgressEvent) => void | Promise<void>,
+): Promise<GenerationProgressEvent | null> {
+    try {
+        const client = await auth.getIdTokenClient(configs.generationEndpoint);
+
+        const response = await client.request<NodeJS.ReadableStream>({
+            url: `${configs.generationEndpoint}/generations/stream`,
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            data: request,
+            responseType: "stream",
+        });
+
+        let buffer = "";
+        for await (const chunk of response.data) {
+            buffer += chunk.toString();
+
+            let boundary = buffer.indexOf("\n\n");
+            while (boundary !== -1) {
+                const message = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                boundary = buffer.indexOf("\n\n");
+
+                const dataLine = message
+                    .split("\n")
+                    .find((line) => line.startsWith("data: "));
+                if (!dataLine) continue;
+
+                const event = JSON.parse(
+                    dataLine.slice("data: ".length),
+                ) as GenerationProgressEvent;
+                await onEvent(event);
+
+                if (event.type === "completed" || event.type === "failed") {
+                    return event;
+                }
+            }
+        }
+
+        return null;
+    } catch (error) {
+        console.error(
+            "An error occurred while trying to stream generation:",
+            error,
+        );
+        return null;
+    }
+}
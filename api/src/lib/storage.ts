@@ -45,47 +45,70 @@ export async function listFolder(
     }
 }
 
-export async function signGenerationOutput(
-    output: GenerationOutput,
-): Promise<GenerationOutput> {
-    // Helper to parse gs:// URI and sign
-    const signFile = async (gcsUri: string | undefined) => {
-        if (!gcsUri) return undefined;
-
-        if (gcsUri.startsWith("http://") || gcsUri.startsWith("https://")) {
-            return gcsUri;
-        }
+export async function signGcsUri(
+    gcsUri: string | undefined,
+): Promise<string | undefined> {
+    if (!gcsUri) return undefined;
 
-        try {
-            // Regex to extract bucket and file path from "gs://bucket-name/path/to/file.ext"
-            const match = gcsUri.match(/^gs:\/\/([^\/]+)\/(.+)$/);
+    if (gcsUri.startsWith("http://") || gcsUri.startsWith("https://")) {
+        return gcsUri;
+    }
 
-            if (!match) {
-                console.warn(`Invalid GCS URI format: ${gcsUri}`);
-                return undefined;
-            }
+    try {
+        // Regex to extract bucket and file path from "gs://bucket-name/path/to/file.ext"
+        const match = gcsUri.match(/^gs:\/\/([^\/]+)\/(.+)$/);
 
-            const [, bucketName, filePath] = match;
+        if (!match) {
+            console.warn(`Invalid GCS URI format: ${gcsUri}`);
+            return undefined;
+        }
 
-            if (!bucketName || !filePath) {
-                return undefined;
-            }
+        const [, bucketName, filePath] = match;
 
-            return await getSignedUrl(bucketName, filePath);
-        } catch (e) {
-            console.error(`Failed to sign URL for ${gcsUri}`, e);
+        if (!bucketName || !filePath) {
             return undefined;
         }
-    };
 
-    const [audioUrl, imageUrl] = await Promise.all([
-        signFile(output.final_audio_gcs_path),
-        signFile(output.final_image_gcs_path),
+        return await getSignedUrl(bucketName, filePath);
+    } catch (e) {
+        console.error(`Failed to sign URL for ${gcsUri}`, e);
+        return undefined;
+    }
+}
+
+// Signs every encoded output of a card (e.g. "webp", "webp-256w"), dropping
+// the ones that could not be signed.
+export async function signImageVariants(
+    variants: Record<string, string> | undefined,
+): Promise<Record<string, string> | undefined> {
+    if (!variants) return undefined;
+
+    const entries = await Promise.all(
+        Object.entries(variants).map(
+            async ([name, uri]) => [name, await signGcsUri(uri)] as const,
+        ),
+    );
+
+    return Object.fromEntries(
+        entries.filter((entry): entry is readonly [string, string] =>
+            Boolean(entry[1])
+        ),
+    );
+}
+
+export async function signGenerationOutput(
+    output: GenerationOutput,
+): Promise<GenerationOutput> {
+    const [audioUrl, imageUrl, imageVariants] = await Promise.all([
+        signGcsUri(output.final_audio_gcs_path),
+        signGcsUri(output.final_image_gcs_path),
+        signImageVariants(output.final_image_variants),
     ]);
 
     return {
         ...output,
         final_audio_gcs_path: audioUrl,
         final_image_gcs_path: imageUrl,
+        ...(imageVariants && { final_image_variants: imageVariants }),
     };
 }
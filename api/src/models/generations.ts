@@ -11,6 +11,8 @@ export type GenerationInput = {
     language: PossibleLanguages;
     theme: string | null;
     targetWord: string | null;
+    freshImage?: boolean;
+    languages?: PossibleLanguages[];
 };
 
 export type GenerationOutput = {
@@ -18,6 +20,8 @@ export type GenerationOutput = {
     createdAt: Timestamp;
     final_audio_gcs_path: string | undefined;
     final_image_gcs_path: string | undefined;
+    // Every encoded output of the card by name, e.g. "webp" and "webp-256w"
+    final_image_variants?: Record<string, string>;
     id: string;
     pedagogicalOutput: {
         learningGoal: string;
@@ -8,7 +8,11 @@ import {
     getTodayGenerationsCount,
 } from "../models/generations.js";
 import configs from "../configs.js";
-import { sendGeneration } from "../lib/generations.js";
+import {
+    sendGeneration,
+    signProgressEvent,
+    streamGeneration,
+} from "../lib/generations.js";
 import { signGenerationOutput } from "../lib/storage.js";
 
 const generationsRouter = express.Router();
@@ -65,6 +69,7 @@ type GenerateResponse = {
     id: string;
     final_image_gcs_path: string | undefined;
     final_audio_gcs_path: string | undefined;
+    final_image_variants?: Record<string, string> | undefined;
 };
 
 generationsRouter.post("/", async (req: Request, res: Response) => {
@@ -89,6 +94,7 @@ generationsRouter.post("/", async (req: Request, res: Response) => {
             id: randomGeneration.id,
             final_image_gcs_path: randomGeneration.final_image_gcs_path,
             final_audio_gcs_path: randomGeneration.final_audio_gcs_path,
+            final_image_variants: randomGeneration.final_image_variants,
         };
 
         return res.status(200).json(randomReponse);
@@ -120,6 +126,52 @@ generationsRouter.post("/", async (req: Request, res: Response) => {
     return res.status(200).json(generationOutput);
 });
 
+// Same as POST / but answers with server-sent events as each asset becomes
+// ready (sentence_persisted, audio_ready, raw_image_ready, composite_ready),
+// ending with completed or failed. Asset paths are signed URLs.
+generationsRouter.post("/stream", async (req: Request, res: Response) => {
+    const data = req.body as GenerationInput;
+
+    if (!data) {
+        return res.status(400).json({ message: "Bad request for generation." });
+    }
+
+    const currentCount = await getTodayGenerationsCount();
+
+    if (currentCount === null) {
+        return res.status(500).json({
+            message: "Something went wrong, could not connect to database.",
+        });
+    }
+
+    if (currentCount >= configs.dailyGenerationsQuota) {
+        return res.status(429).json({
+            message: "Daily generation limit reached. Try again tommorow.",
+        });
+    }
+
+    res.writeHead(200, {
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        Connection: "keep-alive",
+    });
+
+    const finalEvent = await streamGeneration(data, async (event) => {
+        const signed = await signProgressEvent(event);
+        res.write(`event: ${event.type}\ndata: ${JSON.stringify(signed)}\n\n`);
+    });
+
+    if (!finalEvent) {
+        const failed = {
+            type: "failed",
+            error: "Something went wrong, failed generation request.",
+        };
+        res.write(`event: failed\ndata: ${JSON.stringify(failed)}\n\n`);
+    }
+
+    res.end();
+});
+
 generationsRouter.get("/:id", async (req: Request, res: Response) => {
     try {
         const { id } = req.params;
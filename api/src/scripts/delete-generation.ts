@@ -10,12 +10,24 @@ async function deleteGeneration(id: string) {
 
     console.log(`Deleting generation ${id}...`);
 
+    // Composed cards are named after their encoded outputs (webp, webp-256w...)
+    const composedFiles = new Set([`composed/${id}.png`]);
+
     // 1. Delete from Firestore
     try {
         const docRef = db.collection(configs.generationCollection).doc(id);
         const doc = await docRef.get();
 
         if (doc.exists) {
+            const data = doc.data() ?? {};
+            const variants: Record<string, string> = data.final_image_variants ?? {};
+            const prefix = `gs://${configs.assetsBucketName}/`;
+            for (const uri of [data.final_image_gcs_path, ...Object.values(variants)]) {
+                if (typeof uri === "string" && uri.startsWith(prefix)) {
+                    composedFiles.add(uri.slice(prefix.length));
+                }
+            }
+
             await docRef.delete();
             console.log(`- Firestore document ${id} deleted.`);
         } else {
@@ -33,7 +45,7 @@ async function deleteGeneration(id: string) {
 
     const filesToDelete = [
         `raw/${id}.png`,
-        `composed/${id}.png`,
+        ...composedFiles,
         `audio/${id}.mp3`,
     ];
 
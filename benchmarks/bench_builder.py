@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+USER_ID = "bench"
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class StandInModel:
+    """
+    Scripted stand-in of the Gemini API for offline runs: it plays the
+    designer (history lookup, persist, design JSON) and the LLM builder
+    (build_media_assets_tool call, final JSON), sleeping `latency_s` (+/-
+    `jitter_s`) per model call.
+    """
+
+    def __init__(self, latency_s: float, jitter_s: float):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.lock = threading.Lock()
+        self.random = random.Random(0)
+        self.calls: Dict[str, int] = {"designer": 0, "builder": 0}
+        self.designs = 0
+
+    @staticmethod
+    def _texts(body: Dict) -> Iterator[str]:
+        for content in body.get("contents", []):
+            for part in content.get("parts", []):
+                if part.get("text"):
+                    yield part["text"]
+
+    @staticmethod
+    def _find_object(texts: List[str], key: str) -> Optional[Dict]:
+        # The latest JSON object holding `key`, possibly embedded in a context message
+        decoder = json.JSONDecoder()
+        for text in reversed(texts):
+            for start in (i for i, char in enumerate(text) if char == "{"):
+                try:
+                    value, _ = decoder.raw_decode(text, start)
+                except ValueError:
+                    continue
+                if isinstance(value, dict) and key in value:
+                    return value
+        return None
+
+    def answer(self, body: Dict) -> Dict:
+        tools = {
+            declaration["name"]
+            for tool in body.get("tools", [])
+            for declaration in tool.get("functionDeclarations", [])
+        }
+        last_parts = (body.get("contents") or [{}])[-1].get("parts", [])
+        responses = {
+            part["functionResponse"]["name"]: part["functionResponse"].get("response", {})
+            for part in last_parts
+            if "functionResponse" in part
+        }
+        texts = list(self._texts(body))
+
+        if "build_media_assets_tool" in tools:
+            agent = "builder"
+            if "build_media_assets_tool" in responses:
+                result = responses["build_media_assets_tool"]
+                parts = [{"text": json.dumps(result)}]
+            else:
+                design = self._find_object(texts, "image_prompt") or {}
+                args = {field: design.get(field) for field in ("id", "image_prompt", "sentence", "language")}
+                parts = [{"functionCall": {"name": "build_media_assets_tool", "args": args}}]
+        else:
+            agent = "designer"
+            request = self._find_object(texts, "language") or {}
+            user_input = {
+                "age": request.get("age"),
+                "language": request.get("language"),
+                "theme": request.get("theme") or "Animals",
+                "targetWord": request.get("targetWord") or "bear",
+            }
+            if "persist_learning_data" in responses:
+                design = {
+                    "id": responses["persist_learning_data"].get("result"),
+                    "image_prompt": "A 3D render of a big friendly bear in a sunny forest.",
+                    "style_description": "3D render",
+                    "sentence": self.sentence,
+                    "language": user_input["language"],
+                    "theme": user_input["theme"],
+                    "pedagogicalOutput": {"learningGoal": "Noun recognition", "tags": ["bear"]},
+                }
+                parts = [{"text": json.dumps(design)}]
+            elif "get_previous_sentences" in responses:
+                with self.lock:
+                    self.designs += 1
+                    self.sentence = f"Here is big bear number {self.designs}."
+                args = {
+                    "userInput": user_input,
+                    "pedagogicalOutput": {
+                        "sentence": self.sentence,
+                        "learningGoal": "Noun recognition",
+                        "tags": ["bear"],
+                    },
+                }
+                parts = [{"functionCall": {"name": "persist_learning_data", "args": args}}]
+            else:
+                args = {"userInput": user_input}
+                parts = [{"functionCall": {"name": "get_previous_sentences", "args": args}}]
+
+        with self.lock:
+            self.calls[agent] += 1
+            delay = max(0.0, self.latency_s + self.random.uniform(-1, 1) * self.jitter_s)
+        time.sleep(delay)
+
+        return {
+            "candidates": [{"content": {"role": "model", "parts": parts}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": 1, "candidatesTokenCount": 1, "totalTokenCount": 2},
+        }
+
+    def handler(self):
+        model = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                data = json.dumps(model.answer(json.loads(self.rfile.read(length) or b"{}"))).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+async def run_once(runner, user_request: dict, designer_name: str) -> dict:
+    from google.genai import types
+
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=USER_ID
+    )
+    message = types.Content(role="user", parts=[types.Part.from_text(text=json.dumps(user_request))])
+
+    start = time.perf_counter()
+    designer_done = None
+    output = None
+    async for event in runner.run_async(
+        user_id=USER_ID, session_id=session.id, new_message=message
+    ):
+        if event.author == designer_name and event.is_final_response():
+            designer_done = time.perf_counter()
+        elif event.is_final_response() and event.content and event.content.parts:
+            output = event.content.parts[0].text
+    end = time.perf_counter()
+
+    return {
+        "total_s": end - start,
+        "builder_s": end - (designer_done or start),
+        "ok": bool(output) and '"final_image_gcs_path"' in output,
+    }
+
+
+async def bench_mode(builder, runs: int, user_request: dict) -> dict:
+    from google.adk.agents import SequentialAgent
+    from google.adk.runners import InMemoryRunner
+
+    from monster_word_agent.designer.agent import designer_agent
+
+    pipeline = SequentialAgent(
+        name="BenchPipeline",
+        sub_agents=[designer_agent.clone(), builder.clone()],
+    )
+    runner = InMemoryRunner(agent=pipeline)
+
+    results = [await run_once(runner, user_request, designer_agent.name) for _ in range(runs)]
+    summary = {"failed": sum(1 for r in results if not r["ok"])}
+    for key in ("total_s", "builder_s"):
+        values = [r[key] for r in results]
+        summary[key] = {
+            "mean": statistics.mean(values),
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+        }
+    return summary
+
+
+async def main(runs: int, language: str, age: int):
+    from monster_word_agent.builder.agent import create_direct_builder_agent, create_llm_builder_agent
+
+    user_request = {"age": age, "language": language, "theme": None, "targetWord": None}
+
+    for name, builder in (("llm", create_llm_builder_agent()), ("direct", create_direct_builder_agent())):
+        summary = await bench_mode(builder, runs, user_request)
+        print(f"{name} builder over {runs} runs ({summary['failed']} failed)")
+        for key in ("total_s", "builder_s"):
+            stats = summary[key]
+            print(
+                f"  {key}: mean {stats['mean']:.2f}s, p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s"
+            )
+
+
+def run_offline(args) -> None:
+    """Runs both builders against the stand-in model and the in-process service fakes."""
+    model = StandInModel(args.llm_ms / 1000, args.llm_ms / 1000 * args.jitter)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), model.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Route ADK's model client to the stand-in, before any client is created
+    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "FALSE"
+    os.environ["GOOGLE_API_KEY"] = "standin"
+    os.environ["GOOGLE_GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["CONTEXT_CACHE"] = "FALSE"
+
+    from monster_word_agent.app_configs import configs
+    from benchmarks.fakes import ServiceProfile, install_fakes
+
+    configs.local_persistence = False
+    configs.rate_limits = {configs.media_model: 1e6, "tts": 1e6}
+    # Every run designs a similar card: this measures the builder, not deduplication or cache hits
+    configs.dedup_enabled = False
+    configs.image_cache_enabled = False
+
+    def profile(latency_ms: float) -> ServiceProfile:
+        return ServiceProfile(latency_s=latency_ms / 1000, jitter_s=latency_ms / 1000 * args.jitter)
+
+    install_fakes(
+        image=profile(args.image_ms),
+        tts=profile(args.tts_ms),
+        storage=profile(args.storage_ms),
+        store=profile(args.store_ms),
+    )
+
+    try:
+        asyncio.run(main(args.runs, args.language, args.age))
+    finally:
+        server.shutdown()
+    print(f"Model calls: {model.calls}")
+
+
+# Calls the live services: python -m benchmarks.bench_builder --runs 5
+# No credentials needed:    python -m benchmarks.bench_builder --offline --runs 20
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--language", type=str, default="en")
+    parser.add_argument("--age", type=int, default=5)
+    parser.add_argument("--offline", action="store_true", help="Stand-in model and service fakes")
+    parser.add_argument("--llm-ms", type=float, default=1500, help="Stand-in latency per model call")
+    parser.add_argument("--image-ms", type=float, default=3000)
+    parser.add_argument("--tts-ms", type=float, default=600)
+    parser.add_argument("--storage-ms", type=float, default=80)
+    parser.add_argument("--store-ms", type=float, default=30)
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency jitter as a fraction of the mean")
+
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    if args.offline:
+        run_offline(args)
+    else:
+        asyncio.run(main(args.runs, args.language, args.age))
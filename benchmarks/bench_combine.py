@@ -0,0 +1,122 @@
+import argparse
+import io
+import multiprocessing
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+from PIL import Image
+
+from monster_word_agent.app_configs import configs
+from monster_word_agent.builder.tools.combine import CardRenderer
+
+SENTENCES = [
+    "Here is a big bear.",
+    "The boy looks at the enormous yellow dog.",
+    "Le petit garçon regarde le gros chien jaune.",
+    "La niña observa la luna brillante desde su ventana.",
+]
+
+RenderFn = Callable[[Image.Image, str], Image.Image]
+
+
+def make_image(width: int, height: int) -> Image.Image:
+    return Image.effect_noise((width, height), 60).convert("RGB")
+
+
+def _memory_status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _render_peak(width: int, height: int, queue) -> None:
+    image = make_image(width, height)
+    renderer = CardRenderer(configs.font_path)
+    renderer.font(int(int(height * renderer.scrim_ratio) * 0.30))
+
+    # Resets the peak resident size (VmHWM) to the current one
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    before = _memory_status_kb("VmRSS")
+    renderer.render(image, SENTENCES[1])
+    queue.put(_memory_status_kb("VmHWM") - before)
+
+
+def native_peak_kb(width: int, height: int) -> float:
+    """
+    Peak resident memory added by rendering a card, pixel buffers included
+    (Linux only). Measured in a fresh process: memory freed by earlier renders
+    would otherwise be reused without showing up.
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    child = context.Process(target=_render_peak, args=(width, height, queue))
+    child.start()
+    peak = queue.get()
+    child.join()
+    return float(peak)
+
+
+def bench(render: RenderFn, image: Image.Image, cards: int, encode: bool) -> dict:
+    """
+    Times `cards` renders, then measures the peak Python-heap allocation per
+    card (tracemalloc does not see Pillow's native pixel buffers).
+    """
+    timings = []
+    for i in range(cards):
+        start = time.perf_counter()
+        card = render(image, SENTENCES[i % len(SENTENCES)])
+        if encode:
+            card.save(io.BytesIO(), format="PNG")
+        timings.append(time.perf_counter() - start)
+
+    peaks = []
+    for i in range(min(cards, 5)):
+        tracemalloc.start()
+        render(image, SENTENCES[i % len(SENTENCES)])
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p50_ms": statistics.median(timings) * 1000,
+        "peak_alloc_kb": statistics.mean(peaks) / 1024,
+    }
+
+
+def main(cards: int, width: int, height: int, encode: bool):
+    image = make_image(width, height)
+
+    # Cold: a fresh renderer per card, i.e. no font/metric reuse
+    cold = bench(
+        lambda img, sentence: CardRenderer(configs.font_path).render(img, sentence),
+        image,
+        cards,
+        encode,
+    )
+    warm = bench(CardRenderer(configs.font_path).render, image, cards, encode)
+
+    print(f"{cards} cards at {width}x{height} (encode={encode})")
+    for name, result in (("cold", cold), ("warm", warm)):
+        print(
+            f"  {name}: mean {result['mean_ms']:.2f} ms, p50 {result['p50_ms']:.2f} ms, "
+            f"python heap peak {result['peak_alloc_kb']:.1f} KiB"
+        )
+    print(f"  resident memory peak of a card: +{native_peak_kb(width, height) / 1024:.1f} MiB")
+
+
+# python -m benchmarks.bench_combine --cards 50
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=50)
+    parser.add_argument("--width", type=int, default=1184)
+    parser.add_argument("--height", type=int, default=864)
+    parser.add_argument("--encode", action="store_true")
+
+    args = parser.parse_args()
+
+    main(args.cards, args.width, args.height, args.encode)
@@ -0,0 +1,82 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Optional, Sequence
+
+# Modules that must stay off the import path: they are loaded on first use
+# (or by the warm-up hook), never by importing the agent.
+DEFERRED_MODULES = [
+    "google.cloud.firestore",
+    "google.cloud.storage",
+    "google.cloud.texttospeech",
+    "gcloud.aio.storage",
+    # PIL.Image itself comes with google.genai.types, which ADK needs
+    "PIL.ImageDraw",
+    "PIL.ImageFont",
+    "monster_word_agent.builder.tools.combine",
+]
+
+# Runs in a fresh interpreter, so nothing is cached from this process
+_PROBE = """
+import json, sys, time
+for name in {preload!r}:
+    __import__(name)
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "loaded": [name for name in {deferred!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, preload: Sequence[str] = (), cwd: Optional[str] = None) -> dict:
+    """
+    Times `import module` in a fresh interpreter, after importing `preload`
+    (e.g. third-party packages, to time only this package's own share).
+    """
+    probe = _PROBE.format(module=module, deferred=DEFERRED_MODULES, preload=list(preload))
+    output = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True, cwd=cwd
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(module: str, runs: int, budget_ms: float) -> int:
+    results = [measure(module) for _ in range(runs)]
+    times = [result["import_ms"] for result in results]
+    loaded = sorted({name for result in results for name in result["loaded"]})
+    median_ms = statistics.median(times)
+
+    print(f"import {module}: median {median_ms:.0f} ms, min {min(times):.0f} ms over {runs} runs")
+
+    failed = False
+    if loaded:
+        print(f"❌ Loaded at import instead of on first use: {', '.join(loaded)}")
+        failed = True
+    if median_ms > budget_ms:
+        print(f"❌ Over the import budget of {budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"Within the import budget of {budget_ms:.0f} ms")
+    return 1 if failed else 0
+
+
+# python -m benchmarks.bench_import --budget-ms 4000
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", type=str, default="monster_word_agent.agent")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=4000,
+        help="Median import time allowed; ADK and google.genai account for most of it",
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(main(args.module, args.runs, args.budget_ms))
@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from monster_word_agent.app_configs import configs
+from benchmarks.fakes import Fakes, ServiceProfile, install_fakes
+
+SENTENCES = [
+    "Here is a big bear.",
+    "The boy looks at the enormous yellow dog.",
+    "Le petit garçon regarde le gros chien jaune.",
+    "La niña observa la luna brillante desde su ventana.",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    return {
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p50_ms": percentile(timings, 0.50) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+    }
+
+
+def time_calls(call: Callable[[int], object], iterations: int) -> Dict[str, float]:
+    timings = []
+    errors = 0
+    for i in range(iterations):
+        start = time.perf_counter()
+        try:
+            call(i)
+        except Exception:
+            # Injected service errors that the tool does not catch itself
+            errors += 1
+        timings.append(time.perf_counter() - start)
+    return {"errors": errors, **summarize(timings)}
+
+
+def new_generation(fakes: Fakes, language: str = "en", age: int = 5, sentence: str = SENTENCES[0]) -> str:
+    id = str(uuid.uuid4())
+    fakes.store.seed(
+        {
+            "id": id,
+            "created_at": datetime.now().isoformat(),
+            "status": "pending_media",
+            "userInput": {"age": age, "language": language, "theme": "Animals", "targetWord": "bear"},
+            "pedagogicalOutput": {"sentence": sentence, "learningGoal": "", "tags": []},
+        }
+    )
+    return id
+
+
+def bench_composite(fakes: Fakes, iterations: int) -> Dict[str, float]:
+    """`create_composite_card_tool`: download, render every output, upload."""
+    from monster_word_agent.builder.tools.combine import create_composite_card_tool
+
+    raw_name = "raw/bench.png"
+    fakes.storage.bucket(configs.gcp_media_bucket).objects[raw_name] = fakes.genai.models.image_bytes
+    image_path = f"gs://{configs.gcp_media_bucket}/{raw_name}"
+    ids = [new_generation(fakes) for _ in range(iterations)]
+
+    return time_calls(
+        lambda i: create_composite_card_tool(ids[i], image_path, SENTENCES[i % len(SENTENCES)]),
+        iterations,
+    )
+
+
+def bench_history_format(fakes: Fakes, iterations: int) -> Dict[str, float]:
+    """`get_previous_sentences` on a warm history cache: the formatting cost."""
+    from monster_word_agent.teacher.tools import get_previous_sentences
+
+    for i in range(configs.history_limit):
+        new_generation(fakes, language="fr", sentence=f"{SENTENCES[i % len(SENTENCES)]} ({i})")
+    user_input = {"age": 5, "language": "fr"}
+    get_previous_sentences(user_input)
+
+    return time_calls(lambda i: get_previous_sentences(user_input), iterations)
+
+
+async def bench_pipeline(fakes: Fakes, concurrency: int, cards: int) -> Dict[str, float]:
+    """`build_media_assets_tool` end to end, with `concurrency` cards in flight."""
+    from monster_word_agent.builder.tools.orchestrator import build_media_assets_tool
+
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        sentence = SENTENCES[i % len(SENTENCES)]
+        id = new_generation(fakes, sentence=sentence)
+        async with semaphore:
+            start = time.perf_counter()
+            result = await build_media_assets_tool(id, "A big friendly bear.", sentence, "en")
+            timings.append(time.perf_counter() - start)
+        if "error" in result:
+            errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(cards)])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "cards": cards,
+        "errors": errors,
+        "cards_per_s": cards / elapsed,
+        **summarize(timings),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results: Dict, baseline_path: str) -> None:
+    """Prints the relative change of every latency and throughput figure against a previous run."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    def rows(section: Dict, prefix: str = ""):
+        for key, value in section.items():
+            if isinstance(value, dict):
+                yield from rows(value, f"{prefix}{key}.")
+            elif isinstance(value, (int, float)) and (key.endswith("_ms") or key == "cards_per_s"):
+                yield f"{prefix}{key}", value
+
+    old = dict(rows(baseline["results"]))
+    print(f"Compared with {baseline_path} ({baseline['meta'].get('revision')}):")
+    for key, value in rows(results["results"]):
+        if key in old and old[key]:
+            change = (value - old[key]) / old[key] * 100
+            print(f"  {key}: {old[key]:.2f} -> {value:.2f} ({change:+.1f}%)")
+
+
+def main(args) -> Dict:
+    # Offline: GCS paths, fast rate limits, no disk caches between runs
+    configs.local_persistence = False
+    configs.speech_cache_enabled = args.speech_cache
+    configs.image_cache_enabled = args.image_cache
+    configs.async_io = args.async_io
+    configs.rate_limits = {configs.media_model: 1e6, "tts": 1e6}
+    configs.backoff_base_seconds = args.backoff_base
+
+    def profile(latency_ms: float) -> ServiceProfile:
+        return ServiceProfile(
+            latency_s=latency_ms / 1000,
+            jitter_s=latency_ms / 1000 * args.jitter,
+            error_rate=args.error_rate,
+            error_code=args.error_code,
+        )
+
+    fakes = install_fakes(
+        image=profile(args.image_ms),
+        tts=profile(args.tts_ms),
+        storage=profile(args.storage_ms),
+        store=profile(args.store_ms),
+    )
+
+    results = {
+        "composite_card_tool": bench_composite(fakes, args.iterations),
+        "history_format": bench_history_format(fakes, args.iterations * 10),
+        "pipeline": {},
+    }
+    for concurrency in args.concurrency:
+        summary = asyncio.run(bench_pipeline(fakes, concurrency, args.cards))
+        results["pipeline"][f"c{concurrency}"] = summary
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "async_io": configs.async_io,
+            "card_formats": configs.card_formats,
+            "card_widths": configs.card_widths,
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+
+def print_results(results: Dict) -> None:
+    for name in ("composite_card_tool", "history_format"):
+        r = results["results"][name]
+        print(
+            f"{name}: mean {r['mean_ms']:.2f} ms, p50 {r['p50_ms']:.2f} ms, "
+            f"p95 {r['p95_ms']:.2f} ms, {r['errors']} errors"
+        )
+    for r in results["results"]["pipeline"].values():
+        print(
+            f"pipeline c={r['concurrency']}: {r['cards_per_s']:.2f} cards/s, p50 {r['p50_ms']:.0f} ms, "
+            f"p95 {r['p95_ms']:.0f} ms, p99 {r['p99_ms']:.0f} ms, {r['errors']} errors"
+        )
+
+
+# No credentials needed: python -m benchmarks.bench_offline --cards 64 --concurrency 1 8 32
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--cards", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--image-ms", type=float, default=3000)
+    parser.add_argument("--tts-ms", type=float, default=600)
+    parser.add_argument("--storage-ms", type=float, default=80)
+    parser.add_argument("--store-ms", type=float, default=30)
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency jitter as a fraction of the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-code", type=int, default=503)
+    parser.add_argument("--backoff-base", type=float, default=0.05)
+    parser.add_argument("--async-io", action="store_true")
+    parser.add_argument("--speech-cache", action="store_true")
+    parser.add_argument("--image-cache", action="store_true", help="Every card has the same prompt: all but the first hit")
+    parser.add_argument("--output", type=str, default=os.path.join("tmp", "benchmarks"))
+    parser.add_argument("--compare", type=str, default=None, help="A previous result file")
+
+    args = parser.parse_args()
+
+    results = main(args)
+    print_results(results)
+
+    os.makedirs(args.output, exist_ok=True)
+    mode = "async" if args.async_io else "threads"
+    path = os.path.join(
+        args.output,
+        f"offline-{mode}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{results['meta']['revision'] or 'nogit'}.json",
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {path}")
+
+    if args.compare:
+        compare(results, args.compare)
@@ -0,0 +1,332 @@
+import asyncio
+import io
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from google.cloud import firestore, texttospeech
+from google.genai import types
+from PIL import Image
+
+from monster_word_agent.clients import override_client
+from monster_word_agent.stores import override_generation_store
+from monster_word_agent.stores.base import GenerationStore
+
+# In-process stand-ins for Vertex AI, Text-to-Speech, Cloud Storage and the
+# generation store. Each one sleeps for a configurable latency and fails at a
+# configurable rate, so the pipeline can be benchmarked without credentials.
+#
+# Store latency is modelled at the GenerationStore interface only: the
+# in-memory store replaces FirestoreGenerationStore whole, so its queries,
+# paging and document conversion are not exercised, nor their cost measured.
+
+
+@dataclass
+class ServiceProfile:
+    latency_s: float = 0.0
+    jitter_s: float = 0.0
+    error_rate: float = 0.0
+    # 429/503 go through the rate limiter's retry path, anything else fails the card
+    error_code: int = 503
+
+
+class FakeServiceError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"{code} fake service error")
+        self.code = code
+
+
+class _FakeService:
+    def __init__(self, profile: ServiceProfile, seed: int = 0):
+        self.profile = profile
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self) -> float:
+        with self._lock:
+            self.calls += 1
+            if self._random.random() < self.profile.error_rate:
+                raise FakeServiceError(self.profile.error_code)
+            return max(0.0, self.profile.latency_s + self._random.uniform(-1, 1) * self.profile.jitter_s)
+
+    def wait(self) -> None:
+        time.sleep(self._draw())
+
+    async def wait_async(self) -> None:
+        await asyncio.sleep(self._draw())
+
+
+def make_png(width: int = 1184, height: int = 864) -> bytes:
+    buffer = io.BytesIO()
+    Image.effect_noise((width, height), 60).convert("RGB").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _image_response(image_bytes: bytes) -> types.GenerateContentResponse:
+    return types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(
+                    role="model",
+                    parts=[types.Part(inline_data=types.Blob(data=image_bytes, mime_type="image/png"))],
+                )
+            )
+        ]
+    )
+
+
+class FakeGenaiModels(_FakeService):
+    def __init__(self, profile: ServiceProfile, image_bytes: bytes, seed: int = 0):
+        super().__init__(profile, seed)
+        self.image_bytes = image_bytes
+
+    def generate_content(self, model, contents, config=None):
+        self.wait()
+        return _image_response(self.image_bytes)
+
+
+class FakeAsyncGenaiModels(FakeGenaiModels):
+    async def generate_content(self, model, contents, config=None):
+        await self.wait_async()
+        return _image_response(self.image_bytes)
+
+
+class FakeGenaiClient:
+    """Mimics `genai.Client` (and its `.aio`) for image generation."""
+
+    def __init__(self, profile: ServiceProfile, image_bytes: bytes):
+        self.models = FakeGenaiModels(profile, image_bytes)
+        self.aio = type("FakeAio", (), {"models": FakeAsyncGenaiModels(profile, image_bytes, seed=1)})()
+
+
+class FakeTTSClient(_FakeService):
+    def __init__(self, profile: ServiceProfile, audio_bytes: bytes = b"\xff\xf3" * 8192, seed: int = 0):
+        super().__init__(profile, seed)
+        self.audio_bytes = audio_bytes
+
+    def synthesize_speech(self, input, voice, audio_config):
+        self.wait()
+        return texttospeech.SynthesizeSpeechResponse(audio_content=self.audio_bytes)
+
+
+class FakeTTSAsyncClient(FakeTTSClient):
+    async def synthesize_speech(self, input, voice, audio_config):
+        await self.wait_async()
+        return texttospeech.SynthesizeSpeechResponse(audio_content=self.audio_bytes)
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+
+    def upload_from_string(self, data, content_type=None, if_generation_match=None):
+        from google.api_core.exceptions import PreconditionFailed
+
+        self.bucket.service.wait()
+        if if_generation_match == 0 and self.name in self.bucket.objects:
+            raise PreconditionFailed(f"Object exists: {self.bucket.name}/{self.name}")
+        self.bucket.objects[self.name] = bytes(data)
+
+    def upload_from_file(self, file_obj, content_type=None):
+        self.upload_from_string(file_obj.read(), content_type)
+
+    def download_as_bytes(self) -> bytes:
+        from google.api_core.exceptions import NotFound
+
+        self.bucket.service.wait()
+        if self.name not in self.bucket.objects:
+            raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+        return self.bucket.objects[self.name]
+
+    def exists(self) -> bool:
+        self.bucket.service.wait()
+        return self.name in self.bucket.objects
+
+
+class FakeBucket:
+    def __init__(self, name: str, service: _FakeService, objects: Dict[str, bytes]):
+        self.name = name
+        self.service = service
+        self.objects = objects
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+
+class FakeStorageClient:
+    """Mimics `storage.Client` with buckets held in memory."""
+
+    def __init__(self, profile: ServiceProfile):
+        self.service = _FakeService(profile)
+        self.objects: Dict[str, Dict[str, bytes]] = {}
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(name, self.service, self.objects.setdefault(name, {}))
+
+
+class FakeAsyncStorage:
+    """Mimics `gcloud.aio.storage.Storage`, sharing objects with the sync fake."""
+
+    def __init__(self, storage_client: FakeStorageClient):
+        self.storage_client = storage_client
+        self.service = _FakeService(storage_client.service.profile, seed=1)
+
+    async def upload(self, bucket: str, object_name: str, data: bytes, content_type=None, parameters=None):
+        from aiohttp import ClientResponseError
+
+        await self.service.wait_async()
+        objects = self.storage_client.objects.setdefault(bucket, {})
+        if (parameters or {}).get("ifGenerationMatch") == "0" and object_name in objects:
+            raise ClientResponseError(request_info=None, history=(), status=412)
+        objects[object_name] = bytes(data)
+
+    async def download_metadata(self, bucket: str, object_name: str):
+        from aiohttp import ClientResponseError
+
+        await self.service.wait_async()
+        if object_name not in self.storage_client.objects.get(bucket, {}):
+            raise ClientResponseError(request_info=None, history=(), status=404)
+        return {"name": object_name}
+
+    async def download(self, bucket: str, object_name: str) -> bytes:
+        from aiohttp import ClientResponseError
+
+        await self.service.wait_async()
+        objects = self.storage_client.objects.get(bucket, {})
+        if object_name not in objects:
+            raise ClientResponseError(request_info=None, history=(), status=404)
+        return objects[object_name]
+
+
+class InMemoryGenerationStore(GenerationStore):
+    """
+    A generation store in a dict, standing in for FirestoreGenerationStore:
+    each call sleeps for the store profile, whatever query it stands for.
+    """
+
+    def __init__(self, profile: ServiceProfile):
+        self.service = _FakeService(profile)
+        self.async_service = _FakeService(profile, seed=1)
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Dict] = {}
+        self._inventory: Dict[str, Dict] = {}
+
+    @staticmethod
+    def _resolve(fields: Dict) -> Dict:
+        now = datetime.now().isoformat()
+        return {key: now if value is firestore.SERVER_TIMESTAMP else value for key, value in fields.items()}
+
+    def seed(self, doc: Dict) -> None:
+        """Adds a record without latency or injected errors (benchmark setup)."""
+        with self._lock:
+            self._docs[doc["id"]] = self._resolve(doc)
+
+    def create(self, doc: Dict) -> None:
+        self.service.wait()
+        self.seed(doc)
+
+    def update(self, id: str, fields: Dict) -> None:
+        self.service.wait()
+        with self._lock:
+            self._docs[id].update(self._resolve(fields))
+
+    async def update_async(self, id: str, fields: Dict) -> None:
+        await self.async_service.wait_async()
+        with self._lock:
+            self._docs[id].update(self._resolve(fields))
+
+    def upsert(self, id: str, fields: Dict) -> None:
+        self.service.wait()
+        with self._lock:
+            self._docs.setdefault(id, {"id": id}).update(self._resolve(fields))
+
+    async def upsert_async(self, id: str, fields: Dict) -> None:
+        await self.async_service.wait_async()
+        with self._lock:
+            self._docs.setdefault(id, {"id": id}).update(self._resolve(fields))
+
+    def get(self, id: str) -> Optional[Dict]:
+        self.service.wait()
+        with self._lock:
+            doc = self._docs.get(id)
+            return dict(doc) if doc else None
+
+    def recent(self, language: str, age: int, limit: int) -> List[Dict]:
+        self.service.wait()
+        with self._lock:
+            docs = [
+                doc for doc in self._docs.values()
+                if doc.get("userInput", {}).get("language") == language
+                and doc.get("userInput", {}).get("age") == age
+            ]
+        docs.sort(key=lambda doc: doc.get("created_at") or "", reverse=True)
+        return docs[:limit]
+
+    def stream(self, status: Optional[str] = None) -> Iterator[Dict]:
+        with self._lock:
+            docs = list(self._docs.values())
+        for doc in docs:
+            if status is None or doc.get("status") == status:
+                yield doc
+
+    def add_to_inventory(self, id: str, profile: str) -> None:
+        with self._lock:
+            self._inventory[id] = {"profile": profile, "state": "ready"}
+
+    def count_inventory(self, profile: str) -> int:
+        with self._lock:
+            return sum(
+                1 for card in self._inventory.values()
+                if card["profile"] == profile and card["state"] == "ready"
+            )
+
+    def claim_inventory(self, profile: str) -> Optional[Dict]:
+        with self._lock:
+            for id, card in self._inventory.items():
+                if card["profile"] == profile and card["state"] == "ready":
+                    card["state"] = "claimed"
+                    return dict(self._docs[id])
+        return None
+
+
+@dataclass
+class Fakes:
+    genai: FakeGenaiClient
+    tts: FakeTTSClient
+    tts_async: FakeTTSAsyncClient
+    storage: FakeStorageClient
+    storage_async: FakeAsyncStorage
+    store: InMemoryGenerationStore
+
+
+def install_fakes(
+    image: ServiceProfile,
+    tts: ServiceProfile,
+    storage: ServiceProfile,
+    store: ServiceProfile,
+    image_bytes: Optional[bytes] = None,
+) -> Fakes:
+    """Routes every client getter and the generation store to in-process fakes."""
+    fakes = Fakes(
+        genai=FakeGenaiClient(image, image_bytes or make_png()),
+        tts=FakeTTSClient(tts),
+        tts_async=FakeTTSAsyncClient(tts, seed=1),
+        storage=FakeStorageClient(storage),
+        storage_async=None,
+        store=InMemoryGenerationStore(store),
+    )
+    fakes.storage_async = FakeAsyncStorage(fakes.storage)
+
+    override_client("genai", fakes.genai)
+    override_client("genai_async", fakes.genai.aio)
+    override_client("tts", fakes.tts)
+    override_client("tts_async", fakes.tts_async)
+    override_client("storage", fakes.storage)
+    override_client("storage_async", fakes.storage_async)
+    override_generation_store(fakes.store)
+    return fakes
@@ -0,0 +1,161 @@
+import argparse
+import asyncio
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+# Verifies context caching against a local stand-in of the Gemini API: the
+# first run creates one cached content for the designer's static prompt and
+# every run then references it instead of resending the instructions and tools.
+
+
+class StandInModel:
+    """Records the requests of the Gemini API it answers for."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.caches: Dict[str, Dict] = {}
+        self.cache_creates = 0
+        self.cache_updates = 0
+        self.generations: List[Dict] = []
+
+    def handler(self):
+        model = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _body(self) -> Dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def _reply(self, payload: Dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = self._body()
+                with model.lock:
+                    if self.path.split("?")[0].endswith("/cachedContents"):
+                        model.cache_creates += 1
+                        name = f"cachedContents/standin-{model.cache_creates}"
+                        # Token count of the cached prefix, roughly
+                        model.caches[name] = {"name": name, "tokens": len(json.dumps(body)) // 4}
+                        return self._reply({"name": name, "model": body.get("model")})
+
+                    cached = model.caches.get(body.get("cachedContent"))
+                    model.generations.append(
+                        {
+                            "bytes": int(self.headers.get("Content-Length") or 0),
+                            "cached_content": body.get("cachedContent"),
+                            "system_instruction": "systemInstruction" in body,
+                            "tools": "tools" in body,
+                        }
+                    )
+                prompt_tokens = len(json.dumps(body)) // 4 + (cached["tokens"] if cached else 0)
+                self._reply(
+                    {
+                        "candidates": [
+                            {
+                                "content": {"role": "model", "parts": [{"text": "{}"}]},
+                                "finishReason": "STOP",
+                            }
+                        ],
+                        "usageMetadata": {
+                            "promptTokenCount": prompt_tokens,
+                            "cachedContentTokenCount": cached["tokens"] if cached else 0,
+                            "candidatesTokenCount": 1,
+                            "totalTokenCount": prompt_tokens + 1,
+                        },
+                    }
+                )
+
+            def do_PATCH(self):
+                self._body()
+                with model.lock:
+                    model.cache_updates += 1
+                name = self.path.split("?")[0].split("/v1beta/")[-1]
+                self._reply({"name": name})
+
+        return Handler
+
+
+async def run(runs: int) -> None:
+    from google import genai
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    from monster_word_agent.clients import override_client
+    from monster_word_agent.context_cache import get_context_cache_stats
+    from monster_word_agent.designer.agent import designer_agent
+
+    # The cache is managed with the same stand-in (the real client targets Vertex AI)
+    override_client("genai_async", genai.Client(api_key="standin").aio)
+
+    runner = InMemoryRunner(agent=designer_agent.clone(), app_name="verify_context_cache")
+    message = json.dumps({"age": 6, "language": "fr", "theme": "Forest", "targetWord": None})
+    for _ in range(runs):
+        session = await runner.session_service.create_session(app_name=runner.app_name, user_id="verify")
+        async for _ in runner.run_async(
+            user_id="verify",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part.from_text(text=message)]),
+        ):
+            pass
+
+    print("Context cache stats:", get_context_cache_stats())
+
+
+def main(runs: int, min_tokens: int, enabled: bool) -> int:
+    model = StandInModel()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), model.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Route both ADK's model client and ours to the stand-in
+    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "FALSE"
+    os.environ["GOOGLE_API_KEY"] = "standin"
+    os.environ["GOOGLE_GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["CONTEXT_CACHE"] = "TRUE" if enabled else "FALSE"
+    os.environ["CONTEXT_CACHE_MIN_TOKENS"] = str(min_tokens)
+
+    try:
+        asyncio.run(run(runs))
+    finally:
+        server.shutdown()
+
+    generations = model.generations
+    referenced = sum(1 for request in generations if request["cached_content"])
+    resent = sum(1 for request in generations if request["system_instruction"] or request["tools"])
+    mean_bytes = sum(request["bytes"] for request in generations) / max(1, len(generations))
+    print(
+        f"{len(generations)} model calls: {referenced} used a cached prefix, "
+        f"{resent} resent instructions or tools, {mean_bytes:.0f} request bytes on average"
+    )
+    print(f"Caches created: {model.cache_creates}, extended: {model.cache_updates}")
+
+    if not enabled:
+        return 0
+    if model.cache_creates != 1 or referenced != len(generations) or resent:
+        print("❌ The cached prefix was not used on every call")
+        return 1
+    print("Every call used the cached prefix")
+    return 0
+
+
+# python -m benchmarks.verify_context_cache --runs 5 [--disabled]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--min-tokens", type=int, default=1024)
+    parser.add_argument("--disabled", action="store_true", help="Run without caching, for comparison")
+
+    args = parser.parse_args()
+
+    raise SystemExit(main(args.runs, args.min_tokens, not args.disabled))
@@ -0,0 +1,73 @@
+import argparse
+from typing import Dict
+
+from PIL import Image
+
+from monster_word_agent.app_configs import configs
+from monster_word_agent.builder.tools.combine import CardRenderer
+
+# Verifies that the band-only scrim of CardRenderer matches the full-frame
+# alpha_composite it replaced, for every image mode the image model or a
+# re-render may hand it, with and without transparency.
+
+
+def reference_scrim(renderer: CardRenderer, image: Image.Image) -> Image.Image:
+    """The original scrim: a full-size RGBA overlay composited over the whole image."""
+    base = image.convert("RGBA")
+    start_y = base.height - int(base.height * renderer.scrim_ratio)
+    overlay = Image.new("RGBA", base.size, (0, 0, 0, 0))
+    overlay.paste((0, 0, 0, renderer.scrim_alpha), (0, start_y, base.width, base.height))
+    return Image.alpha_composite(base, overlay).convert("RGB")
+
+
+def make_images(width: int, height: int) -> Dict[str, Image.Image]:
+    noise = Image.effect_noise((width, height), 60)
+    alpha = Image.linear_gradient("L").resize((width, height))
+    channels = [
+        noise,
+        noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT),
+        noise.transpose(Image.Transpose.FLIP_TOP_BOTTOM),
+    ]
+    rgba = Image.merge("RGBA", channels + [alpha])
+    rgb = rgba.convert("RGB")
+
+    palette_transparent = rgb.quantize(64)
+    palette_transparent.info["transparency"] = 3
+
+    return {
+        "RGB": rgb,
+        "L": noise,
+        "P": rgb.quantize(64),
+        "RGBA (opaque)": rgb.convert("RGBA"),
+        "RGBA": rgba,
+        "LA": rgba.convert("LA"),
+        "P (transparency)": palette_transparent,
+    }
+
+
+def main(width: int, height: int) -> int:
+    renderer = CardRenderer(configs.font_path)
+    failed = 0
+    for name, image in make_images(width, height).items():
+        start_y = image.height - int(image.height * renderer.scrim_ratio)
+        scrimmed = renderer.scrimmed_copy(image, start_y)
+        identical = scrimmed.tobytes() == reference_scrim(renderer, image).tobytes()
+        print(f"{'✅' if identical else '❌'} {name}")
+        failed += not identical
+
+    if failed:
+        print(f"❌ {failed} image modes differ from the full-frame scrim")
+        return 1
+    print("Every image mode matches the full-frame scrim")
+    return 0
+
+
+# python -m benchmarks.verify_scrim
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=1184)
+    parser.add_argument("--height", type=int, default=864)
+
+    args = parser.parse_args()
+
+    raise SystemExit(main(args.width, args.height))
@@ -22,11 +22,40 @@ def get_cloud_token():
         return None
 
 
-def main(endpoint: str):
+def stream(endpoint: str, headers: dict, user_request: dict):
+    # Server-sent events, printed as each asset becomes ready
+    with requests.post(
+        f"{endpoint}/generations/stream", headers=headers, json=user_request, stream=True
+    ) as response:
+        response.raise_for_status()
+        event_type = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event_type = line[len("event: "):]
+            elif line.startswith("data: "):
+                print(f"{event_type}:", json.loads(line[len("data: "):]))
+
+
+def main(endpoint: str, streaming: bool, fresh_image: bool, languages: list):
     token = get_cloud_token()
 
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
+    user_request = {
+        "age": 6,
+        "language": "fr",
+        "theme": None,
+        "targetWord": None,
+    }
+    if fresh_image:
+        user_request["freshImage"] = True
+    if languages:
+        user_request["languages"] = languages
+
+    if streaming:
+        stream(endpoint, headers, user_request)
+        return
+
     # list available apps
     # curl -X GET -H "Authorization: Bearer $TOKEN" $APP_URL/list-apps
     response = requests.get(f"{endpoint}/list-apps", headers=headers)
@@ -44,13 +73,6 @@ def main(endpoint: str):
 
     # run the agent
 
-    user_request = {
-        "age": 6,
-        "language": "fr",
-        "theme": None,
-        "targetWord": None,
-    }
-
     payload = {
         "app_name": APP_NAME,
         "user_id": USER_ID,
@@ -64,15 +86,24 @@ def main(endpoint: str):
     response = requests.post(f"{endpoint}/run", headers=headers, json=payload)
     response.raise_for_status()
 
+    # one-shot run: drop the session and its events
+    requests.delete(
+        f"{endpoint}/apps/{APP_NAME}/users/{USER_ID}/sessions/{session_id}",
+        headers=headers,
+    )
+
     print("Assets generated successfully.")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--endpoint", type=str, required=True)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--fresh-image", action="store_true", help="Skip the raw image cache")
+    parser.add_argument("--languages", nargs="+", default=None, help="Also build the card in these languages")
 
     args = parser.parse_args()
 
     load_dotenv()
 
-    main(args.endpoint)
\ No newline at end of file
+    main(args.endpoint, args.stream, args.fresh_image, args.languages)
\ No newline at end of file
@@ -1,26 +1,176 @@
+import asyncio
+import json
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
 from google.adk.cli.fast_api import get_fast_api_app
 
+from monster_word_agent.app_configs import configs
+from monster_word_agent.builder.tools.generate import get_image_cache_stats
+from monster_word_agent.builder.tools.speculative import get_speculative_speech_stats
+from monster_word_agent.builder.tools.speech import get_speech_cache_stats
+from monster_word_agent.clients import get_client_stats
+from monster_word_agent.context_cache import get_context_cache_stats
+from monster_word_agent.inventory import claim_card, create_inventory_builder
+from monster_word_agent.pipeline import stream_generation, warm_up
+from monster_word_agent.ratelimit import get_rate_limit_stats
+from monster_word_agent.sessions import (
+    create_session_janitor,
+    register_session_service,
+    session_service_uri,
+)
+from monster_word_agent.telemetry import render_metrics
+from monster_word_agent.teacher.dedup import sentence_index
+from monster_word_agent.teacher.history import history_service
+from monster_word_agent.teacher.target_words import get_target_word_stats
+
 AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
-SESSION_SERVICE_URI = "sqlite+aiosqlite:///./sessions.db"
+SESSION_SERVICE_URI = session_service_uri()
 ALLOWED_ORIGINS = ["*"]
 SERVE_WEB_INTERFACE = True
+STREAM_USER_ID = "stream"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the agent and create the shared clients while the instance is idle.
+    # In the background, so startup (and scale-from-zero) is not held up by it.
+    warm_up_task = None
+    if configs.warm_up:
+        warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
+
+    # Keep pre-generated cards stocked for the profiles in INVENTORY_PROFILES
+    inventory_task = None
+    inventory_builder = create_inventory_builder()
+    if inventory_builder is not None:
+        inventory_task = asyncio.create_task(
+            inventory_builder.run_forever(configs.inventory_refill_interval_seconds)
+        )
+
+    # Expire idle sessions and trim large tool payloads from stored events
+    janitor_task = None
+    janitor = create_session_janitor()
+    if janitor is not None:
+        janitor_task = asyncio.create_task(
+            janitor.run_forever(configs.session_compaction_interval_seconds)
+        )
+
+    yield
+
+    if inventory_task is not None:
+        inventory_task.cancel()
+    if janitor_task is not None:
+        janitor_task.cancel()
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+
+
+register_session_service(SESSION_SERVICE_URI)
 
 app: FastAPI = get_fast_api_app(
     agents_dir=AGENT_DIR,
     session_service_uri=SESSION_SERVICE_URI,
     allow_origins=ALLOWED_ORIGINS,
     web=SERVE_WEB_INTERFACE,
+    lifespan=lifespan,
 )
 
-# You can add more FastAPI routes or configurations below if needed
-# Example:
-# @app.get("/hello")
-# async def read_root():
-#     return {"Hello": "World"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/stats/clients")
+async def client_stats():
+    return get_client_stats()
+
+
+@app.get("/stats/speech-cache")
+async def speech_cache_stats():
+    return get_speech_cache_stats()
+
+
+@app.get("/stats/speculative-speech")
+async def speculative_speech_stats():
+    return get_speculative_speech_stats()
+
+
+@app.get("/stats/context-cache")
+async def context_cache_stats():
+    return get_context_cache_stats()
+
+
+@app.get("/stats/history")
+async def history_stats():
+    return history_service.stats()
+
+
+@app.get("/stats/dedup")
+async def dedup_stats():
+    return sentence_index.stats()
+
+
+@app.get("/stats/target-words")
+async def target_word_stats():
+    return get_target_word_stats()
+
+
+@app.get("/stats/image-cache")
+async def image_cache_stats():
+    return get_image_cache_stats()
+
+
+@app.get("/stats/rate-limits")
+async def rate_limit_stats():
+    return get_rate_limit_stats()
+
+
+class InventoryClaimRequest(BaseModel):
+    age: int
+    language: str
+    theme: str | None = None
+
+
+@app.post("/inventory/claim")
+async def claim_inventory_card(request: InventoryClaimRequest):
+    card = await asyncio.to_thread(claim_card, request.age, request.language, request.theme)
+    if card is None:
+        raise HTTPException(status_code=404, detail="No ready card for this profile.")
+    return {
+        "id": card["id"],
+        "final_image_gcs_path": card.get("final_image_gcs_path"),
+        "final_audio_gcs_path": card.get("final_audio_gcs_path"),
+        "final_image_variants": card.get("final_image_variants"),
+    }
+
+
+class GenerationRequest(BaseModel):
+    age: int
+    language: str
+    theme: str | None = None
+    targetWord: str | None = None
+    # Skips the raw image cache: a new image is generated for the prompt
+    freshImage: bool = False
+    # Other languages of the same card: one image, a sibling card per language
+    languages: list[str] | None = None
+
+
+@app.post("/generations/stream")
+async def stream_generation_events(request: GenerationRequest):
+    # Server-sent events: sentence_persisted, audio_ready, raw_image_ready,
+    # composite_ready, then completed (or failed)
+    async def events():
+        async for event in stream_generation(request.model_dump(), STREAM_USER_ID):
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
@@ -1,11 +1,14 @@
 from google.adk.agents import SequentialAgent
 
 from .designer.agent import designer_agent
-from .builder.agent import builder_agent
+from .builder.agent import create_builder_agent
 
 
 root_agent = SequentialAgent(
     name="MonsterWordAgent",
     description="Generates learning flashcards for kids",
-    sub_agents=[designer_agent, builder_agent],
+    sub_agents=[
+        designer_agent,
+        create_builder_agent(),
+    ],
 )
@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Dict
 from dotenv import load_dotenv
 
 @dataclass
@@ -10,8 +11,65 @@ class Configs:
     media_model: str
     llm_model: str
     font_path: str
+    card_formats: str
+    card_widths: str
     generation_collection_name: str
+    profile_collection_name: str
+    inventory_collection_name: str
     local_persistence: bool
+    sqlite_path: str
+    single_write: bool
+    persist_raw_images: bool
+    cache_dir: str
+    speech_cache_enabled: bool
+    speech_cache_max_bytes: int
+    speech_cache_marker_ttl_seconds: float
+    image_cache_enabled: bool
+    image_cache_max_bytes: int
+    speculative_tts: bool
+    speculative_tts_workers: int
+    builder_mode: str
+    context_cache: bool
+    context_cache_ttl_seconds: float
+    context_cache_min_tokens: int
+    session_mode: str
+    session_db_uri: str
+    session_ttl_seconds: float
+    session_trim_after_seconds: float
+    session_event_max_chars: int
+    session_compaction_interval_seconds: float
+    history_limit: int
+    history_cache_ttl_seconds: float
+    history_summary_enabled: bool
+    dedup_enabled: bool
+    dedup_threshold: float
+    backfill_limit: int
+    target_word_lexicon: bool
+    async_io: bool
+    warm_up: bool
+    max_concurrent_image_calls: int
+    max_concurrent_tts_calls: int
+    max_concurrent_storage_calls: int
+    max_concurrent_compositing: int
+    inventory_profiles: str
+    inventory_target: int
+    inventory_low_watermark: int
+    inventory_max_parallel: int
+    inventory_refill_interval_seconds: float
+    rate_limits: Dict[str, float]
+    default_requests_per_minute: float
+    rate_limit_max_retries: int
+    backoff_base_seconds: float
+    backoff_max_seconds: float
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parses `RATE_LIMITS`, a comma-separated list of `model=requests_per_minute`."""
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, requests_per_minute = item.split("=", 1)
+            limits[name.strip()] = float(requests_per_minute)
+    return limits
 
 load_dotenv()
 
@@ -22,6 +80,65 @@ configs = Configs(
     media_model=os.environ["MEDIA_GENERATION_MODEL"],
     llm_model=os.environ["LLM_MODEL"],
     font_path=os.environ["MEDIA_COMPOSE_FONT_PATH"],
+    # PNG keeps `final_image_gcs_path` at composed/{id}.png; e.g. "webp:80" opts into WebP,
+    # with one derivative per CARD_WIDTHS entry (lossy formats only)
+    card_formats=os.environ.get("CARD_FORMATS", "png"),
+    card_widths=os.environ.get("CARD_WIDTHS", "256"),
     generation_collection_name = "learning_generations",
-    local_persistence=os.environ.get("LOCAL_PERSISTENCE", "FALSE") == 'TRUE'
+    profile_collection_name="learning_profiles",
+    inventory_collection_name="card_inventory",
+    local_persistence=os.environ.get("LOCAL_PERSISTENCE", "FALSE") == 'TRUE',
+    sqlite_path=os.environ.get("SQLITE_PATH", os.path.join("tmp", "generations.db")),
+    single_write=os.environ.get("SINGLE_WRITE", "FALSE") == 'TRUE',
+    persist_raw_images=os.environ.get("PERSIST_RAW_IMAGES", "TRUE") == 'TRUE',
+    cache_dir=os.environ.get("CACHE_DIR", os.path.join("tmp", "cache")),
+    speech_cache_enabled=os.environ.get("SPEECH_CACHE", "TRUE") == 'TRUE',
+    speech_cache_max_bytes=int(os.environ.get("SPEECH_CACHE_MAX_MB", "256")) * 1024 * 1024,
+    speech_cache_marker_ttl_seconds=float(os.environ.get("SPEECH_CACHE_MARKER_TTL_SECONDS", "3600")),
+    image_cache_enabled=os.environ.get("IMAGE_CACHE", "TRUE") == 'TRUE',
+    image_cache_max_bytes=int(os.environ.get("IMAGE_CACHE_MAX_MB", "1024")) * 1024 * 1024,
+    speculative_tts=os.environ.get("SPECULATIVE_TTS", "FALSE") == 'TRUE',
+    speculative_tts_workers=int(os.environ.get("SPECULATIVE_TTS_WORKERS", "8")),
+    builder_mode=os.environ.get("BUILDER_MODE", "llm"),
+    context_cache=os.environ.get("CONTEXT_CACHE", "FALSE") == 'TRUE',
+    context_cache_ttl_seconds=float(os.environ.get("CONTEXT_CACHE_TTL_SECONDS", "3600")),
+    context_cache_min_tokens=int(os.environ.get("CONTEXT_CACHE_MIN_TOKENS", "1024")),
+    session_mode=os.environ.get("SESSION_MODE", "persistent"),
+    session_db_uri=os.environ.get("SESSION_DB_URI", "sqlite+aiosqlite:///./sessions.db"),
+    # Ephemeral sessions only need to outlive the run that created them
+    session_ttl_seconds=float(
+        os.environ.get(
+            "SESSION_TTL_SECONDS",
+            "900" if os.environ.get("SESSION_MODE") == "ephemeral" else "604800",
+        )
+    ),
+    session_trim_after_seconds=float(os.environ.get("SESSION_TRIM_AFTER_SECONDS", "600")),
+    session_event_max_chars=int(os.environ.get("SESSION_EVENT_MAX_CHARS", "2000")),
+    session_compaction_interval_seconds=float(os.environ.get("SESSION_COMPACTION_INTERVAL_SECONDS", "300")),
+    history_limit=int(os.environ.get("HISTORY_LIMIT", "25")),
+    history_cache_ttl_seconds=float(os.environ.get("HISTORY_CACHE_TTL_SECONDS", "300")),
+    history_summary_enabled=os.environ.get("HISTORY_SUMMARY", "FALSE") == 'TRUE',
+    dedup_enabled=os.environ.get("DEDUP_INDEX", "FALSE") == 'TRUE',
+    dedup_threshold=float(os.environ.get("DEDUP_THRESHOLD", "0.7")),
+    # Newest generations read at start-up by the sentence index and target word coverage
+    backfill_limit=int(os.environ.get("BACKFILL_LIMIT", "20000")),
+    target_word_lexicon=os.environ.get("TARGET_WORD_LEXICON", "FALSE") == 'TRUE',
+    async_io=os.environ.get("ASYNC_IO", "FALSE") == 'TRUE',
+    warm_up=os.environ.get("WARM_UP", "TRUE") == 'TRUE',
+    max_concurrent_image_calls=int(os.environ.get("MAX_CONCURRENT_IMAGE_CALLS", "32")),
+    max_concurrent_tts_calls=int(os.environ.get("MAX_CONCURRENT_TTS_CALLS", "64")),
+    max_concurrent_storage_calls=int(os.environ.get("MAX_CONCURRENT_STORAGE_CALLS", "128")),
+    max_concurrent_compositing=int(os.environ.get("MAX_CONCURRENT_COMPOSITING", str(os.cpu_count() or 1))),
+    inventory_profiles=os.environ.get("INVENTORY_PROFILES", ""),
+    inventory_target=int(os.environ.get("INVENTORY_TARGET", "10")),
+    inventory_low_watermark=int(os.environ.get("INVENTORY_LOW_WATERMARK", "3")),
+    inventory_max_parallel=int(os.environ.get("INVENTORY_MAX_PARALLEL", "4")),
+    inventory_refill_interval_seconds=float(os.environ.get("INVENTORY_REFILL_INTERVAL_SECONDS", "60")),
+    rate_limits=parse_rate_limits(
+        os.environ.get("RATE_LIMITS", f"{os.environ['MEDIA_GENERATION_MODEL']}=60,tts=300")
+    ),
+    default_requests_per_minute=float(os.environ.get("DEFAULT_REQUESTS_PER_MINUTE", "60")),
+    rate_limit_max_retries=int(os.environ.get("RATE_LIMIT_MAX_RETRIES", "5")),
+    backoff_base_seconds=float(os.environ.get("BACKOFF_BASE_SECONDS", "1")),
+    backoff_max_seconds=float(os.environ.get("BACKOFF_MAX_SECONDS", "32")),
 )
\ No newline at end of file
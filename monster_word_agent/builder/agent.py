@@ -1,23 +1,149 @@
 import asyncio
 import json
+import re
+from typing import AsyncGenerator, Dict, Optional
 
-from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.agents import BaseAgent, LlmAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
 from google.adk.models import Gemini
 from google.adk.runners import InMemoryRunner
+from google.genai import types
 from dotenv import load_dotenv
 
 from .instructions import INSTRUCTIONS_V1
-from .tools.orchestrator import build_media_assets_tool
+from .tools.orchestrator import build_media_assets, build_media_assets_tool, fresh_image_requested
+from .. import progress
 from ..app_configs import configs
+from ..context_cache import context_cache_callbacks
 
-builder_agent = LlmAgent(
-    name="BuilderAgent",
-    instruction=INSTRUCTIONS_V1,
-    model=Gemini(model=configs.llm_model),
-    tools=[
-        build_media_assets_tool,
-    ],
-)
+DESIGNER_OUTPUT_KEY = "designer_output"
+# Both builders share it: the pipeline reads its output from this author's events
+BUILDER_AGENT_NAME = "BuilderAgent"
+BUILDER_INPUT_FIELDS = ("id", "image_prompt", "sentence", "language")
+
+
+def parse_agent_json(text: str) -> Optional[Dict]:
+    """
+    Parses an agent's final JSON output, tolerating markdown code fences.
+
+    Returns:
+        Optional[Dict]: The parsed object, or None if it is not valid JSON.
+    """
+    cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+    try:
+        data = json.loads(cleaned)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class DirectBuilderAgent(BaseAgent):
+    """
+    Deterministic replacement for the LLM BuilderAgent.
+
+    Reads the designer output from session state (or from the designer's last
+    message), calls `build_media_assets` directly and emits the same final
+    JSON as the LLM builder, without a model round-trip.
+
+    While the assets are built, each progress event (audio ready, raw image
+    ready, composite ready) is yielded as a partial event carrying it in
+    `custom_metadata["progress"]`, so `/run_sse` clients can render early.
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        design = self._find_design(ctx)
+
+        if design is None:
+            result = {"error": "Could not parse the designer output."}
+        else:
+            missing = [field for field in BUILDER_INPUT_FIELDS if not design.get(field)]
+            if missing:
+                result = {"error": f"Designer output is missing {', '.join(missing)}."}
+            else:
+                with progress.listen() as channel:
+                    build = asyncio.create_task(
+                        build_media_assets(
+                            id=design["id"],
+                            image_prompt=design["image_prompt"],
+                            sentence=design["sentence"],
+                            language=design["language"],
+                            fresh_image=fresh_image_requested(ctx.user_content),
+                            translations=design.get("translations"),
+                        )
+                    )
+                while not build.done():
+                    waiter = asyncio.create_task(channel.get())
+                    await asyncio.wait({build, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                    if waiter.done():
+                        yield self._progress_event(ctx, waiter.result())
+                    else:
+                        waiter.cancel()
+                while (event := channel.get_nowait()) is not None:
+                    yield self._progress_event(ctx, event)
+                result = build.result()
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model", parts=[types.Part.from_text(text=json.dumps(result))]
+            ),
+        )
+
+    def _progress_event(self, ctx: InvocationContext, event: Dict) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            partial=True,
+            custom_metadata={"progress": event},
+        )
+
+    def _find_design(self, ctx: InvocationContext) -> Optional[Dict]:
+        state_output = ctx.session.state.get(DESIGNER_OUTPUT_KEY)
+        if isinstance(state_output, dict):
+            return state_output
+        if isinstance(state_output, str):
+            return parse_agent_json(state_output)
+
+        # Fall back on the latest text message authored by another agent
+        for event in reversed(ctx.session.events):
+            if event.author in (self.name, "user") or not event.content or not event.content.parts:
+                continue
+            text = "".join(part.text for part in event.content.parts if part.text and not part.thought)
+            if text:
+                return parse_agent_json(text)
+        return None
+
+
+def create_llm_builder_agent() -> LlmAgent:
+    """Builds the LLM BuilderAgent, which calls `build_media_assets_tool` itself."""
+    return LlmAgent(
+        name=BUILDER_AGENT_NAME,
+        instruction=INSTRUCTIONS_V1,
+        model=Gemini(model=configs.llm_model),
+        tools=[
+            build_media_assets_tool,
+        ],
+        **context_cache_callbacks(),
+    )
+
+
+def create_direct_builder_agent() -> DirectBuilderAgent:
+    """Builds the deterministic builder, which skips the LLM round-trip."""
+    return DirectBuilderAgent(
+        name=BUILDER_AGENT_NAME,
+        description="Builds the media assets for the designer output without an LLM call",
+    )
+
+
+def create_builder_agent() -> BaseAgent:
+    """Builds only the builder selected by `BUILDER_MODE`."""
+    if configs.builder_mode == "direct":
+        return create_direct_builder_agent()
+    return create_llm_builder_agent()
 
 
 async def main():
@@ -25,7 +151,7 @@ async def main():
 
     sequential_agent = SequentialAgent(
         name="SequentialAgent",
-        sub_agents=[designer_agent, builder_agent],
+        sub_agents=[designer_agent, create_builder_agent()],
     )
 
     runner = InMemoryRunner(agent=sequential_agent)
@@ -19,6 +19,7 @@ You will receive a JSON object with:
    - **Argument `language`:** Use the `language` from the INPUT DATA.
 
 2. **Final Output:** Return a JSON object containing the ID and the final paths.
+   - If the tool result has `siblings` (the same card in other languages), include them as returned.
 
 ### OUTPUT FORMAT
 You must output a **single valid JSON object**. Do not include markdown formatting like ```json.
@@ -27,6 +28,8 @@ Structure:
 {
     "id": "<ECHO from input.id>",
     "final_image_gcs_path": "<Result from tool>",
-    "final_audio_gcs_path": "<Result from tool>"
+    "final_audio_gcs_path": "<Result from tool>",
+    "final_image_variants": "<Result from tool>",
+    "siblings": "<Result from tool, only when present>"
 }
 """
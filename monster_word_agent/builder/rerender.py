@@ -0,0 +1,231 @@
+import argparse
+import io
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from PIL import Image
+
+from ..app_configs import configs
+from ..clients import get_media_bucket, get_storage_client
+from ..stores import get_generation_store
+from ..stores.batch import BatchedWriter
+from .tools.combine import primary_card_path, render_card_outputs, save_card_outputs
+from .tools.generate import image_cache_key, lookup_cached_image
+
+
+def load_raw_image(id: str, image_prompt: Optional[str] = None, raw_image_path: Optional[str] = None) -> bytes:
+    """
+    Loads the raw image of generation `id` from its recorded `raw_image_path`
+    (`raw/{id}.png` or a shared `raw/by-hash/` object), or `raw/{id}.png` for
+    older records, falling back to the raw image cache by its prompt when it
+    was not persisted on its own (PERSIST_RAW_IMAGES=FALSE).
+    """
+    from google.api_core.exceptions import NotFound
+
+    try:
+        if raw_image_path and raw_image_path.startswith("gs://"):
+            bucket_name, object_name = raw_image_path[len("gs://"):].split("/", 1)
+            return get_storage_client().bucket(bucket_name).blob(object_name).download_as_bytes()
+        if raw_image_path:
+            with open(raw_image_path, "rb") as f:
+                return f.read()
+        if configs.local_persistence:
+            with open(os.path.join("tmp", "raw", f"{id}.png"), "rb") as f:
+                return f.read()
+        return get_media_bucket().blob(f"raw/{id}.png").download_as_bytes()
+    except (FileNotFoundError, NotFound):
+        if not image_prompt:
+            raise
+
+    image_bytes = lookup_cached_image(image_cache_key(image_prompt))
+    if image_bytes is None:
+        raise FileNotFoundError(f"No raw image for {id}, neither raw/{id}.png nor in the image cache")
+    return image_bytes
+
+
+def render_card_bytes(image_bytes: bytes, sentence: str) -> Dict[str, bytes]:
+    # Runs in the process pool: each worker keeps its own CardRenderer caches
+    return render_card_outputs(Image.open(io.BytesIO(image_bytes)), sentence)
+
+
+def save_rerendered(id: str, encoded: Dict[str, bytes], writer: BatchedWriter) -> str:
+    variants = save_card_outputs(id, encoded)
+    writer.upsert(
+        id, {"final_image_gcs_path": primary_card_path(variants), "final_image_variants": variants}
+    )
+    return id
+
+
+def _then(future: Future, step: Callable[[Any], Future], result: Future) -> None:
+    """
+    Once `future` completes, starts `step` on its result and resolves `result`
+    with the outcome. No thread waits in between: each stage only holds a
+    worker of its own pool while it runs.
+    """
+
+    def forward(done: Future) -> None:
+        try:
+            next_future = step(done.result())
+        except Exception as e:
+            result.set_exception(e)
+            return
+        next_future.add_done_callback(lambda finished: _resolve(finished, result))
+
+    future.add_done_callback(forward)
+
+
+def _resolve(finished: Future, result: Future) -> None:
+    try:
+        result.set_result(finished.result())
+    except Exception as e:
+        result.set_exception(e)
+
+
+def rerender_one(record: Dict, io_pool: Executor, cpu_pool: Executor, writer: BatchedWriter) -> Future:
+    """
+    Starts the re-render of one card: fetch on `io_pool`, composite on
+    `cpu_pool`, then upload and record on `io_pool` again.
+
+    Returns:
+        Future: Resolved with the card id once its update is queued on `writer`.
+    """
+    id = record["id"]
+    sentence = record["pedagogicalOutput"]["sentence"]
+
+    # Sibling cards share the raw image of the card they were fanned out from
+    fetched = io_pool.submit(
+        load_raw_image,
+        record.get("raw_image_id") or id,
+        record.get("image_prompt"),
+        record.get("raw_image_path"),
+    )
+    rendered: Future = Future()
+    saved: Future = Future()
+    _then(fetched, lambda image_bytes: cpu_pool.submit(render_card_bytes, image_bytes, sentence), rendered)
+    _then(rendered, lambda encoded: io_pool.submit(save_rerendered, id, encoded, writer), saved)
+    return saved
+
+
+def read_checkpoint(checkpoint_path: str) -> Set[str]:
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def rerender_cards(
+    checkpoint_path: str,
+    io_workers: int,
+    cpu_workers: int,
+    limit: Optional[int] = None,
+    report_every: float = 5.0,
+) -> Dict[str, float]:
+    """
+    Re-composites every completed card from its raw image, streaming the
+    records from the generation store (Firestore, or SQLite in local mode).
+    Every output of `CARD_FORMATS`/`CARD_WIDTHS` is written and recorded;
+    record updates are committed in batches (a Firestore BulkWriter, or one
+    SQLite transaction per batch). Records are read in pages (see
+    `GenerationStore.stream`), so a long run holds no query open.
+
+    Raw images are fetched and results uploaded on a bounded thread pool while
+    the compositing itself runs on a process pool; the stages are chained by
+    callbacks, so no I/O thread waits on the compositing. Ids are appended to
+    `checkpoint_path` once their record update is committed, so an interrupted
+    run resumes where it stopped.
+
+    Returns:
+        Dict[str, float]: Counts of rendered, skipped and failed cards, plus throughput.
+    """
+    done = read_checkpoint(checkpoint_path)
+    os.makedirs(os.path.dirname(checkpoint_path) or ".", exist_ok=True)
+
+    stats = {"rendered": 0, "skipped": 0, "failed": 0}
+    start = last_report = time.monotonic()
+    # Enough cards in flight to keep both pools busy
+    max_in_flight = (io_workers + cpu_workers) * 2
+
+    def report(final: bool = False):
+        elapsed = time.monotonic() - start
+        rate = stats["rendered"] / elapsed if elapsed else 0.0
+        label = "Done" if final else "Progress"
+        print(
+            f"{label}: {stats['rendered']} rendered, {stats['skipped']} skipped, "
+            f"{stats['failed']} failed in {elapsed:.1f}s ({rate:.2f} cards/s)"
+        )
+
+    store = get_generation_store()
+    checkpoint_lock = threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool, \
+            ProcessPoolExecutor(max_workers=cpu_workers) as cpu_pool, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+
+        def committed(ids: List[str]):
+            # Called by the writer after each successful batch, from any worker thread
+            with checkpoint_lock:
+                checkpoint.writelines(f"{id}\n" for id in ids)
+                checkpoint.flush()
+
+        writer = BatchedWriter(store, on_commit=committed)
+        pending = {}
+
+        def drain(until: int):
+            nonlocal last_report
+            while len(pending) > until:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    id = pending.pop(future)
+                    try:
+                        future.result()
+                        stats["rendered"] += 1
+                    except Exception as e:
+                        print(f"❌ Failed to re-render {id}: {e}")
+                        stats["failed"] += 1
+
+                if time.monotonic() - last_report >= report_every:
+                    last_report = time.monotonic()
+                    report()
+
+        records = store.stream(status="completed")
+        for count, record in enumerate(records):
+            if limit is not None and count >= limit:
+                break
+            if record["id"] in done:
+                stats["skipped"] += 1
+                continue
+
+            future = rerender_one(record, io_pool, cpu_pool, writer)
+            pending[future] = record["id"]
+            drain(max_in_flight - 1)
+
+        drain(0)
+        # The last batch: its ids are checkpointed once committed
+        writer.flush()
+
+    report(final=True)
+    elapsed = time.monotonic() - start
+    stats["elapsed_s"] = elapsed
+    stats["cards_per_s"] = stats["rendered"] / elapsed if elapsed else 0.0
+    return stats
+
+
+# python -m monster_word_agent.builder.rerender
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoint", type=str, default=os.path.join("tmp", "rerender-checkpoint.txt"))
+    parser.add_argument("--io-workers", type=int, default=16)
+    parser.add_argument("--cpu-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--limit", type=int, default=None)
+
+    args = parser.parse_args()
+
+    rerender_cards(
+        args.checkpoint,
+        io_workers=args.io_workers,
+        cpu_workers=args.cpu_workers,
+        limit=args.limit,
+    )
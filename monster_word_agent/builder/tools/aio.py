@@ -0,0 +1,214 @@
+import asyncio
+import io
+import weakref
+from typing import Dict, Optional
+
+from ...app_configs import configs
+from ...clients import get_async_storage, get_genai_async_client, get_tts_async_client
+from ...ratelimit import call_with_rate_limit_async
+from ...telemetry import log, stage
+from .generate import (
+    build_image_request,
+    count_image_cache,
+    extract_image_bytes,
+    image_object_name,
+    lookup_local_image,
+    remember_local_image,
+    save_raw_image,
+)
+from .speech import (
+    build_speech_request,
+    count_speech_cache,
+    lookup_local_speech,
+    mark_speech_uploaded,
+    remember_speech,
+    speech_cache_key,
+    speech_object_name,
+    write_local_audio,
+)
+
+# Async-native variants of the media tools. Network calls are awaited on the
+# event loop instead of holding a default-executor thread each, and every
+# service is bounded by its own semaphore so a single worker can keep hundreds
+# of cards in flight. Only CPU-bound compositing still runs in a thread.
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def limit(name: str) -> asyncio.Semaphore:
+    """Returns the concurrency limit of a service for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.get(loop)
+    if semaphores is None:
+        semaphores = {
+            "image": asyncio.Semaphore(configs.max_concurrent_image_calls),
+            "tts": asyncio.Semaphore(configs.max_concurrent_tts_calls),
+            "storage": asyncio.Semaphore(configs.max_concurrent_storage_calls),
+            "compositing": asyncio.Semaphore(configs.max_concurrent_compositing),
+        }
+        _semaphores[loop] = semaphores
+    return semaphores[name]
+
+
+async def upload_bytes_async(
+    object_name: str, data: bytes, content_type: str, parameters: Optional[Dict[str, str]] = None
+) -> str:
+    async with limit("storage"):
+        await get_async_storage().upload(
+            configs.gcp_media_bucket, object_name, data, content_type=content_type, parameters=parameters
+        )
+    return f"gs://{configs.gcp_media_bucket}/{object_name}"
+
+
+async def object_exists_async(object_name: str) -> bool:
+    from aiohttp import ClientResponseError
+
+    try:
+        async with limit("storage"):
+            await get_async_storage().download_metadata(configs.gcp_media_bucket, object_name)
+        return True
+    except ClientResponseError as e:
+        if e.status == 404:
+            return False
+        raise
+
+
+async def generate_image_bytes_async(prompt: str) -> bytes:
+    """Async variant of `generate_image_bytes`."""
+    contents, generate_content_config = build_image_request(prompt)
+
+    async def call():
+        async with limit("image"):
+            return await get_genai_async_client().models.generate_content(
+                model=configs.media_model,
+                contents=contents,
+                config=generate_content_config,
+            )
+
+    response = await call_with_rate_limit_async(configs.media_model, call)
+    return extract_image_bytes(response)
+
+
+async def lookup_cached_image_async(cache_key: str) -> Optional[bytes]:
+    """Async variant of `lookup_cached_image`."""
+    from aiohttp import ClientResponseError
+
+    image_bytes = await asyncio.to_thread(lookup_local_image, cache_key)
+    if image_bytes is not None:
+        return image_bytes
+
+    if not configs.local_persistence:
+        try:
+            async with limit("storage"):
+                image_bytes = await get_async_storage().download(
+                    configs.gcp_media_bucket, image_object_name(cache_key)
+                )
+        except ClientResponseError as e:
+            if e.status != 404:
+                raise
+            image_bytes = None
+        if image_bytes is not None:
+            count_image_cache("remote_hits")
+            await asyncio.to_thread(remember_local_image, cache_key, image_bytes)
+            return image_bytes
+
+    count_image_cache("misses")
+    return None
+
+
+async def remember_image_async(cache_key: str, image_bytes: bytes) -> bool:
+    """Async variant of `remember_image`."""
+    from aiohttp import ClientResponseError
+
+    await asyncio.to_thread(remember_local_image, cache_key, image_bytes)
+    if configs.local_persistence:
+        return False
+    try:
+        await upload_bytes_async(
+            image_object_name(cache_key), image_bytes, "image/png", parameters={"ifGenerationMatch": "0"}
+        )
+    except ClientResponseError as e:
+        if e.status != 412:
+            raise
+        return False
+    return True
+
+
+async def save_raw_image_async(id: str, image_bytes: bytes) -> str:
+    """Async variant of `save_raw_image`."""
+    if configs.local_persistence:
+        return await asyncio.to_thread(save_raw_image, id, image_bytes)
+    return await upload_bytes_async(f"raw/{id}.png", image_bytes, "image/png")
+
+
+async def create_composite_card_async(id: str, image_bytes: bytes, sentence: str) -> Dict[str, str]:
+    """Async variant of `create_composite_card_variants`; outputs are uploaded concurrently."""
+    # Pillow is loaded with the first card, not at import
+    from PIL import Image
+    from .combine import card_outputs, render_card_outputs, save_card_outputs
+
+    try:
+        async with limit("compositing"):
+            with stage("compositing"):
+                encoded = await asyncio.to_thread(
+                    lambda: render_card_outputs(Image.open(io.BytesIO(image_bytes)), sentence)
+                )
+    except Exception as e:
+        return {"error": f"Error processing image with PIL: {e}"}
+
+    with stage("upload"):
+        if configs.local_persistence:
+            return await asyncio.to_thread(save_card_outputs, id, encoded)
+
+        outputs = [output for output in card_outputs if output.name in encoded]
+        paths = await asyncio.gather(
+            *[
+                upload_bytes_async(output.object_name(id), encoded[output.name], output.content_type)
+                for output in outputs
+            ]
+        )
+    return {output.name: path for output, path in zip(outputs, paths)}
+
+
+async def generate_speech_async(generation_id: str, text: str, language: str) -> str:
+    """Async variant of `generate_speech_tool`, sharing its content-addressed cache."""
+    bucket_name = configs.gcp_media_bucket
+    synthesis_input, voice, audio_config = build_speech_request(text, language)
+    cache_key = speech_cache_key(text, voice, audio_config)
+    object_name = speech_object_name(cache_key, generation_id)
+
+    if configs.speech_cache_enabled:
+        try:
+            cached_path = await asyncio.to_thread(lookup_local_speech, cache_key, generation_id, bucket_name)
+            if cached_path:
+                return cached_path
+            if not configs.local_persistence and await object_exists_async(object_name):
+                count_speech_cache("remote_hits")
+                await asyncio.to_thread(mark_speech_uploaded, cache_key)
+                return f"gs://{bucket_name}/{object_name}"
+            count_speech_cache("misses")
+        except Exception as e:
+            log(f"⚠️ Speech cache lookup failed, synthesizing instead: {e}")
+
+    try:
+        async def call():
+            async with limit("tts"):
+                return await get_tts_async_client().synthesize_speech(
+                    input=synthesis_input, voice=voice, audio_config=audio_config
+                )
+
+        response = await call_with_rate_limit_async("tts", call)
+
+        if configs.local_persistence:
+            await asyncio.to_thread(remember_speech, cache_key, response.audio_content)
+            return await asyncio.to_thread(write_local_audio, generation_id, response.audio_content)
+
+        path = await upload_bytes_async(object_name, response.audio_content, "audio/mpeg")
+        await asyncio.to_thread(remember_speech, cache_key, response.audio_content)
+        return path
+
+    except Exception as e:
+        log(f"❌ TTS Generation failed: {e}")
+        return f"Error generating speech: {str(e)}"
@@ -1,83 +1,129 @@
+import functools
 import io
 import textwrap
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from google.cloud import storage
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, features
 
 from ...app_configs import configs
+from ...clients import get_media_bucket, get_storage_client
+from ...telemetry import log, stage
 
+CONTENT_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "avif": "image/avif",
+    "jpeg": "image/jpeg",
+}
 
-def create_composite_card_tool(id: str, image_path: str, sentence: str) -> str:
-    """
-    Overlays text onto the generated image to create the final flashcard.
 
-    Args:
-        id (str): The unique UUID for this generation pipeline.
-        image_path (str): The GCS path of the raw image (from Step 1).
-        sentence (str): The text to overlay on the bottom 20% of the image.
+class CardRenderer:
+    """
+    Long-lived flashcard renderer.
 
-    Returns:
-        str: The GCS path of the final composite image.
+    Loaded fonts are cached per size and line widths are memoized. The scrim
+    is a uniform black band, so it is blended in place on the bottom band only
+    through a precomputed lookup table: no full-frame RGBA copy or overlay is
+    made, and rendering a card only pays for the band, the text drawing and
+    the encode. Images with transparency still have their band alpha
+    composited, as the table only matches opaque pixels.
     """
-    image_bytes = None
-    bucket = None
-    bucket_name = None
 
-    if configs.local_persistence:
-        with open(image_path, "rb") as f:
-            image_bytes = f.read()   
-    else:
-        if not image_path.startswith("gs://"):
-            return f"Error: Invalid GCS path {image_path}"
+    def __init__(
+        self,
+        font_path: str,
+        scrim_ratio: float = 0.20,
+        scrim_alpha: int = 160,
+        text_color: Tuple[int, int, int] = (255, 255, 255),
+    ):
+        self.font_path = font_path
+        self.scrim_ratio = scrim_ratio
+        self.scrim_alpha = scrim_alpha
+        self.text_color = text_color
+        self._lock = threading.Lock()
+        self._fonts: Dict[int, ImageFont.ImageFont] = {}
+        self._scrims: Dict[Tuple[int, int], Image.Image] = {}
+        # Black at `scrim_alpha` over each channel value, as alpha_composite rounds it
+        self._scrim_table = [
+            (value * (255 - scrim_alpha) + 127) // 255 for value in range(256)
+        ] * 3
+        self.line_width = functools.lru_cache(maxsize=4096)(self._measure_line)
 
-        try:
-            path_parts = image_path.replace("gs://", "").split("/", 1)
-            bucket_name = path_parts[0]
-            source_blob_name = path_parts[1]
-        except IndexError:
-            return f"Error: Could not parse bucket/blob from {image_path}"
+    def font(self, font_size: int) -> ImageFont.ImageFont:
+        """Returns the font loaded at `font_size`, loading it on first use."""
+        font = self._fonts.get(font_size)
+        if font is None:
+            try:
+                # Try to load a standard font (Adjust path for your container OS)
+                # Common linux path: /usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf
+                font = ImageFont.truetype(self.font_path, font_size)
+            except IOError:
+                font = ImageFont.load_default()
+            with self._lock:
+                font = self._fonts.setdefault(font_size, font)
+        return font
 
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(source_blob_name)
+    def apply_scrim(self, image: Image.Image, start_y: int) -> None:
+        """Darkens the band of an RGB image below `start_y`, in place."""
+        box = (0, start_y, image.width, image.height)
+        image.paste(image.crop(box).point(self._scrim_table), box)
 
-        try:
-            image_bytes = blob.download_as_bytes()
-        except Exception as e:
-            return f"Error downloading from GCS: {e}"
+    def scrim(self, size: Tuple[int, int]) -> Image.Image:
+        """Returns the RGBA scrim band of `size`, creating it on first use."""
+        scrim = self._scrims.get(size)
+        if scrim is None:
+            scrim = Image.new("RGBA", size, (0, 0, 0, self.scrim_alpha))
+            with self._lock:
+                scrim = self._scrims.setdefault(size, scrim)
+        return scrim
 
-    try:
-        # Load
-        base = Image.open(io.BytesIO(image_bytes)).convert("RGBA")
-        width, height = base.size
+    def scrimmed_copy(self, image: Image.Image, start_y: int) -> Image.Image:
+        """An RGB copy of `image` with its band below `start_y` darkened."""
+        if not image.has_transparency_data:
+            base = image.convert("RGB")
+            self.apply_scrim(base, start_y)
+            return base
 
-        # Create Scrim (Bottom 20%)
-        overlay = Image.new("RGBA", base.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(overlay)
+        # Alpha compositing over transparent pixels also changes their alpha,
+        # which the table cannot express: composite the band as RGBA instead
+        rgba = image.convert("RGBA")
+        box = (0, start_y, rgba.width, rgba.height)
+        band = Image.alpha_composite(rgba.crop(box), self.scrim((rgba.width, rgba.height - start_y)))
+        base = rgba.convert("RGB")
+        base.paste(band.convert("RGB"), box)
+        return base
 
-        scrim_ratio = 0.20  # 20%
-        scrim_height = int(height * scrim_ratio)
-        start_y = height - scrim_height
+    def _measure_line(self, line: str, font_size: int) -> int:
+        text_bbox = self.font(font_size).getbbox(line)
+        return text_bbox[2] - text_bbox[0]
+
+    def render(self, image: Image.Image, sentence: str) -> Image.Image:
+        """
+        Overlays text onto an already decoded image.
 
-        # Draw semi-transparent black box
-        draw.rectangle([(0, start_y), (width, height)], fill=(0, 0, 0, 160))
+        Args:
+            image (Image.Image): The decoded raw image.
+            sentence (str): The text to overlay on the bottom 20% of the image.
 
-        # Composite
-        base = Image.alpha_composite(base, overlay)
-        base = base.convert("RGB")
+        Returns:
+            Image.Image: The final RGB flashcard.
+        """
+        width, height = image.size
+
+        scrim_height = int(height * self.scrim_ratio)
+        start_y = height - scrim_height
+
+        # A copy even when already RGB: the caller's image is left untouched
+        base = self.scrimmed_copy(image, start_y)
         draw = ImageDraw.Draw(base)
 
-        # Configure Font
         # Font size: ~30% of the scrim height ensures it fits comfortably
         font_size = int(scrim_height * 0.30)
-
-        try:
-            # Try to load a standard font (Adjust path for your container OS)
-            # Common linux path: /usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf
-            font = ImageFont.truetype(configs.font_path, font_size)
-        except IOError:
-            font = ImageFont.load_default()
+        font = self.font(font_size)
 
         # Wrap Text to fit width
         # Approx char width logic: font_size * 0.6 is a safe-ish estimate for variable width fonts
@@ -85,42 +131,235 @@ def create_composite_card_tool(id: str, image_path: str, sentence: str) -> str:
         lines = textwrap.wrap(sentence, width=chars_per_line)
 
         # Calculate Vertical Center of Text within the Scrim
-        # total_text_height = len(lines) * line_height
-        # top_padding = (scrim_height - total_text_height) / 2
         line_height = font_size * 1.2
         total_text_height = len(lines) * line_height
-        text_start_y = start_y + (scrim_height - total_text_height) / 2
+        current_y = start_y + (scrim_height - total_text_height) / 2
 
-        # Draw Lines
-        current_y = text_start_y
         for line in lines:
-            text_bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_x = (width - text_width) / 2
-
-            draw.text((text_x, current_y), line, font=font, fill=(255, 255, 255))
+            text_x = (width - self.line_width(line, font_size)) / 2
+            draw.text((text_x, current_y), line, font=font, fill=self.text_color)
             current_y += line_height
 
-        # 4. Save to Buffer
-        output_buffer = io.BytesIO()
-        base.save(output_buffer, format="PNG")
-        output_buffer.seek(0)
+        return base
 
-    except Exception as e:
-        return f"Error processing image with PIL: {e}"
-    
+    def render_many(self, cards: Iterable[Tuple[Image.Image, str]]) -> List[Image.Image]:
+        """
+        Renders a batch of cards, sharing the caches across all of them.
+
+        Args:
+            cards (Iterable[Tuple[Image.Image, str]]): (decoded image, sentence) pairs.
+
+        Returns:
+            List[Image.Image]: The final RGB flashcards, in input order.
+        """
+        return [self.render(image, sentence) for image, sentence in cards]
+
+
+@dataclass(frozen=True)
+class CardOutput:
+    """One encoded file of a flashcard: a format, its quality and an optional width."""
+
+    format: str
+    quality: Optional[int] = None
+    width: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return self.format if self.width is None else f"{self.format}-{self.width}w"
+
+    @property
+    def content_type(self) -> str:
+        return CONTENT_TYPES[self.format]
+
+    def object_name(self, id: str) -> str:
+        extension = "jpg" if self.format == "jpeg" else self.format
+        suffix = "" if self.width is None else f"-{self.width}w"
+        return f"composed/{id}{suffix}.{extension}"
+
+
+def parse_card_outputs(formats: str, widths: str) -> List[CardOutput]:
+    """
+    Parses `CARD_FORMATS` (e.g. "png", "webp:80" or "png,jpeg:85") and `CARD_WIDTHS` (e.g. "256").
+
+    Every format is encoded at full resolution and the first one is the primary
+    card. Lossy formats also get one smaller derivative per width; each output
+    is one more encode and upload per card, so keep the lists short.
+    """
+    outputs = []
+    for item in formats.split(","):
+        if not item.strip():
+            continue
+        format, _, quality = item.strip().lower().partition(":")
+        format = "jpeg" if format == "jpg" else format
+        if format not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported card format {format}")
+        if format != "png" and not features.check("jpg" if format == "jpeg" else format):
+            log(f"⚠️ Pillow was built without {format} support, skipping it")
+            continue
+        outputs.append(CardOutput(format, int(quality) if quality else None))
+
+    derivative_widths = [int(width) for width in widths.split(",") if width.strip()]
+    outputs += [
+        CardOutput(output.format, output.quality, width)
+        for width in derivative_widths
+        for output in list(outputs)
+        if output.format != "png"
+    ]
+    return outputs or [CardOutput("png")]
+
+
+card_renderer = CardRenderer(configs.font_path)
+card_outputs = parse_card_outputs(configs.card_formats, configs.card_widths)
+
+# Uploads the outputs of a card side by side, shared by every card of the process
+_upload_pool = ThreadPoolExecutor(
+    max_workers=min(32, configs.max_concurrent_storage_calls), thread_name_prefix="card-upload"
+)
+
+
+def encode_card(card: Image.Image, outputs: List[CardOutput]) -> Dict[str, bytes]:
+    """
+    Encodes a rendered card into every output, resizing once per derivative width.
+
+    Returns:
+        Dict[str, bytes]: The encoded files, keyed by output name.
+    """
+    resized: Dict[int, Image.Image] = {}
+    encoded = {}
+    for output in outputs:
+        image = card
+        if output.width is not None and output.width < card.width:
+            image = resized.get(output.width)
+            if image is None:
+                height = round(card.height * output.width / card.width)
+                image = card.resize((output.width, height), Image.Resampling.LANCZOS)
+                resized[output.width] = image
+
+        buffer = io.BytesIO()
+        params = {} if output.quality is None else {"quality": output.quality}
+        image.save(buffer, format=output.format.upper(), **params)
+        encoded[output.name] = buffer.getvalue()
+    return encoded
+
+
+def render_card_outputs(image: Image.Image, sentence: str) -> Dict[str, bytes]:
+    """
+    Renders the card once and encodes it into every configured output.
+
+    Args:
+        image (Image.Image): The decoded raw image.
+        sentence (str): The text to overlay on the bottom 20% of the image.
+
+    Returns:
+        Dict[str, bytes]: The encoded files, keyed by output name.
+    """
+    return encode_card(card_renderer.render(image, sentence), card_outputs)
+
+
+def save_card_output(id: str, output: CardOutput, data: bytes) -> str:
+    """
+    Persists one encoded output locally or to the media bucket.
+
+    Returns:
+        str: The local or GCS path of the file.
+    """
+    object_name = output.object_name(id)
     if configs.local_persistence:
-        local_dir = os.path.join("tmp", "composed")
-        os.makedirs(local_dir, exist_ok=True)
-        local_file_path = os.path.join(local_dir, f"{id}.png")
+        local_file_path = os.path.join("tmp", object_name)
+        os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
         with open(local_file_path, "wb") as f:
-            f.write(output_buffer.getbuffer())
+            f.write(data)
         return os.path.abspath(local_file_path)
     else:
-        final_blob_name = f"composed/{id}.png"
-        final_blob = bucket.blob(final_blob_name)
-        final_blob.upload_from_file(output_buffer, content_type="image/png")
-        return f"gs://{bucket_name}/{final_blob_name}"
+        blob = get_media_bucket().blob(object_name)
+        blob.upload_from_string(data, content_type=output.content_type)
+        return f"gs://{configs.gcp_media_bucket}/{object_name}"
+
+
+def save_card_outputs(id: str, encoded: Dict[str, bytes]) -> Dict[str, str]:
+    """
+    Persists every encoded output of a card, uploading them in parallel.
+
+    Returns:
+        Dict[str, str]: The path of each output, keyed by output name.
+    """
+    outputs = [output for output in card_outputs if output.name in encoded]
+    if configs.local_persistence or len(outputs) == 1:
+        return {output.name: save_card_output(id, output, encoded[output.name]) for output in outputs}
+
+    uploads = [_upload_pool.submit(save_card_output, id, output, encoded[output.name]) for output in outputs]
+    return {output.name: upload.result() for output, upload in zip(outputs, uploads)}
+
+
+def primary_card_path(variants: Dict[str, str]) -> str:
+    """Returns the path of the primary card (the first of `CARD_FORMATS`)."""
+    return variants[card_outputs[0].name]
+
+
+def create_composite_card_variants(id: str, image_bytes: bytes, sentence: str) -> Dict[str, str]:
+    """
+    Composites the flashcard from raw image bytes already held in memory and
+    persists every configured output from that single decode.
+
+    Args:
+        id (str): The unique UUID for this generation pipeline.
+        image_bytes (bytes): The raw PNG bytes from the image model.
+        sentence (str): The text to overlay on the bottom 20% of the image.
+
+    Returns:
+        Dict[str, str]: The path of each output keyed by output name, or an "error" entry.
+    """
+    try:
+        with stage("compositing"):
+            encoded = render_card_outputs(Image.open(io.BytesIO(image_bytes)), sentence)
+    except Exception as e:
+        return {"error": f"Error processing image with PIL: {e}"}
+
+    with stage("upload"):
+        return save_card_outputs(id, encoded)
+
+
+def create_composite_card_tool(id: str, image_path: str, sentence: str) -> Dict[str, str]:
+    """
+    Overlays text onto the generated image to create the final flashcard.
+
+    Nothing is written to the generation store: pass the returned paths to
+    `persist_media_paths` (`primary_card_path` and `image_variants`).
+
+    Args:
+        id (str): The unique UUID for this generation pipeline.
+        image_path (str): The GCS path of the raw image (from Step 1).
+        sentence (str): The text to overlay on the bottom 20% of the image.
+
+    Returns:
+        Dict[str, str]: The path of each output keyed by output name, or an "error" entry.
+    """
+    image_bytes = None
+
+    if configs.local_persistence:
+        with open(image_path, "rb") as f:
+            image_bytes = f.read()
+    else:
+        if not image_path.startswith("gs://"):
+            return {"error": f"Error: Invalid GCS path {image_path}"}
+
+        try:
+            path_parts = image_path.replace("gs://", "").split("/", 1)
+            bucket_name = path_parts[0]
+            source_blob_name = path_parts[1]
+        except IndexError:
+            return {"error": f"Error: Could not parse bucket/blob from {image_path}"}
+
+        bucket = get_storage_client().bucket(bucket_name)
+        blob = bucket.blob(source_blob_name)
+
+        try:
+            with stage("download"):
+                image_bytes = blob.download_as_bytes()
+        except Exception as e:
+            return {"error": f"Error downloading from GCS: {e}"}
+
+    return create_composite_card_variants(id, image_bytes, sentence)
 
 
 # uv run -m monster_word_agent.builder.tools.combine
@@ -1,34 +1,43 @@
 import os
 import uuid
 import base64
-import time
-from typing import Dict
-
-from google import genai
-from google.genai import types
-from google.cloud import storage
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from ...app_configs import configs
+from ...cache import DiskLRUCache, content_hash
+from ...clients import get_genai_client, get_media_bucket
+from ...ratelimit import call_with_rate_limit
+from ...telemetry import log
 
+if TYPE_CHECKING:
+    from google.genai import types
 
-def generate_image_tool(id: str, prompt: str) -> str:
+# Raw images are cached by the hash of everything that determines them: a
+# bounded local LRU tier, backed by a shared tier under raw/by-hash/ in the
+# media bucket. Shared objects are written once and never replaced, so cards
+# record them as their `raw_image_path` instead of copying them; the prefix
+# expires with the bucket lifecycle rule in deploy/media-bucket-lifecycle.json.
+_image_cache = DiskLRUCache(
+    os.path.join(configs.cache_dir, "raw"),
+    max_bytes=configs.image_cache_max_bytes,
+    suffix=".png",
+)
+_stats_lock = threading.Lock()
+_cache_stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "bypassed": 0}
+
+
+def build_image_request(prompt: str) -> Tuple[List["types.Content"], "types.GenerateContentConfig"]:
     """
-    Generates an image using Nano Banana (Gemini 2.5 Flash Image) and uploads it to GCS.
+    Builds the contents and config sent to the image model for `prompt`.
 
     Args:
-        id (str): The unique UUID for this generation pipeline.
         prompt (str): The natural language description for the image model.
 
     Returns:
-        str: The GCS path of the raw generated image.
+        Tuple[List[types.Content], types.GenerateContentConfig]: The request parts.
     """
-    ai_client = genai.Client(
-        vertexai=True,
-        project=configs.gcp_project,
-        location=configs.gcp_location,
-    )
-
-    storage_client = storage.Client(project=configs.gcp_project)
+    from google.genai import types
 
     prompt_part = types.Part.from_text(text=prompt)
 
@@ -61,56 +70,208 @@ def generate_image_tool(id: str, prompt: str) -> str:
         ),
     )
 
-    max_retries = 3
-    retry_delay = 1  # second
-    
-    for attempt in range(max_retries):
+    return contents, generate_content_config
+
+
+def extract_image_bytes(response: "types.GenerateContentResponse") -> bytes:
+    """
+    Extracts the image from an image model response.
+
+    Raises:
+        ValueError: If the response holds no image data.
+    """
+    image_data = None
+    if response.candidates and response.candidates[0].content.parts:
+        for part in response.candidates[0].content.parts:
+            if part.inline_data:
+                image_data = part.inline_data.data
+                break
+
+    if not image_data:
+        raise ValueError("No image data found in response.")
+
+    if isinstance(image_data, str):
+        return base64.b64decode(image_data)
+    return image_data
+
+
+def count_image_cache(stat: str) -> None:
+    with _stats_lock:
+        _cache_stats[stat] += 1
+
+
+def get_image_cache_stats() -> Dict[str, float]:
+    """
+    Reports the hit/miss counters of the raw image cache for this process.
+
+    Returns:
+        Dict[str, float]: Local and remote hits, misses, bypassed lookups and
+            the overall hit rate.
+    """
+    with _stats_lock:
+        stats = dict(_cache_stats)
+    lookups = stats["local_hits"] + stats["remote_hits"] + stats["misses"]
+    hits = stats["local_hits"] + stats["remote_hits"]
+    stats["hit_rate"] = hits / lookups if lookups else 0.0
+    stats.update(_image_cache.stats())
+    return stats
+
+
+def image_cache_key(prompt: str) -> str:
+    """Hashes (model, prompt, image config): what the image model is sent."""
+    _, generate_content_config = build_image_request(prompt)
+    return content_hash(
+        configs.media_model,
+        prompt,
+        generate_content_config.image_config.model_dump(mode="json", exclude_none=True),
+    )
+
+
+def image_object_name(cache_key: str) -> str:
+    """Object name of a cached raw image in the media bucket."""
+    return f"raw/by-hash/{cache_key}.png"
+
+
+def image_object_path(cache_key: str) -> str:
+    """GCS path of a cached raw image, recorded as the `raw_image_path` of its cards."""
+    return f"gs://{configs.gcp_media_bucket}/{image_object_name(cache_key)}"
+
+
+def lookup_local_image(cache_key: str) -> Optional[bytes]:
+    """Checks the local tier; a hit returns the image bytes."""
+    cached_path = _image_cache.get(cache_key)
+    if not cached_path:
+        return None
+    count_image_cache("local_hits")
+    with open(cached_path, "rb") as f:
+        return f.read()
+
+
+def lookup_cached_image(cache_key: str) -> Optional[bytes]:
+    """
+    Returns a previously generated image for the cache key, from the local
+    tier or else the shared one, or None on a miss.
+    """
+    image_bytes = lookup_local_image(cache_key)
+    if image_bytes is not None:
+        return image_bytes
+
+    if not configs.local_persistence:
+        from google.api_core.exceptions import NotFound
+
         try:
-            response = ai_client.models.generate_content(
-                model=configs.media_model,
-                contents=contents,
-                config=generate_content_config,
-            )
-            break  # Success!
-        except Exception as e:
-            if "429" in str(e) and attempt < max_retries - 1:
-                print(f"⚠️ Rate limited (429). Retrying in {retry_delay}s... (Attempt {attempt + 1}/{max_retries})")
-                time.sleep(retry_delay)
-                continue
-            raise e
+            image_bytes = get_media_bucket().blob(image_object_name(cache_key)).download_as_bytes()
+        except NotFound:
+            image_bytes = None
+        if image_bytes is not None:
+            count_image_cache("remote_hits")
+            remember_local_image(cache_key, image_bytes)
+            return image_bytes
+
+    count_image_cache("misses")
+    return None
+
+
+def remember_local_image(cache_key: str, image_bytes: bytes) -> None:
+    """Adds an image to the local tier."""
+    _image_cache.put(cache_key, image_bytes)
+
 
+def remember_image(cache_key: str, image_bytes: bytes) -> bool:
+    """
+    Adds a freshly generated image to the local and shared tiers.
+
+    Returns:
+        bool: Whether the shared object now holds this image. False locally,
+            or when a concurrent miss already stored another image for the key
+            (the first one is kept, as cards may reference it).
+    """
+    from google.api_core.exceptions import PreconditionFailed
+
+    remember_local_image(cache_key, image_bytes)
+    if configs.local_persistence:
+        return False
+    blob = get_media_bucket().blob(image_object_name(cache_key))
     try:
-        image_data = None
-        if response.candidates and response.candidates[0].content.parts:
-            for part in response.candidates[0].content.parts:
-                if part.inline_data:
-                    image_data = part.inline_data.data
-                    break
-
-        if not image_data:
-            raise ValueError("No image data found in response.")
-
-        if isinstance(image_data, str):
-            image_bytes = base64.b64decode(image_data)
-        else:
-            image_bytes = image_data
-
-        if configs.local_persistence:
-            local_dir = os.path.join("tmp", "raw")
-            os.makedirs(local_dir, exist_ok=True)
-            local_path = os.path.join(local_dir, f"{id}.png")
-            with open(local_path, "wb") as f:
-                f.write(image_bytes)
-            return os.path.abspath(local_path)
-        else:
-            filename = f"raw/{id}.png"
-            bucket = storage_client.bucket(configs.gcp_media_bucket)
-            blob = bucket.blob(filename)
-            blob.upload_from_string(image_bytes, content_type="image/png")
-            return f"gs://{configs.gcp_media_bucket}/{filename}"
+        # Create-only: an object referenced by cards is never overwritten
+        blob.upload_from_string(image_bytes, content_type="image/png", if_generation_match=0)
+    except PreconditionFailed:
+        return False
+    return True
+
+
+def generate_image_bytes(prompt: str) -> bytes:
+    """
+    Generates an image using Nano Banana (Gemini 2.5 Flash Image) and returns
+    the encoded PNG without persisting it.
+
+    Calls share the model's token bucket and are retried with backoff when
+    the quota is exceeded.
+
+    Args:
+        prompt (str): The natural language description for the image model.
+
+    Returns:
+        bytes: The raw PNG bytes returned by the model.
+    """
+    ai_client = get_genai_client()
+
+    contents, generate_content_config = build_image_request(prompt)
+
+    response = call_with_rate_limit(
+        configs.media_model,
+        lambda: ai_client.models.generate_content(
+            model=configs.media_model,
+            contents=contents,
+            config=generate_content_config,
+        ),
+    )
+
+    return extract_image_bytes(response)
+
 
+def save_raw_image(id: str, image_bytes: bytes) -> str:
+    """
+    Persists the raw generated image locally or to GCS.
+
+    Args:
+        id (str): The unique UUID for this generation pipeline.
+        image_bytes (bytes): The PNG bytes returned by `generate_image_bytes`.
+
+    Returns:
+        str: The local or GCS path of the raw image.
+    """
+    if configs.local_persistence:
+        local_dir = os.path.join("tmp", "raw")
+        os.makedirs(local_dir, exist_ok=True)
+        local_path = os.path.join(local_dir, f"{id}.png")
+        with open(local_path, "wb") as f:
+            f.write(image_bytes)
+        return os.path.abspath(local_path)
+    else:
+        filename = f"raw/{id}.png"
+        bucket = get_media_bucket()
+        blob = bucket.blob(filename)
+        blob.upload_from_string(image_bytes, content_type="image/png")
+        return f"gs://{configs.gcp_media_bucket}/{filename}"
+
+
+def generate_image_tool(id: str, prompt: str) -> str:
+    """
+    Generates an image using Nano Banana (Gemini 2.5 Flash Image) and uploads it to GCS.
+
+    Args:
+        id (str): The unique UUID for this generation pipeline.
+        prompt (str): The natural language description for the image model.
+
+    Returns:
+        str: The GCS path of the raw generated image.
+    """
+    try:
+        image_bytes = generate_image_bytes(prompt)
+        return save_raw_image(id, image_bytes)
     except Exception as e:
-        print(f"❌ Image generation failed: {e}")
+        log(f"❌ Image generation failed: {e}")
         raise e
 
 
@@ -1,70 +1,344 @@
 import asyncio
-from typing import Dict
+import json
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
-from .generate import generate_image_tool
+from google.adk.tools.tool_context import ToolContext
+
+from .generate import (
+    count_image_cache,
+    generate_image_bytes,
+    image_cache_key,
+    image_object_path,
+    lookup_cached_image,
+    remember_image,
+    save_raw_image,
+)
 from .speech import generate_speech_tool
-from .combine import create_composite_card_tool
-from .persistence import persist_media_paths
+from .speculative import speculative_speech
+from .persistence import persist_media_paths, persist_media_paths_async
+from .aio import (
+    create_composite_card_async,
+    generate_image_bytes_async,
+    generate_speech_async,
+    lookup_cached_image_async,
+    remember_image_async,
+    save_raw_image_async,
+)
+from ... import progress
+from ...app_configs import configs
+from ...teacher.tools import sibling_id, sibling_translations
+from ...telemetry import bind, count_error, log, stage
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+# With ASYNC_IO the async-native clients are used; otherwise the blocking
+# tools run in the default executor.
+
+def design_translations(tool_context: ToolContext) -> Optional[Dict[str, Dict]]:
+    """The `translations` of the designer output, read from the session state."""
+    from ..agent import DESIGNER_OUTPUT_KEY, parse_agent_json
+
+    design = tool_context.state.get(DESIGNER_OUTPUT_KEY)
+    if isinstance(design, str):
+        design = parse_agent_json(design)
+    return design.get("translations") if isinstance(design, dict) else None
+
+
+def fresh_image_requested(user_content: Optional["types.Content"]) -> bool:
+    """Whether the card request (the user message) set `freshImage` to skip the image cache."""
+    if user_content is None or not user_content.parts:
+        return False
+    for part in user_content.parts:
+        try:
+            request = json.loads(part.text or "")
+        except ValueError:
+            continue
+        if isinstance(request, dict):
+            return bool(request.get("freshImage"))
+    return False
+
+
+async def _lookup_cached_image(cache_key: str) -> Optional[bytes]:
+    try:
+        if configs.async_io:
+            return await lookup_cached_image_async(cache_key)
+        return await asyncio.to_thread(lookup_cached_image, cache_key)
+    except Exception as e:
+        log(f"⚠️ Image cache lookup failed, generating instead: {e}")
+        return None
+
+
+async def _remember_image(cache_key: str, image_bytes: bytes) -> bool:
+    if configs.async_io:
+        return await remember_image_async(cache_key, image_bytes)
+    return await asyncio.to_thread(remember_image, cache_key, image_bytes)
+
+
+async def _generate_image(prompt: str, fresh_image: bool = False) -> Tuple[bytes, Optional[str], bool]:
+    """
+    Returns the image bytes, the image cache key (None when the image is not
+    to be cached: cache disabled or a fresh variant) and whether it was a hit.
+    """
+    cache_key = image_cache_key(prompt) if configs.image_cache_enabled else None
+
+    with stage("image_generation"):
+        if cache_key is not None:
+            if fresh_image:
+                # A fresh variant is kept apart: cached images are never replaced
+                count_image_cache("bypassed")
+                cache_key = None
+            else:
+                cached = await _lookup_cached_image(cache_key)
+                if cached is not None:
+                    return cached, cache_key, True
+
+        if configs.async_io:
+            image_bytes = await generate_image_bytes_async(prompt)
+        else:
+            image_bytes = await asyncio.to_thread(generate_image_bytes, prompt)
+    return image_bytes, cache_key, False
+
+
+async def _save_raw_image(id: str, image_bytes: bytes) -> str:
+    with stage("raw_upload"):
+        if configs.async_io:
+            return await save_raw_image_async(id, image_bytes)
+        return await asyncio.to_thread(save_raw_image, id, image_bytes)
+
+
+async def _create_composite_card(id: str, image_bytes: bytes, sentence: str) -> Dict[str, str]:
+    # Pillow is loaded with the first card, not at import
+    from .combine import create_composite_card_variants
+
+    if configs.async_io:
+        return await create_composite_card_async(id, image_bytes, sentence)
+    return await asyncio.to_thread(create_composite_card_variants, id, image_bytes, sentence)
+
+
+async def _generate_speech(id: str, sentence: str, language: str) -> str:
+    with stage("tts"):
+        speculative = speculative_speech.take(id, sentence, language)
+        if speculative is not None:
+            # Started when the sentence was persisted
+            audio_path = await asyncio.wrap_future(speculative)
+        elif configs.async_io:
+            audio_path = await generate_speech_async(id, sentence, language)
+        else:
+            audio_path = await asyncio.to_thread(generate_speech_tool, id, sentence, language)
+    if audio_path.startswith("Error"):
+        count_error("tts")
+    return audio_path
+
+
+async def _persist_media_paths(
+    id: str,
+    final_image_path: str,
+    final_audio_path: str,
+    image_prompt: str,
+    image_variants: Dict[str, str],
+    raw_image_path: Optional[str],
+) -> str:
+    with stage("persist"):
+        if configs.async_io:
+            result = await persist_media_paths_async(
+                id, final_image_path, final_audio_path, image_prompt, image_variants, raw_image_path
+            )
+        else:
+            result = await asyncio.to_thread(
+                persist_media_paths,
+                id,
+                final_image_path,
+                final_audio_path,
+                image_prompt,
+                image_variants,
+                raw_image_path,
+            )
+    if result.startswith("Error"):
+        count_error("persist")
+    return result
+
+
+async def _store_raw_image(id: str, image_bytes: bytes, cache_key: Optional[str], cached: bool) -> Optional[str]:
+    """
+    Stores the raw image once and returns the path recorded as the cards'
+    `raw_image_path`: the shared image cache object when it holds these bytes
+    (no copy per card), else `raw/{id}.png` when `PERSIST_RAW_IMAGES` is set.
+    """
+    try:
+        if cache_key is not None:
+            with stage("raw_upload"):
+                if cached:
+                    shared = not configs.local_persistence
+                else:
+                    shared = await _remember_image(cache_key, image_bytes)
+            if shared:
+                return image_object_path(cache_key)
+        if configs.persist_raw_images:
+            return await _save_raw_image(id, image_bytes)
+    except Exception as e:
+        log(f"⚠️ Storing the raw image of {id} failed: {e}")
+    return None
+
 
-async def build_media_assets_tool(id: str, image_prompt: str, sentence: str, language: str) -> Dict[str, str]:
+async def build_media_assets_tool(
+    id: str,
+    image_prompt: str,
+    sentence: str,
+    language: str,
+    tool_context: Optional[ToolContext] = None,
+) -> Dict:
     """
     Orchestrates the parallel generation of image and speech assets.
     
     This tool reduces latency by running independent tasks concurrently.
     1. Starts Image Generation and Speech Generation in parallel.
-    2. Once Image is ready, starts Compositing (overlaying text).
+    2. Once Image is ready, composites it in memory (overlaying text) and
+       encodes every output of `CARD_FORMATS`/`CARD_WIDTHS`. The raw image is
+       stored meanwhile, once: a cached image is referenced where it is.
     3. Once both Composite Image and Audio are ready, persists paths to the database.
 
+    An image already generated for the same prompt and image settings is
+    reused from the image cache, unless the card request sets `freshImage`.
+
+    When the designer output has `translations` (the card request listed
+    several `languages`), the raw image is generated once and each translation
+    gets its own composite, audio and sibling record, returned in `siblings`.
+
     Args:
         id (str): The unique Generation ID.
         image_prompt (str): Description for the image generator.
         sentence (str): The text for overlay and speech.
         language (str): The language code (fr, en, es).
+        tool_context (Optional[ToolContext]): Set by ADK; gives access to the card request.
 
     Returns:
-        Dict[str, str]: A dictionary containing the ID and final media paths.
+        Dict: A dictionary containing the ID, the final media paths, the
+            path of each image output and, with translations, the sibling cards.
     """
-    
-    async def image_pipeline():
-        # Step 1: Generate Raw Image
-        raw_image_path = await asyncio.to_thread(generate_image_tool, id, image_prompt)
-        if raw_image_path.startswith("Error"):
-            raise Exception(raw_image_path)
-            
-        # Step 2: Create Composite (Text Overlay)
-        final_image_path = await asyncio.to_thread(create_composite_card_tool, id, raw_image_path, sentence)
-        if final_image_path.startswith("Error"):
-            raise Exception(final_image_path)
-            
-        return final_image_path
-
-    async def speech_pipeline():
+    fresh_image = False
+    translations = None
+    if tool_context is not None:
+        fresh_image = fresh_image_requested(tool_context.user_content)
+        translations = design_translations(tool_context)
+    return await build_media_assets(
+        id, image_prompt, sentence, language, fresh_image=fresh_image, translations=translations
+    )
+
+
+async def build_media_assets(
+    id: str,
+    image_prompt: str,
+    sentence: str,
+    language: str,
+    fresh_image: bool = False,
+    translations: Optional[Dict[str, Dict]] = None,
+) -> Dict:
+    """
+    `build_media_assets_tool` for direct callers: `fresh_image` bypasses the
+    image cache and `translations` ({language: {"sentence": ...}}) fans the
+    card out to sibling languages.
+    """
+    with bind(language=language):
+        with stage("total"):
+            result = await _build_media_assets(
+                id, image_prompt, sentence, language, fresh_image, translations
+            )
+        if "error" in result:
+            count_error("total")
+            log(f"❌ Card {id} failed: {result['error']}")
+    return result
+
+
+async def _build_media_assets(
+    id: str,
+    image_prompt: str,
+    sentence: str,
+    language: str,
+    fresh_image: bool,
+    translations: Optional[Dict[str, Dict]] = None,
+) -> Dict:
+    from .combine import primary_card_path
+
+    # The requested card first, then one sibling card per translation
+    cards = [(id, sentence, language)] + [
+        (sibling_id(id, sibling_language), translation["sentence"], sibling_language)
+        for sibling_language, translation in sibling_translations(language, translations).items()
+    ]
+
+    async def raw_image_pipeline():
+        # Step 1: Generate Raw Image (kept in memory), once for every language
+        image_bytes, cache_key, cached = await _generate_image(image_prompt, fresh_image)
+        progress.emit(progress.RAW_IMAGE_READY, id=id)
+        # Stored while the cards are composited; every card records the same path
+        raw_image_path = asyncio.ensure_future(_store_raw_image(id, image_bytes, cache_key, cached))
+        return image_bytes, raw_image_path
+
+    raw_image = asyncio.ensure_future(raw_image_pipeline())
+
+    async def image_pipeline(card_id: str, card_sentence: str):
+        image_bytes, _ = await raw_image
+
+        # Step 2: Create Composite (Text Overlay) in every output format
+        image_variants = await _create_composite_card(card_id, image_bytes, card_sentence)
+        if "error" in image_variants:
+            raise Exception(image_variants["error"])
+
+        progress.emit(
+            progress.COMPOSITE_READY,
+            id=card_id,
+            final_image_gcs_path=primary_card_path(image_variants),
+            final_image_variants=image_variants,
+        )
+        return image_variants
+
+    async def speech_pipeline(card_id: str, card_sentence: str, card_language: str):
         # Step 1: Generate Speech
-        audio_path = await asyncio.to_thread(generate_speech_tool, id, sentence, language)
+        audio_path = await _generate_speech(card_id, card_sentence, card_language)
         if audio_path.startswith("Error"):
             raise Exception(audio_path)
-            
+
+        progress.emit(progress.AUDIO_READY, id=card_id, final_audio_gcs_path=audio_path)
         return audio_path
 
-    # Run pipelines concurrently
-    try:
-        final_image_path, final_audio_path = await asyncio.gather(
-            image_pipeline(),
-            speech_pipeline()
+    async def card_pipeline(card_id: str, card_sentence: str, card_language: str) -> Dict:
+        # Run pipelines concurrently
+        try:
+            image_variants, final_audio_path = await asyncio.gather(
+                image_pipeline(card_id, card_sentence),
+                speech_pipeline(card_id, card_sentence, card_language),
+            )
+        except Exception as e:
+            return {"error": f"Media generation failed: {str(e)}"}
+
+        # Step 3: Persist results
+        final_image_path = primary_card_path(image_variants)
+        raw_image_path = await (await raw_image)[1]
+        persist_result = await _persist_media_paths(
+            card_id, final_image_path, final_audio_path, image_prompt, image_variants, raw_image_path
         )
-    except Exception as e:
-        return {"error": f"Media generation failed: {str(e)}"}
+        if persist_result.startswith("Error"):
+            return {"error": persist_result}
 
-    # Step 3: Persist results
-    persist_result = await asyncio.to_thread(
-        persist_media_paths, id, final_image_path, final_audio_path, image_prompt
-    )
-    
-    if persist_result.startswith("Error"):
-        return {"error": persist_result}
-
-    return {
-        "id": id,
-        "final_image_gcs_path": final_image_path,
-        "final_audio_gcs_path": final_audio_path
-    }
+        return {
+            "id": card_id,
+            "final_image_gcs_path": final_image_path,
+            "final_audio_gcs_path": final_audio_path,
+            "final_image_variants": image_variants,
+        }
+
+    outcomes = await asyncio.gather(*[card_pipeline(*card) for card in cards])
+
+    result = outcomes[0]
+    if "error" in result or len(cards) == 1:
+        return result
+
+    # A failed sibling does not fail the requested card
+    result["siblings"] = []
+    for (card_id, _, card_language), outcome in zip(cards[1:], outcomes[1:]):
+        if "error" in outcome:
+            count_error("sibling")
+            log(f"⚠️ Sibling card {card_id} ({card_language}) failed: {outcome['error']}")
+        else:
+            result["siblings"].append({**outcome, "language": card_language})
+    return result
@@ -1,55 +1,113 @@
-import os
-import json
-from datetime import datetime
+from typing import Dict, Optional
 
-from google.cloud import firestore
+from ...stores import get_generation_store
+from ...stores.pending import pending_generations
+from ...telemetry import log
 
-from ...database import db
-from ...app_configs import configs
 
+def media_paths_fields(
+    final_image_path: str,
+    final_audio_path: str,
+    image_prompt: str,
+    image_variants: Optional[Dict[str, str]] = None,
+    raw_image_path: Optional[str] = None,
+) -> Dict:
+    """Fields written when a generation completes."""
+    fields = {
+        "final_image_gcs_path": final_image_path,
+        "final_audio_gcs_path": final_audio_path,
+        "image_prompt": image_prompt,
+        "status": "completed",
+        "completed_at": get_generation_store().server_timestamp(),
+    }
+    if image_variants:
+        fields["final_image_variants"] = image_variants
+    if raw_image_path:
+        fields["raw_image_path"] = raw_image_path
+    return fields
 
-def persist_media_paths(id: str, final_image_path: str, final_audio_path: str,  image_prompt: str) -> str:
+
+def _write_media_paths(id: str, fields: Dict) -> None:
+    store = get_generation_store()
+    # In SINGLE_WRITE mode the record itself is still held in memory: write it with the paths
+    pending = pending_generations.get(id)
+    if pending is None:
+        # The record must exist: an unknown id fails instead of creating an orphan
+        store.update(id, fields)
+        return
+    store.upsert(id, {**pending, **fields})
+    # Only once written, so a failed write can be retried with the full record
+    pending_generations.release(id)
+
+
+async def _write_media_paths_async(id: str, fields: Dict) -> None:
+    store = get_generation_store()
+    pending = pending_generations.get(id)
+    if pending is None:
+        await store.update_async(id, fields)
+        return
+    await store.upsert_async(id, {**pending, **fields})
+    pending_generations.release(id)
+
+
+def persist_media_paths(
+    id: str,
+    final_image_path: str,
+    final_audio_path: str,
+    image_prompt: str,
+    image_variants: Optional[Dict[str, str]] = None,
+    raw_image_path: Optional[str] = None,
+) -> str:
     """
-    Updates the existing generation record in Firestore with the final GCS paths
+    Updates the existing generation record in the generation store with the final paths
     for the generated media and the prompt used to create the visual.
 
+    Retries are idempotent. The record must already exist, except in
+    SINGLE_WRITE mode where this write carries the record held by
+    `persist_learning_data` (an upsert keyed by `id`).
+
     Args:
         id (str): The unique UUID of the generation (must match the document ID).
         final_image_path (str): The GCS path of the final composite flashcard.
         final_audio_path (str): The GCS path of the generated audio.
         image_prompt (str): The text prompt used to generate the image.
+        image_variants (Optional[Dict[str, str]]): Paths of the other encoded outputs, by name.
+        raw_image_path (Optional[str]): Where the raw image is stored, if it is:
+            `raw/{id}.png` or a shared `raw/by-hash/` cache object.
 
     Returns:
         str: Success message indicating the paths were saved.
     """
     try:
-        if configs.local_persistence:
-            file_path = os.path.join("tmp", f"{id}.json")
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            data.update({
-                "final_image_gcs_path": final_image_path,
-                "final_audio_gcs_path": final_audio_path,
-                "image_prompt": image_prompt,
-                "status": "completed",
-                "completed_at": datetime.now().isoformat()
-            })
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
-        else:
-            doc_ref = db.collection(configs.generation_collection_name).document(id)
-            doc_ref.update(
-                {
-                    "final_image_gcs_path": final_image_path,
-                    "final_audio_gcs_path": final_audio_path,
-                    "image_prompt": image_prompt,
-                    "status": "completed",
-                    "completed_at": firestore.SERVER_TIMESTAMP,
-                }
-            )
+        fields = media_paths_fields(
+            final_image_path, final_audio_path, image_prompt, image_variants, raw_image_path
+        )
+        _write_media_paths(id, fields)
+
+        return "Media paths persisted successfully."
+
+    except Exception as e:
+        log(f"Failed to update media paths: {e}")
+        return f"Error persisting paths: {str(e)}"
+
+
+async def persist_media_paths_async(
+    id: str,
+    final_image_path: str,
+    final_audio_path: str,
+    image_prompt: str,
+    image_variants: Optional[Dict[str, str]] = None,
+    raw_image_path: Optional[str] = None,
+) -> str:
+    """Async variant of `persist_media_paths`, using the async Firestore client."""
+    try:
+        fields = media_paths_fields(
+            final_image_path, final_audio_path, image_prompt, image_variants, raw_image_path
+        )
+        await _write_media_paths_async(id, fields)
 
         return "Media paths persisted successfully."
 
     except Exception as e:
-        print(f"Failed to update media paths: {e}")
+        log(f"Failed to update media paths: {e}")
         return f"Error persisting paths: {str(e)}"
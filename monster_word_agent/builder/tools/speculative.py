@@ -0,0 +1,83 @@
+import contextvars
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from .speech import generate_speech_tool
+from ...app_configs import configs
+from ...telemetry import log
+
+
+class SpeculativeSpeech:
+    """
+    Speech synthesized ahead of the builder.
+
+    With SPECULATIVE_TTS enabled, `persist_learning_data` starts synthesis as
+    soon as the sentence is final, while the designer is still finishing its
+    turn. The orchestrator then takes the in-flight (or finished) result
+    instead of synthesizing again. A started synthesis is only reused for the
+    same id, sentence and language; the oldest unclaimed ones are dropped
+    beyond `max_size`.
+    """
+
+    def __init__(self, max_workers: int, max_size: int = 256):
+        self.max_size = max_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative-tts")
+        self._lock = threading.Lock()
+        self._inflight: "OrderedDict[str, Tuple[str, str, Future]]" = OrderedDict()
+        self._stats = {"started": 0, "taken": 0, "mismatched": 0, "dropped": 0}
+
+    def start(self, id: str, sentence: str, language: str) -> None:
+        with self._lock:
+            if id in self._inflight:
+                return
+            # Telemetry labels and the progress channel follow the synthesis
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, generate_speech_tool, id, sentence, language)
+            self._inflight[id] = (sentence, language, future)
+            self._stats["started"] += 1
+            while len(self._inflight) > self.max_size:
+                dropped, (_, _, dropped_future) = self._inflight.popitem(last=False)
+                dropped_future.cancel()
+                self._stats["dropped"] += 1
+                log(f"⚠️ Dropping speculative speech {dropped}: never picked up")
+
+    def take(self, id: str, sentence: str, language: str) -> Optional[Future]:
+        """Removes and returns the synthesis started for this card, if it still applies."""
+        with self._lock:
+            started = self._inflight.pop(id, None)
+            if started is None:
+                return None
+            started_sentence, started_language, future = started
+            if (started_sentence, started_language) != (sentence, language):
+                self._stats["mismatched"] += 1
+                return None
+            self._stats["taken"] += 1
+            return future
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, inflight=len(self._inflight))
+
+
+speculative_speech = SpeculativeSpeech(max_workers=configs.speculative_tts_workers)
+
+
+def start_speculative_speech(id: str, sentence: str, language: str) -> None:
+    """Starts synthesizing a card's sentence in the background; never raises."""
+    try:
+        speculative_speech.start(id, sentence, language)
+    except Exception as e:
+        log(f"⚠️ Could not start speculative speech for {id}: {e}")
+
+
+def get_speculative_speech_stats() -> Dict[str, int]:
+    """
+    Reports how often speculatively started speech was reused.
+
+    Returns:
+        Dict[str, int]: Started, taken, mismatched (sentence changed), dropped
+            and currently in-flight syntheses.
+    """
+    return speculative_speech.stats()
@@ -1,38 +1,100 @@
 import os
-from google.cloud import texttospeech
-from google.cloud import storage
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 from ...app_configs import configs
+from ...cache import DiskLRUCache, content_hash
+from ...clients import get_storage_client, get_tts_client
+from ...ratelimit import call_with_rate_limit
+from ...telemetry import log
 
+if TYPE_CHECKING:
+    from google.cloud import texttospeech
 
-def generate_speech_tool(generation_id: str, text: str, language: str) -> str:
-    """
-    Synthesizes text using Google Cloud 'Chirp 3: HD' and saves to GCS
-    using the provided generation ID for the filename.
+VOICE_MAP = {
+    "en": {"code": "en-US", "name": "en-US-Chirp3-HD-Charon"},
+    "fr": {"code": "fr-FR", "name": "fr-FR-Chirp3-HD-Charon"},
+    "es": {"code": "es-ES", "name": "es-ES-Chirp3-HD-Charon"},
+}
 
-    Args:
-        generation_id (str): The shared ID for this generation (matches the image).
-        text (str): The sentence to speak.
-        language (str): The language code ('en', 'fr', 'es').
+# Synthesized audio is cached by the hash of everything that determines it:
+# a shared tier in the media bucket, with a bounded local LRU tier in front.
+# Locally the tier holds the audio itself. With a bucket it only holds markers
+# recording when the object was last seen; a marker older than
+# SPEECH_CACHE_MARKER_TTL_SECONDS is re-checked against the bucket, so objects
+# removed by a lifecycle rule are synthesized again.
+_speech_cache = DiskLRUCache(
+    os.path.join(configs.cache_dir, "audio"),
+    max_bytes=configs.speech_cache_max_bytes,
+    suffix=".mp3",
+)
+_speech_markers = DiskLRUCache(
+    os.path.join(configs.cache_dir, "audio-markers"),
+    # A marker is a timestamp of ~20 bytes
+    max_bytes=max(1, configs.speech_cache_max_bytes // 64),
+    suffix=".seen",
+)
+_stats_lock = threading.Lock()
+_cache_stats = {"local_hits": 0, "remote_hits": 0, "misses": 0}
+
+
+def count_speech_cache(stat: str) -> None:
+    with _stats_lock:
+        _cache_stats[stat] += 1
+
+
+def get_speech_cache_stats() -> Dict[str, float]:
+    """
+    Reports the hit/miss counters of the speech cache for this process.
 
     Returns:
-        str: The GCS URI of the saved audio file.
+        Dict[str, float]: Local and remote hits, misses and the overall hit rate.
     """
-    try:
-        project_id = os.environ["GOOGLE_CLOUD_PROJECT"]
-        bucket_name = os.environ["GOOGLE_CLOUD_MEDIA_BUCKET"]
-    except KeyError as e:
-        return f"Error: Missing environment variable {e}"
+    with _stats_lock:
+        stats = dict(_cache_stats)
+    lookups = stats["local_hits"] + stats["remote_hits"] + stats["misses"]
+    hits = stats["local_hits"] + stats["remote_hits"]
+    stats["hit_rate"] = hits / lookups if lookups else 0.0
+    stats.update(_speech_cache.stats() if configs.local_persistence else _speech_markers.stats())
+    return stats
 
-    voice_map = {
-        "en": {"code": "en-US", "name": "en-US-Chirp3-HD-Charon"},
-        "fr": {"code": "fr-FR", "name": "fr-FR-Chirp3-HD-Charon"},
-        "es": {"code": "es-ES", "name": "es-ES-Chirp3-HD-Charon"},
-    }
 
-    voice_config = voice_map.get(language.lower(), voice_map["en"])
+def speech_cache_key(
+    text: str,
+    voice: "texttospeech.VoiceSelectionParams",
+    audio_config: "texttospeech.AudioConfig",
+) -> str:
+    """Hashes (text, language code, voice name, encoding, effects profile)."""
+    from google.cloud import texttospeech
+
+    return content_hash(
+        text,
+        voice.language_code,
+        voice.name,
+        texttospeech.AudioEncoding(audio_config.audio_encoding).name,
+        list(audio_config.effects_profile_id),
+    )
+
 
-    tts_client = texttospeech.TextToSpeechClient()
+def write_local_audio(generation_id: str, audio_content: bytes) -> str:
+    local_dir = os.path.join("tmp", "audio")
+    os.makedirs(local_dir, exist_ok=True)
+    local_file_path = os.path.join(local_dir, f"{generation_id}.mp3")
+    with open(local_file_path, "wb") as f:
+        f.write(audio_content)
+    return os.path.abspath(local_file_path)
+
+
+def build_speech_request(text: str, language: str) -> Tuple[
+    "texttospeech.SynthesisInput",
+    "texttospeech.VoiceSelectionParams",
+    "texttospeech.AudioConfig",
+]:
+    """Builds the Chirp 3: HD synthesis request for `text` in `language`."""
+    from google.cloud import texttospeech
+
+    voice_config = VOICE_MAP.get(language.lower(), VOICE_MAP["en"])
 
     synthesis_input = texttospeech.SynthesisInput(text=text)
 
@@ -45,28 +107,132 @@ def generate_speech_tool(generation_id: str, text: str, language: str) -> str:
         effects_profile_id=["headphone-class-device"],
     )
 
+    return synthesis_input, voice, audio_config
+
+
+def speech_object_name(cache_key: str, generation_id: str) -> str:
+    """Object name of the audio in the media bucket."""
+    if configs.speech_cache_enabled:
+        return f"audio/by-hash/{cache_key}.mp3"
+    return f"audio/{generation_id}.mp3"
+
+
+def _marker_is_fresh(marker_path: str) -> bool:
+    try:
+        with open(marker_path, "r", encoding="utf-8") as f:
+            seen_at = float(f.read())
+    except (OSError, ValueError):
+        return False
+    return time.time() - seen_at < configs.speech_cache_marker_ttl_seconds
+
+
+def lookup_local_speech(cache_key: str, generation_id: str, bucket_name: str) -> Optional[str]:
+    """
+    Checks the local tier; a hit returns the usable audio path. With a bucket,
+    a stale marker is a miss here, left to the remote existence check.
+    """
+    if configs.local_persistence:
+        cached_path = _speech_cache.get(cache_key)
+        if not cached_path:
+            return None
+        count_speech_cache("local_hits")
+        with open(cached_path, "rb") as f:
+            return write_local_audio(generation_id, f.read())
+
+    marker_path = _speech_markers.get(cache_key)
+    if not marker_path or not _marker_is_fresh(marker_path):
+        return None
+    count_speech_cache("local_hits")
+    return f"gs://{bucket_name}/{speech_object_name(cache_key, generation_id)}"
+
+
+def mark_speech_uploaded(cache_key: str) -> None:
+    """Records that the audio object of `cache_key` was just seen in the bucket."""
+    if configs.speech_cache_enabled:
+        _speech_markers.put(cache_key, repr(time.time()).encode("utf-8"))
+
+
+def remember_speech(cache_key: str, audio_content: bytes) -> None:
+    """Adds freshly synthesized audio to the local tier (a marker when it went to the bucket)."""
+    if not configs.speech_cache_enabled:
+        return
+    if configs.local_persistence:
+        _speech_cache.put(cache_key, audio_content)
+    else:
+        mark_speech_uploaded(cache_key)
+
+
+def _lookup_cached_speech(cache_key: str, generation_id: str, bucket_name: str) -> Optional[str]:
+    cached_path = lookup_local_speech(cache_key, generation_id, bucket_name)
+    if cached_path:
+        return cached_path
+
+    if not configs.local_persistence:
+        filename = speech_object_name(cache_key, generation_id)
+        blob = get_storage_client().bucket(bucket_name).blob(filename)
+        if blob.exists():
+            count_speech_cache("remote_hits")
+            mark_speech_uploaded(cache_key)
+            return f"gs://{bucket_name}/{filename}"
+
+    count_speech_cache("misses")
+    return None
+
+
+def generate_speech_tool(generation_id: str, text: str, language: str) -> str:
+    """
+    Synthesizes text using Google Cloud 'Chirp 3: HD' and saves to GCS.
+
+    Audio is content-addressed: when the same text was already synthesized with
+    the same voice and audio settings, the existing file is returned without
+    calling Text-to-Speech.
+
+    Args:
+        generation_id (str): The shared ID for this generation (matches the image).
+        text (str): The sentence to speak.
+        language (str): The language code ('en', 'fr', 'es').
+
+    Returns:
+        str: The GCS URI of the saved audio file.
+    """
+    try:
+        bucket_name = os.environ["GOOGLE_CLOUD_MEDIA_BUCKET"]
+    except KeyError as e:
+        return f"Error: Missing environment variable {e}"
+
+    synthesis_input, voice, audio_config = build_speech_request(text, language)
+
+    cache_key = speech_cache_key(text, voice, audio_config)
+
+    if configs.speech_cache_enabled:
+        try:
+            cached_path = _lookup_cached_speech(cache_key, generation_id, bucket_name)
+            if cached_path:
+                return cached_path
+        except Exception as e:
+            log(f"⚠️ Speech cache lookup failed, synthesizing instead: {e}")
+
     try:
-        response = tts_client.synthesize_speech(
-            input=synthesis_input, voice=voice, audio_config=audio_config
+        response = call_with_rate_limit(
+            "tts",
+            lambda: get_tts_client().synthesize_speech(
+                input=synthesis_input, voice=voice, audio_config=audio_config
+            ),
         )
 
         if configs.local_persistence:
-            local_dir = os.path.join("tmp", "audio")
-            os.makedirs(local_dir, exist_ok=True)
-            local_file_path = os.path.join(local_dir, f"{generation_id}.mp3")
-            with open(local_file_path, "wb") as f:
-                f.write(response.audio_content)
-            return os.path.abspath(local_file_path)
+            remember_speech(cache_key, response.audio_content)
+            return write_local_audio(generation_id, response.audio_content)
         else:
-            storage_client = storage.Client(project=project_id)
-            bucket = storage_client.bucket(bucket_name)
-            filename = f"audio/{generation_id}.mp3"
+            bucket = get_storage_client().bucket(bucket_name)
+            filename = speech_object_name(cache_key, generation_id)
             blob = bucket.blob(filename)
             blob.upload_from_string(response.audio_content, content_type="audio/mpeg")
+            remember_speech(cache_key, response.audio_content)
             return f"gs://{bucket_name}/{filename}"
 
     except Exception as e:
-        print(f"❌ TTS Generation failed: {e}")
+        log(f"❌ TTS Generation failed: {e}")
         return f"Error generating speech: {str(e)}"
 
 
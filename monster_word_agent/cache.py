@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Hashes the parts that fully determine a generated asset.
+
+    Args:
+        *parts (Any): JSON-serializable values (text, voice, config fields...).
+
+    Returns:
+        str: A hex SHA-256 digest usable as an object name.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskLRUCache:
+    """
+    A size-bounded, content-addressed cache of files in a local directory.
+
+    Entries are tracked in an in-memory LRU index built lazily from the
+    directory listing, so lookups never scan the disk. When the total size
+    goes over `max_bytes`, the least recently used files are deleted.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ""):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(self.suffix):
+                    stat = entry.stat()
+                    key = entry.name[: len(entry.name) - len(self.suffix)]
+                    entries.append((stat.st_mtime, key, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._size = sum(self._index.values())
+        return self._index
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the path of a cached entry and marks it as recently used."""
+        with self._lock:
+            index = self._load_index()
+            if key not in index:
+                return None
+            path = self._path(key)
+            if not os.path.exists(path):
+                self._size -= index.pop(key)
+                return None
+            index.move_to_end(key)
+            os.utime(path)
+            return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """Stores an entry, evicting the least recently used ones if needed."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            index = self._load_index()
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._size -= index.pop(key, 0)
+            index[key] = len(data)
+            self._size += len(data)
+
+            while self._size > self.max_bytes and len(index) > 1:
+                old_key, old_size = index.popitem(last=False)
+                self._size -= old_size
+                try:
+                    os.remove(self._path(old_key))
+                except FileNotFoundError:
+                    pass
+        return path
+
+    def stats(self) -> dict:
+        with self._lock:
+            index = self._load_index()
+            return {"entries": len(index), "bytes": self._size}
@@ -0,0 +1,206 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict
+
+from .app_configs import configs
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.cloud import firestore, storage, texttospeech
+
+# Process-wide registry of Google Cloud clients.
+#
+# Every client wraps an authenticated HTTP session or gRPC channel, so building
+# one per tool call means paying for auth, channel setup and TLS on every card.
+# Clients are created lazily on first use, shared across requests and threads,
+# and dropped in forked children (gRPC channels must not cross a fork). Their
+# libraries are only imported by the factories, keeping them off cold starts.
+
+_lock = threading.Lock()
+_clients: Dict[str, Any] = {}
+_created: Dict[str, int] = {}
+_reused: Dict[str, int] = {}
+_owner_pid = os.getpid()
+
+# Stand-ins registered with `override_client` (offline benchmarks)
+_overrides: Dict[str, Any] = {}
+
+# Async clients hold a channel or HTTP session bound to one event loop
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _reset_after_fork() -> None:
+    global _lock, _owner_pid
+
+    # The parent's lock may have been held at fork time: never reuse it.
+    _lock = threading.Lock()
+    _clients.clear()
+    _loop_clients.clear()
+    _created.clear()
+    _reused.clear()
+    _owner_pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    if name in _overrides:
+        return _overrides[name]
+    if _owner_pid != os.getpid():
+        # Safety net for forks that bypass os.register_at_fork.
+        _reset_after_fork()
+
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            client = factory()
+            _clients[name] = client
+            _created[name] = _created.get(name, 0) + 1
+        else:
+            _reused[name] = _reused.get(name, 0) + 1
+        return client
+
+
+def _get_or_create_for_loop(name: str, factory: Callable[[], Any]) -> Any:
+    if name in _overrides:
+        return _overrides[name]
+    if _owner_pid != os.getpid():
+        _reset_after_fork()
+
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _loop_clients.setdefault(loop, {})
+        client = clients.get(name)
+        if client is None:
+            client = factory()
+            clients[name] = client
+            _created[name] = _created.get(name, 0) + 1
+        else:
+            _reused[name] = _reused.get(name, 0) + 1
+        return client
+
+
+def get_genai_client() -> "genai.Client":
+    """Returns the shared Vertex AI client used for media generation."""
+    from google import genai
+
+    return _get_or_create(
+        "genai",
+        lambda: genai.Client(
+            vertexai=True,
+            project=configs.gcp_project,
+            location=configs.gcp_location,
+        ),
+    )
+
+
+def get_storage_client() -> "storage.Client":
+    """Returns the shared Cloud Storage client."""
+    from google.cloud import storage
+
+    return _get_or_create(
+        "storage", lambda: storage.Client(project=configs.gcp_project)
+    )
+
+
+def get_media_bucket() -> "storage.Bucket":
+    """Returns a handle on the media bucket backed by the shared storage client."""
+    return get_storage_client().bucket(configs.gcp_media_bucket)
+
+
+def get_tts_client() -> "texttospeech.TextToSpeechClient":
+    """Returns the shared Text-to-Speech client."""
+    from google.cloud import texttospeech
+
+    return _get_or_create("tts", texttospeech.TextToSpeechClient)
+
+
+def get_firestore_client() -> "firestore.Client":
+    """Returns the shared Firestore client."""
+    from google.cloud import firestore
+
+    return _get_or_create("firestore", firestore.Client)
+
+
+def get_genai_async_client():
+    """Returns the Vertex AI asyncio client (`genai.Client.aio`) of the running event loop."""
+    from google import genai
+
+    return _get_or_create_for_loop(
+        "genai_async",
+        lambda: genai.Client(
+            vertexai=True,
+            project=configs.gcp_project,
+            location=configs.gcp_location,
+        ).aio,
+    )
+
+
+def get_tts_async_client() -> "texttospeech.TextToSpeechAsyncClient":
+    """Returns the Text-to-Speech asyncio client of the running event loop."""
+    from google.cloud import texttospeech
+
+    return _get_or_create_for_loop("tts_async", texttospeech.TextToSpeechAsyncClient)
+
+
+def get_firestore_async_client() -> "firestore.AsyncClient":
+    """Returns the Firestore asyncio client of the running event loop."""
+    from google.cloud import firestore
+
+    return _get_or_create_for_loop("firestore_async", firestore.AsyncClient)
+
+
+def get_async_storage():
+    """Returns the aiohttp-based Cloud Storage client of the running event loop."""
+    from gcloud.aio.storage import Storage
+
+    return _get_or_create_for_loop("storage_async", Storage)
+
+
+def override_client(name: str, client: Any) -> None:
+    """
+    Serves `client` instead of the real one registered under `name` ("genai",
+    "genai_async", "storage", "storage_async", "tts", "tts_async", "firestore",
+    "firestore_async"). Used to run the pipeline against in-process stand-ins.
+    """
+    _overrides[name] = client
+
+
+def warm_up_clients() -> None:
+    """
+    Creates every client up front so the first request does not pay for
+    credential discovery and channel setup. Failures are logged, not raised:
+    the client will simply be created again on first use.
+    """
+    factories = [get_firestore_client, get_genai_client, get_tts_client]
+    if not configs.local_persistence:
+        factories.append(get_storage_client)
+
+    for factory in factories:
+        try:
+            factory()
+        except Exception as e:
+            print(f"⚠️ Could not warm up client {factory.__name__}: {e}")
+
+
+def get_client_stats() -> Dict[str, Any]:
+    """
+    Reports the clients currently held by this process.
+
+    Returns:
+        Dict[str, Any]: The pid, the number of open clients, and per-client
+        creation and reuse counters.
+    """
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "open": len(_clients) + sum(len(clients) for clients in _loop_clients.values()),
+            "created": dict(_created),
+            "reused": dict(_reused),
+        }
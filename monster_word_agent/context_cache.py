@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .app_configs import configs
+from .cache import content_hash
+from .clients import get_genai_async_client
+from .telemetry import log
+
+# Rough size of a token, to skip prompts under the model's minimum cache size
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class _CachedPrefix:
+    name: Optional[str]
+    expires_at: float
+
+
+class InstructionCache:
+    """
+    Vertex AI context caches holding agents' static system instructions and
+    tool declarations.
+
+    Runs are one-shot sessions, so ADK's per-session context caching never
+    gets a second turn to reuse. This cache is process-wide instead: the
+    first run of an agent creates a cached content for its (model, system
+    instruction, tools) prefix and every later run references it, sending
+    only the conversation. A cache is extended shortly before it expires and
+    recreated if it is gone; prompts smaller than `min_tokens` (the model's
+    minimum) are never cached.
+    """
+
+    def __init__(self, ttl_seconds: float, min_tokens: int, max_entries: int = 16):
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.max_entries = max_entries
+        # Extend once less than a fifth of the TTL is left
+        self.refresh_margin_seconds = ttl_seconds / 5
+        self._lock = threading.Lock()
+        self._prefixes: Dict[str, _CachedPrefix] = {}
+        self._key_locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"hits": 0, "created": 0, "refreshed": 0, "skipped": 0, "failed": 0, "cached_tokens": 0}
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[stat] += amount
+
+    def _key_lock(self, key: str) -> asyncio.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, asyncio.Lock())
+
+    async def _create(self, model: str, config) -> Optional[str]:
+        from google.genai import types
+
+        cached = await get_genai_async_client().caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name="monster-word-agent-instructions",
+                system_instruction=config.system_instruction,
+                tools=config.tools,
+                ttl=f"{int(self.ttl_seconds)}s",
+            ),
+        )
+        self._count("created")
+        return cached.name
+
+    async def _refresh(self, name: str) -> bool:
+        from google.genai import types
+
+        try:
+            await get_genai_async_client().caches.update(
+                name=name,
+                config=types.UpdateCachedContentConfig(ttl=f"{int(self.ttl_seconds)}s"),
+            )
+        except Exception as e:
+            log(f"⚠️ Could not extend context cache {name}, recreating it: {e}")
+            return False
+        self._count("refreshed")
+        return True
+
+    async def cached_content(self, model: str, config) -> Optional[str]:
+        """
+        Returns the name of the cached content holding the request's system
+        instruction and tools, creating or extending it as needed.
+
+        Returns:
+            Optional[str]: The cached content name, or None to send the prompt as is.
+        """
+        tools = [tool.model_dump(exclude_none=True, mode="json") for tool in config.tools or []]
+        prompt_chars = len(str(config.system_instruction)) + len(str(tools))
+        if prompt_chars / CHARS_PER_TOKEN < self.min_tokens:
+            self._count("skipped")
+            return None
+
+        key = content_hash(model, str(config.system_instruction), tools)
+        async with self._key_lock(key):
+            now = time.time()
+            prefix = self._prefixes.get(key)
+            if prefix is not None and prefix.name is None and now < prefix.expires_at:
+                # Creation failed recently: do not retry on every run
+                return None
+            if prefix is not None and prefix.name is not None:
+                if now < prefix.expires_at - self.refresh_margin_seconds:
+                    self._count("hits")
+                    return prefix.name
+                if now < prefix.expires_at and await self._refresh(prefix.name):
+                    prefix.expires_at = now + self.ttl_seconds
+                    return prefix.name
+
+            if prefix is None and len(self._prefixes) >= self.max_entries:
+                # Instructions that change per run would create a cache each time
+                self._count("skipped")
+                return None
+
+            try:
+                name = await self._create(model, config)
+                self._prefixes[key] = _CachedPrefix(name, now + self.ttl_seconds)
+            except Exception as e:
+                log(f"⚠️ Could not create context cache for {model}: {e}")
+                self._count("failed")
+                self._prefixes[key] = _CachedPrefix(None, now + self.refresh_margin_seconds)
+                return None
+            return name
+
+    async def before_model_callback(self, callback_context, llm_request) -> None:
+        """Swaps the system instruction and tools of the request for their cached content."""
+        config = llm_request.config
+        if config is None or not config.system_instruction or config.cached_content:
+            return None
+
+        name = await self.cached_content(llm_request.model, config)
+        if name is not None:
+            # A request using cached content must not repeat what the cache holds
+            config.cached_content = name
+            config.system_instruction = None
+            config.tools = None
+            config.tool_config = None
+        return None
+
+    async def after_model_callback(self, callback_context, llm_response) -> None:
+        """Counts the prompt tokens the model actually served from a cache."""
+        usage = llm_response.usage_metadata
+        if usage is not None and usage.cached_content_token_count:
+            self._count("cached_tokens", usage.cached_content_token_count)
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, caches=sum(1 for prefix in self._prefixes.values() if prefix.name))
+
+
+instruction_cache = InstructionCache(
+    ttl_seconds=configs.context_cache_ttl_seconds,
+    min_tokens=configs.context_cache_min_tokens,
+)
+
+
+def context_cache_callbacks() -> Dict:
+    """
+    The `LlmAgent` callbacks enabling context caching of its static prompt,
+    or none when `CONTEXT_CACHE` is off.
+    """
+    if not configs.context_cache:
+        return {}
+    return {
+        "before_model_callback": instruction_cache.before_model_callback,
+        "after_model_callback": instruction_cache.after_model_callback,
+    }
+
+
+def get_context_cache_stats() -> Dict[str, int]:
+    """
+    Reports how the context caches are used by this process.
+
+    Returns:
+        Dict[str, int]: Hits, created, refreshed, skipped (too small) and
+            failed caches, live caches, and prompt tokens served from cache.
+    """
+    return instruction_cache.stats()
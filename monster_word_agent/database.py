@@ -1,3 +1,9 @@
-from google.cloud import firestore
+from .clients import get_firestore_client
 
-db = firestore.Client()
+
+def __getattr__(name: str):
+    # `db` is resolved through the registry on every access, never bound at
+    # import: a forked worker gets its own client, not the parent's
+    if name == "db":
+        return get_firestore_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
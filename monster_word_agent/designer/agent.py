@@ -9,12 +9,23 @@ from dotenv import load_dotenv
 from .instructions import INSTRUCTIONS_V1
 from ..teacher.tools import persist_learning_data, get_previous_sentences
 from ..app_configs import configs
+from ..context_cache import context_cache_callbacks
+from ..teacher.target_words import target_word_callbacks
+
+cache_callbacks = context_cache_callbacks()
 
 designer_agent = LlmAgent(
     name="DesignerAgent",
     instruction=INSTRUCTIONS_V1,
     model=Gemini(model=configs.llm_model),
     tools=[persist_learning_data, get_previous_sentences],
+    output_key="designer_output",
+    # The target word is filled in first; the cache only replaces the static prefix
+    before_model_callback=[
+        *target_word_callbacks(),
+        *filter(None, [cache_callbacks.get("before_model_callback")]),
+    ],
+    after_model_callback=cache_callbacks.get("after_model_callback"),
 )
 
 async def main():
@@ -0,0 +1,136 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .app_configs import configs
+from .pipeline import run_pipeline
+from .stores import get_generation_store
+from .telemetry import log
+
+INVENTORY_USER_ID = "inventory"
+
+
+@dataclass(frozen=True)
+class Profile:
+    age: int
+    language: str
+    theme: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return profile_key(self.age, self.language, self.theme)
+
+    def to_request(self) -> Dict:
+        return {"age": self.age, "language": self.language, "theme": self.theme, "targetWord": None}
+
+
+def profile_key(age: int, language: str, theme: Optional[str]) -> str:
+    """Inventory key of a (age, language, theme) request; a missing theme maps to "any"."""
+    return f"{language}-{age}-{(theme or 'any').strip().lower()}"
+
+
+def parse_profiles(spec: str) -> List[Profile]:
+    """
+    Parses `INVENTORY_PROFILES`, a comma-separated list of `age:language[:theme]`.
+
+    Example: "5:en:space,5:fr,4:es:ocean"
+    """
+    profiles = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        parts = [part.strip() for part in item.split(":")]
+        theme = parts[2] if len(parts) > 2 and parts[2] else None
+        profiles.append(Profile(age=int(parts[0]), language=parts[1], theme=theme))
+    return profiles
+
+
+class InventoryBuilder:
+    """
+    Keeps a stock of ready, unserved cards for popular profiles.
+
+    When a profile drops below `low_watermark` ready cards, it is refilled up
+    to `target` by running the full agent pipeline, with at most `max_parallel`
+    generations in flight across all profiles. Requests take a card with
+    `claim_card`, which is atomic in the generation store.
+    """
+
+    def __init__(self, profiles: List[Profile], target: int, low_watermark: int, max_parallel: int):
+        self.profiles = profiles
+        self.target = target
+        self.low_watermark = low_watermark
+        self.max_parallel = max_parallel
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, int] = {}
+
+    async def generate_card(self, profile: Profile) -> Optional[str]:
+        """Runs the agent pipeline once and stocks the resulting card."""
+        output = await run_pipeline(profile.to_request(), INVENTORY_USER_ID)
+
+        if not output or "error" in output or not output.get("final_image_gcs_path"):
+            log(f"⚠️ Inventory generation failed for {profile.key}: {output}")
+            return None
+
+        await asyncio.to_thread(get_generation_store().add_to_inventory, output["id"], profile.key)
+        return output["id"]
+
+    async def _generate_bounded(self, profile: Profile) -> Optional[str]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_parallel)
+        try:
+            async with self._semaphore:
+                return await self.generate_card(profile)
+        except Exception as e:
+            log(f"⚠️ Inventory generation failed for {profile.key}: {e}")
+            return None
+        finally:
+            self._in_flight[profile.key] -= 1
+
+    async def refill(self, profile: Profile) -> int:
+        """Tops the profile up to `target` if it is below the watermark."""
+        ready = await asyncio.to_thread(get_generation_store().count_inventory, profile.key)
+        in_flight = self._in_flight.get(profile.key, 0)
+        if ready + in_flight >= self.low_watermark:
+            return 0
+
+        missing = self.target - ready - in_flight
+        self._in_flight[profile.key] = in_flight + missing
+        results = await asyncio.gather(*[self._generate_bounded(profile) for _ in range(missing)])
+        return sum(1 for result in results if result)
+
+    async def refill_all(self) -> int:
+        results = await asyncio.gather(*[self.refill(profile) for profile in self.profiles])
+        return sum(results)
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                stocked = await self.refill_all()
+                if stocked:
+                    log(f"Inventory: stocked {stocked} cards")
+            except Exception as e:
+                log(f"⚠️ Inventory refill failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+def claim_card(age: int, language: str, theme: Optional[str]) -> Optional[Dict]:
+    """
+    Atomically takes a ready card for the profile.
+
+    Returns:
+        Optional[Dict]: The generation record, or None if the inventory is empty.
+    """
+    return get_generation_store().claim_inventory(profile_key(age, language, theme))
+
+
+def create_inventory_builder() -> Optional[InventoryBuilder]:
+    """Builds the inventory from `INVENTORY_PROFILES`, or returns None if unset."""
+    profiles = parse_profiles(configs.inventory_profiles)
+    if not profiles:
+        return None
+    return InventoryBuilder(
+        profiles,
+        target=configs.inventory_target,
+        low_watermark=configs.inventory_low_watermark,
+        max_parallel=configs.inventory_max_parallel,
+    )
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+import uuid
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from . import progress
+from .app_configs import configs
+
+APP_NAME = "monster_word_agent"
+
+_runner_lock = threading.Lock()
+_runner: Optional[InMemoryRunner] = None
+
+# Keeps runs referenced when their stream is closed early: the card still completes
+_detached_runs: Set[asyncio.Task] = set()
+
+
+def get_pipeline_runner() -> InMemoryRunner:
+    """Returns the process-wide runner of the root agent, for runs outside the ADK routes."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            from .agent import root_agent
+
+            _runner = InMemoryRunner(agent=root_agent, app_name=APP_NAME)
+        return _runner
+
+
+def warm_up() -> None:
+    """
+    Pays up front for what the first request would otherwise wait on: the
+    agent modules (ADK loads them on the first run), Pillow and the shared
+    clients. Failures are logged by `warm_up_clients`, never raised.
+    """
+    from .agent import root_agent  # noqa: F401
+    from .builder.tools import combine  # noqa: F401
+    from .clients import warm_up_clients
+    from .teacher.backfill import start_backfill
+
+    start_backfill()
+    warm_up_clients()
+
+
+async def run_pipeline(
+    user_request: Dict, user_id: str, on_event: Optional[Callable[[Event], None]] = None
+) -> Optional[Dict]:
+    """
+    Runs the designer and builder once in a throwaway session.
+
+    Args:
+        user_request (Dict): The age, language, theme and targetWord of the card.
+        user_id (str): The user the session belongs to.
+        on_event (Optional[Callable[[Event], None]]): Called with every agent event.
+
+    Returns:
+        Optional[Dict]: The builder's final JSON, or None if the builder gave
+            no parsable JSON (the designer's output is never returned).
+    """
+    from .builder.agent import BUILDER_AGENT_NAME, parse_agent_json
+
+    runner = get_pipeline_runner()
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id, session_id=str(uuid.uuid4())
+    )
+    message = types.Content(role="user", parts=[types.Part.from_text(text=json.dumps(user_request))])
+
+    output = None
+    try:
+        async for event in runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+            if on_event is not None:
+                on_event(event)
+            if (
+                event.author == BUILDER_AGENT_NAME
+                and event.is_final_response()
+                and event.content
+                and event.content.parts
+            ):
+                text = "".join(part.text or "" for part in event.content.parts)
+                output = parse_agent_json(text)
+    finally:
+        # One-shot runs: do not keep their events around
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session.id
+        )
+    return output
+
+
+async def stream_generation(user_request: Dict, user_id: str) -> AsyncIterator[Dict]:
+    """
+    Runs the pipeline once and yields its progress events as they happen:
+    `sentence_persisted`, `audio_ready`, `raw_image_ready`, `composite_ready`,
+    then `completed` with the builder output (or `failed`).
+    """
+    with progress.listen() as channel:
+
+        def forward(event: Event) -> None:
+            # The direct builder re-publishes the orchestrator's events on its own events
+            metadata = event.custom_metadata or {}
+            if "progress" in metadata:
+                channel.put(metadata["progress"])
+
+        async def run() -> None:
+            try:
+                output = await run_pipeline(user_request, user_id, on_event=forward)
+            except Exception as e:
+                channel.put({"type": progress.FAILED, "error": str(e)})
+                return
+            if not output or "error" in output:
+                error = (output or {}).get("error", "The pipeline returned no output.")
+                channel.put({"type": progress.FAILED, "error": error})
+            else:
+                channel.put({"type": progress.COMPLETED, **output})
+
+        task = asyncio.create_task(run())
+        _detached_runs.add(task)
+        task.add_done_callback(_detached_runs.discard)
+
+    while True:
+        event = await channel.get()
+        yield event
+        if event["type"] in (progress.COMPLETED, progress.FAILED):
+            return
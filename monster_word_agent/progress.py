@@ -0,0 +1,69 @@
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Typed progress events of one card, in the order they usually happen
+SENTENCE_PERSISTED = "sentence_persisted"
+AUDIO_READY = "audio_ready"
+RAW_IMAGE_READY = "raw_image_ready"
+COMPOSITE_READY = "composite_ready"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class ProgressChannel:
+    """
+    Collects the progress events of a run on the event loop that listens to
+    them. Tools may emit from worker threads: events are handed to the loop
+    thread-safely.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[Dict]" = asyncio.Queue()
+
+    def put(self, event: Dict) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._queue.put_nowait(event)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    async def get(self) -> Dict:
+        return await self._queue.get()
+
+    def get_nowait(self) -> Optional[Dict]:
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+
+_channel: contextvars.ContextVar[Optional[ProgressChannel]] = contextvars.ContextVar(
+    "progress_channel", default=None
+)
+
+
+@contextmanager
+def listen() -> Iterator[ProgressChannel]:
+    """
+    Routes the events emitted by everything run from the current context
+    (including tasks and threads started from it) to a new channel.
+    """
+    channel = ProgressChannel()
+    token = _channel.set(channel)
+    try:
+        yield channel
+    finally:
+        _channel.reset(token)
+
+
+def emit(event_type: str, **data) -> None:
+    """Publishes a progress event; a no-op when nobody is listening."""
+    channel = _channel.get()
+    if channel is not None:
+        channel.put({"type": event_type, **data})
@@ -0,0 +1,198 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from .app_configs import configs
+from .telemetry import log
+
+T = TypeVar("T")
+
+RETRYABLE_CODES = {429, 503}
+
+
+class TokenBucket:
+    """
+    A token bucket shared by every caller of one model, sync or async.
+
+    Callers reserve a token and sleep until it is due, so bursts queue up
+    instead of failing. When the service still answers 429, the bucket is
+    paused for the Retry-After delay and its rate is halved, then recovers
+    gradually on each success (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, burst: Optional[int] = None):
+        self.name = name
+        self.max_rate = requests_per_minute / 60.0
+        self.min_rate = self.max_rate / 4
+        self.rate = self.max_rate
+        self.capacity = burst or max(1, int(self.max_rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "queued": 0, "max_queued": 0, "throttled": 0, "rate_limited": 0, "retries": 0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens / self.rate, self._paused_until - now)
+            self._stats["acquired"] += 1
+            if delay > 0:
+                self._stats["throttled"] += 1
+            return delay
+
+    def _enter_queue(self) -> None:
+        with self._lock:
+            self._stats["queued"] += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], self._stats["queued"])
+
+    def _leave_queue(self) -> None:
+        with self._lock:
+            self._stats["queued"] -= 1
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        self._enter_queue()
+        try:
+            time.sleep(delay)
+        finally:
+            self._leave_queue()
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay <= 0:
+            return
+        self._enter_queue()
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._leave_queue()
+
+    def on_rate_limited(self, delay: float) -> None:
+        """Pauses every caller for `delay` seconds and halves the rate."""
+        with self._lock:
+            self._stats["rate_limited"] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def count_retry(self) -> None:
+        with self._lock:
+            self._stats["retries"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "requests_per_minute": round(self.rate * 60, 2),
+                "max_requests_per_minute": round(self.max_rate * 60, 2),
+            }
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(name: str) -> TokenBucket:
+    """Returns the process-wide bucket of a model, sized from `RATE_LIMITS`."""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None:
+            requests_per_minute = configs.rate_limits.get(name, configs.default_requests_per_minute)
+            bucket = TokenBucket(name, requests_per_minute)
+            _buckets[name] = bucket
+        return bucket
+
+
+def get_rate_limit_stats() -> Dict[str, Dict]:
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+    return {bucket.name: bucket.stats() for bucket in buckets}
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    # google-genai's APIError and google-api-core's errors both carry the HTTP status
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        # HTTP-date form is not used by Google APIs
+        return None
+
+
+def backoff_delay(attempt: int, error: Exception) -> float:
+    """Retry-After when the service sent one, else full-jitter exponential backoff."""
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return retry_after
+    ceiling = min(configs.backoff_max_seconds, configs.backoff_base_seconds * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def is_retryable(error: Exception) -> bool:
+    return _status_code(error) in RETRYABLE_CODES
+
+
+def call_with_rate_limit(name: str, call: Callable[[], T]) -> T:
+    """
+    Runs `call` under the bucket of `name`, retrying 429/503 answers with
+    backoff until `RATE_LIMIT_MAX_RETRIES` is reached.
+    """
+    bucket = get_bucket(name)
+    for attempt in range(configs.rate_limit_max_retries + 1):
+        bucket.acquire()
+        try:
+            result = call()
+        except Exception as e:
+            if not is_retryable(e) or attempt == configs.rate_limit_max_retries:
+                raise
+            delay = backoff_delay(attempt, e)
+            bucket.on_rate_limited(delay)
+            bucket.count_retry()
+            log(f"⚠️ {name} rate limited ({_status_code(e)}). Retrying in {delay:.1f}s... (Attempt {attempt + 1}/{configs.rate_limit_max_retries})")
+            continue
+        bucket.on_success()
+        return result
+
+
+async def call_with_rate_limit_async(name: str, call: Callable[[], Awaitable[T]]) -> T:
+    """Async variant of `call_with_rate_limit`; waiting never blocks the event loop."""
+    bucket = get_bucket(name)
+    for attempt in range(configs.rate_limit_max_retries + 1):
+        await bucket.acquire_async()
+        try:
+            result = await call()
+        except Exception as e:
+            if not is_retryable(e) or attempt == configs.rate_limit_max_retries:
+                raise
+            delay = backoff_delay(attempt, e)
+            bucket.on_rate_limited(delay)
+            bucket.count_retry()
+            log(f"⚠️ {name} rate limited ({_status_code(e)}). Retrying in {delay:.1f}s... (Attempt {attempt + 1}/{configs.rate_limit_max_retries})")
+            continue
+        bucket.on_success()
+        return result
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from google.adk.cli.service_registry import get_service_registry
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+
+from .app_configs import configs
+from .pipeline import APP_NAME
+
+EPHEMERAL_SESSION_URI = "memory://"
+
+_session_service: Optional[BaseSessionService] = None
+
+
+def session_service_uri() -> str:
+    """In-memory sessions for `SESSION_MODE=ephemeral`, `SESSION_DB_URI` otherwise."""
+    if configs.session_mode == "ephemeral":
+        return EPHEMERAL_SESSION_URI
+    return configs.session_db_uri
+
+
+def _enable_wal(dbapi_connection, connection_record) -> None:
+    # Readers no longer block the writer when several workers share the file
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _create_session_service(uri: str, **kwargs) -> BaseSessionService:
+    global _session_service
+    if urlparse(uri).scheme == "memory":
+        service = InMemorySessionService()
+    else:
+        from google.adk.sessions import DatabaseSessionService
+        from sqlalchemy import event
+
+        kwargs.pop("agents_dir", None)
+        service = DatabaseSessionService(db_url=uri, **kwargs)
+        if service.db_engine.dialect.name == "sqlite":
+            event.listen(service.db_engine.sync_engine, "connect", _enable_wal)
+    _session_service = service
+    return service
+
+
+def register_session_service(uri: str) -> None:
+    """
+    Makes ADK build the session service of `uri` through this module, so the
+    janitor can reach the instance the API routes use.
+    """
+    get_service_registry().register_session_service(urlparse(uri).scheme, _create_session_service)
+
+
+def _trim_payload(value, max_chars: int):
+    size = len(json.dumps(value, ensure_ascii=False, default=str))
+    if size <= max_chars:
+        return value, False
+    return {"trimmed": True, "chars": size}, True
+
+
+def trim_event_content(content: Dict, max_chars: int) -> bool:
+    """
+    Replaces tool call arguments and results over `max_chars` in a stored
+    event's content with a placeholder.
+
+    Returns:
+        bool: Whether anything was trimmed.
+    """
+    trimmed = False
+    for part in content.get("parts") or []:
+        for key, field in (("function_call", "args"), ("function_response", "response")):
+            payload = part.get(key)
+            if payload and payload.get(field) is not None:
+                payload[field], changed = _trim_payload(payload[field], max_chars)
+                trimmed = trimmed or changed
+    return trimmed
+
+
+class SessionJanitor:
+    """
+    Bounds session storage: deletes sessions idle for longer than `ttl_seconds`
+    and, for database sessions, trims large tool payloads from events older
+    than `trim_after_seconds` (the run that needed them is long over).
+    """
+
+    def __init__(
+        self,
+        service: BaseSessionService,
+        ttl_seconds: float,
+        trim_after_seconds: float,
+        max_payload_chars: int,
+    ):
+        self.service = service
+        self.ttl_seconds = ttl_seconds
+        self.trim_after_seconds = trim_after_seconds
+        self.max_payload_chars = max_payload_chars
+        # Events before this time were trimmed by an earlier pass
+        self._trimmed_until = datetime.fromtimestamp(0)
+
+    async def _expire_in_memory(self, cutoff: float) -> int:
+        sessions = (await self.service.list_sessions(app_name=APP_NAME)).sessions
+        expired = [session for session in sessions if session.last_update_time < cutoff]
+        for session in expired:
+            await self.service.delete_session(
+                app_name=APP_NAME, user_id=session.user_id, session_id=session.id
+            )
+        return len(expired)
+
+    async def _compact_database(self, now: float) -> Dict[str, int]:
+        from google.adk.sessions.database_session_service import StorageEvent, StorageSession
+        from sqlalchemy import delete, select
+
+        await self.service._ensure_tables_created()
+        async with self.service.database_session_factory() as sql_session:
+            # Same conventions as ADK: session times are UTC on SQLite, event times local
+            if sql_session.bind.dialect.name == "sqlite":
+                session_cutoff = datetime.fromtimestamp(now - self.ttl_seconds, timezone.utc).replace(tzinfo=None)
+            else:
+                session_cutoff = datetime.fromtimestamp(now - self.ttl_seconds)
+            # Events go with their session (ON DELETE CASCADE)
+            expired = await sql_session.execute(
+                delete(StorageSession).where(StorageSession.update_time < session_cutoff)
+            )
+
+            trim_cutoff = datetime.fromtimestamp(now - self.trim_after_seconds)
+            events = await sql_session.scalars(
+                select(StorageEvent).where(
+                    StorageEvent.timestamp >= self._trimmed_until,
+                    StorageEvent.timestamp < trim_cutoff,
+                    StorageEvent.content.is_not(None),
+                )
+            )
+            trimmed = 0
+            for storage_event in events:
+                content = json.loads(json.dumps(storage_event.content))
+                if trim_event_content(content, self.max_payload_chars):
+                    storage_event.content = content
+                    trimmed += 1
+
+            await sql_session.commit()
+        self._trimmed_until = trim_cutoff
+        return {"expired": expired.rowcount, "trimmed": trimmed}
+
+    async def run_once(self) -> Dict[str, int]:
+        now = time.time()
+        if isinstance(self.service, InMemorySessionService):
+            return {"expired": await self._expire_in_memory(now - self.ttl_seconds), "trimmed": 0}
+        return await self._compact_database(now)
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                result = await self.run_once()
+                if result["expired"] or result["trimmed"]:
+                    print(
+                        f"Sessions: expired {result['expired']}, "
+                        f"trimmed {result['trimmed']} events"
+                    )
+            except Exception as e:
+                print(f"⚠️ Session compaction failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+def create_session_janitor() -> Optional[SessionJanitor]:
+    """Builds the janitor of the registered session service, or None if ADK built its own."""
+    if _session_service is None:
+        return None
+    return SessionJanitor(
+        _session_service,
+        ttl_seconds=configs.session_ttl_seconds,
+        trim_after_seconds=configs.session_trim_after_seconds,
+        max_payload_chars=configs.session_event_max_chars,
+    )
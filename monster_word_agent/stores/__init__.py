@@ -0,0 +1,34 @@
+import threading
+from typing import Optional
+
+from ..app_configs import configs
+from .base import GenerationStore
+
+_lock = threading.Lock()
+_store: Optional[GenerationStore] = None
+
+
+def get_generation_store() -> GenerationStore:
+    """
+    Returns the process-wide generation store: SQLite in LOCAL_PERSISTENCE
+    mode, Firestore otherwise.
+    """
+    global _store
+    with _lock:
+        if _store is None:
+            if configs.local_persistence:
+                from .sqlite_store import SqliteGenerationStore
+
+                _store = SqliteGenerationStore(configs.sqlite_path)
+            else:
+                from .firestore_store import create_firestore_store
+
+                _store = create_firestore_store()
+        return _store
+
+
+def override_generation_store(store: Optional[GenerationStore]) -> None:
+    """Replaces the process-wide store, e.g. with an in-memory one for benchmarks."""
+    global _store
+    with _lock:
+        _store = store
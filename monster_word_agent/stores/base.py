@@ -0,0 +1,126 @@
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def project(doc: Dict, fields: Sequence[str]) -> Dict:
+    """Keeps the `id` and the dotted `fields` paths of a record, as a Firestore projection does."""
+    projected = {"id": doc.get("id")}
+    for path in fields:
+        *parents, name = path.split(".")
+        source, target = doc, projected
+        for parent in parents:
+            source = source.get(parent) if isinstance(source, dict) else None
+            target = target.setdefault(parent, {})
+        if isinstance(source, dict) and name in source:
+            target[name] = source[name]
+    return projected
+
+
+class GenerationStore(ABC):
+    """
+    Persistence interface for generation records.
+
+    Records are plain dicts keyed by their `id`. Values equal to
+    `firestore.SERVER_TIMESTAMP` are resolved to the write time by every
+    implementation, so callers can use the sentinel regardless of the backend;
+    callers that do not import Firestore use `server_timestamp()` instead.
+    """
+
+    def server_timestamp(self) -> Any:
+        """
+        The value to write in a timestamp field set to "now": the current time
+        as an ISO string, unless the backend stamps writes itself.
+        """
+        return datetime.now().isoformat()
+
+    @abstractmethod
+    def create(self, doc: Dict) -> None:
+        """Stores a new generation record."""
+
+    @abstractmethod
+    def update(self, id: str, fields: Dict) -> None:
+        """Updates top-level fields of an existing record."""
+
+    async def update_async(self, id: str, fields: Dict) -> None:
+        """Async `update`; runs the blocking call in a thread unless overridden."""
+        await asyncio.to_thread(self.update, id, fields)
+
+    @abstractmethod
+    def upsert(self, id: str, fields: Dict) -> None:
+        """
+        Idempotent write keyed by `id`: creates the record or merges `fields`
+        into it, so a retried write never duplicates a generation.
+        """
+
+    async def upsert_async(self, id: str, fields: Dict) -> None:
+        """Async `upsert`; runs the blocking call in a thread unless overridden."""
+        await asyncio.to_thread(self.upsert, id, fields)
+
+    def bulk_upsert(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        """
+        Upserts many records with as few commits as the backend allows.
+
+        Returns:
+            int: The number of records written.
+        """
+        count = 0
+        for id, fields in items:
+            self.upsert(id, fields)
+            count += 1
+        return count
+
+    @abstractmethod
+    def get(self, id: str) -> Optional[Dict]:
+        """Returns the record, or None if it does not exist."""
+
+    @abstractmethod
+    def recent(self, language: str, age: int, limit: int) -> List[Dict]:
+        """Returns the latest records of a (language, age) profile, newest first."""
+
+    @abstractmethod
+    def stream(self, status: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Iterates over all records, optionally filtered by status. Backends
+        that time out long reads (Firestore) page the query, so a consumer
+        may take as long as it needs.
+        """
+
+    def scan(self, fields: Sequence[str], limit: int, page_size: int = 500) -> Iterator[Dict]:
+        """
+        Iterates over the `limit` newest records, newest first, with only
+        their `id` and the dotted `fields` paths. Backends read in pages of
+        `page_size`, so no single request stays open for the whole scan.
+        """
+        docs = sorted(self.stream(), key=lambda doc: str(doc.get("created_at") or ""), reverse=True)
+        for doc in docs[:limit]:
+            yield project(doc, fields)
+
+    def load_profile_summary(self, language: str, age: int) -> Optional[List[Dict]]:
+        """Returns the materialized history of a profile, if the backend keeps one."""
+        return None
+
+    def save_profile_summary(self, language: str, age: int, entries: List[Dict]) -> None:
+        """Replaces the materialized history of a profile."""
+
+    def prepend_profile_summary(self, language: str, age: int, entry: Dict, limit: int) -> None:
+        """Adds an entry at the head of the materialized history of a profile."""
+
+    @abstractmethod
+    def add_to_inventory(self, id: str, profile: str) -> None:
+        """Marks a completed generation as a ready, unserved card of `profile`."""
+
+    @abstractmethod
+    def count_inventory(self, profile: str) -> int:
+        """Returns the number of ready cards of `profile`."""
+
+    @abstractmethod
+    def claim_inventory(self, profile: str) -> Optional[Dict]:
+        """
+        Atomically claims the oldest ready card of `profile`.
+
+        Returns:
+            Optional[Dict]: The claimed generation record, or None if the
+            inventory is empty.
+        """
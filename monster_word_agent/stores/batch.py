@@ -0,0 +1,58 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .base import GenerationStore
+
+
+class BatchedWriter:
+    """
+    Buffers upserts and commits them with `bulk_upsert` every `batch_size`
+    records and on exit, for bulk runs (re-renders, imports, backfills).
+
+    Repeated writes to the same id are merged in the buffer, so each record
+    costs one write per batch. Safe to share between worker threads.
+
+    `on_commit` is called with the ids of each batch once it is committed, so
+    callers can checkpoint only what is durably written.
+    """
+
+    def __init__(
+        self,
+        store: GenerationStore,
+        batch_size: int = 200,
+        on_commit: Optional[Callable[[List[str]], None]] = None,
+    ):
+        self.store = store
+        self.batch_size = batch_size
+        self.on_commit = on_commit
+        self.written = 0
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}
+
+    def upsert(self, id: str, fields: Dict) -> None:
+        with self._lock:
+            self._pending.setdefault(id, {}).update(fields)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, {}
+        self._commit(batch)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        self._commit(batch)
+
+    def _commit(self, batch: Dict[str, Dict]) -> None:
+        if not batch:
+            return
+        written = self.store.bulk_upsert(batch.items())
+        with self._lock:
+            self.written += written
+        if self.on_commit is not None:
+            self.on_commit(list(batch))
+
+    def __enter__(self) -> "BatchedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
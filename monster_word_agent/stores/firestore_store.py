@@ -0,0 +1,184 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+
+from ..app_configs import configs
+from ..clients import get_firestore_async_client, get_firestore_client
+from .base import GenerationStore
+
+
+@firestore.transactional
+def _prepend_to_summary(transaction, summary_ref, entry: Dict, limit: int) -> None:
+    snapshot = summary_ref.get(transaction=transaction)
+    recent = (snapshot.to_dict() or {}).get("recent", []) if snapshot.exists else []
+    recent = [entry] + [item for item in recent if item.get("id") != entry.get("id")]
+    transaction.set(
+        summary_ref,
+        {"recent": recent[:limit], "updated_at": firestore.SERVER_TIMESTAMP},
+    )
+
+
+@firestore.transactional
+def _claim_ready_card(transaction, query) -> Optional[str]:
+    for snapshot in query.stream(transaction=transaction):
+        transaction.update(
+            snapshot.reference,
+            {"state": "claimed", "claimed_at": firestore.SERVER_TIMESTAMP},
+        )
+        return snapshot.id
+    return None
+
+
+class FirestoreGenerationStore(GenerationStore):
+    """Cloud implementation backed by the `learning_generations` collection."""
+
+    def __init__(self, collection_name: str, profile_collection_name: str, inventory_collection_name: str):
+        self.collection_name = collection_name
+        self.profile_collection_name = profile_collection_name
+        self.inventory_collection_name = inventory_collection_name
+
+    @property
+    def _collection(self):
+        return get_firestore_client().collection(self.collection_name)
+
+    @property
+    def _inventory(self):
+        return get_firestore_client().collection(self.inventory_collection_name)
+
+    def server_timestamp(self):
+        return firestore.SERVER_TIMESTAMP
+
+    def _ready_cards(self, profile: str):
+        return (
+            self._inventory
+            .where(filter=FieldFilter("profile", "==", profile))
+            .where(filter=FieldFilter("state", "==", "ready"))
+        )
+
+    def _summary_ref(self, language: str, age: int):
+        return get_firestore_client().collection(self.profile_collection_name).document(
+            f"{language}-{age}"
+        )
+
+    def create(self, doc: Dict) -> None:
+        self._collection.document(doc["id"]).set(doc)
+
+    def update(self, id: str, fields: Dict) -> None:
+        self._collection.document(id).update(fields)
+
+    async def update_async(self, id: str, fields: Dict) -> None:
+        collection = get_firestore_async_client().collection(self.collection_name)
+        await collection.document(id).update(fields)
+
+    def upsert(self, id: str, fields: Dict) -> None:
+        self._collection.document(id).set(fields, merge=True)
+
+    async def upsert_async(self, id: str, fields: Dict) -> None:
+        collection = get_firestore_async_client().collection(self.collection_name)
+        await collection.document(id).set(fields, merge=True)
+
+    def bulk_upsert(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        # BulkWriter batches the writes, paces them and retries failed ones
+        writer = get_firestore_client().bulk_writer()
+        count = 0
+        for id, fields in items:
+            writer.set(self._collection.document(id), fields, merge=True)
+            count += 1
+        writer.close()
+        return count
+
+    def get(self, id: str) -> Optional[Dict]:
+        snapshot = self._collection.document(id).get()
+        return snapshot.to_dict() if snapshot.exists else None
+
+    def recent(self, language: str, age: int, limit: int) -> List[Dict]:
+        query = (
+            self._collection
+            .where(filter=FieldFilter("userInput.language", "==", language))
+            .where(filter=FieldFilter("userInput.age", "==", age))
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .limit(limit)
+        )
+        return [doc.to_dict() for doc in query.stream()]
+
+    def stream(self, status: Optional[str] = None, page_size: int = 500) -> Iterator[Dict]:
+        # Pages ordered by document id, each resumed after the last snapshot:
+        # a slow consumer never holds one query open past its deadline
+        query = self._collection
+        if status is not None:
+            query = query.where(filter=FieldFilter("status", "==", status))
+        query = query.order_by(FieldPath.document_id()).limit(page_size)
+        last = None
+        while True:
+            page = query if last is None else query.start_after(last)
+            snapshots = list(page.stream())
+            for snapshot in snapshots:
+                yield snapshot.to_dict()
+            if len(snapshots) < page_size:
+                return
+            last = snapshots[-1]
+
+    def scan(self, fields: Sequence[str], limit: int, page_size: int = 500) -> Iterator[Dict]:
+        # A projected query per page, resumed after the last snapshot: each
+        # read is small and short, however large the collection grows
+        query = self._collection.select(["id", *fields]).order_by(
+            "created_at", direction=firestore.Query.DESCENDING
+        )
+        last = None
+        remaining = limit
+        while remaining > 0:
+            page = query.limit(min(page_size, remaining))
+            if last is not None:
+                page = page.start_after(last)
+            snapshots = list(page.stream())
+            for snapshot in snapshots:
+                yield {**snapshot.to_dict(), "id": snapshot.id}
+            if len(snapshots) < min(page_size, remaining):
+                return
+            remaining -= len(snapshots)
+            last = snapshots[-1]
+
+    def load_profile_summary(self, language: str, age: int) -> Optional[List[Dict]]:
+        snapshot = self._summary_ref(language, age).get()
+        if not snapshot.exists:
+            return None
+        return snapshot.to_dict().get("recent") or []
+
+    def save_profile_summary(self, language: str, age: int, entries: List[Dict]) -> None:
+        self._summary_ref(language, age).set(
+            {"recent": entries, "updated_at": firestore.SERVER_TIMESTAMP}
+        )
+
+    def prepend_profile_summary(self, language: str, age: int, entry: Dict, limit: int) -> None:
+        _prepend_to_summary(
+            get_firestore_client().transaction(), self._summary_ref(language, age), entry, limit
+        )
+
+    def add_to_inventory(self, id: str, profile: str) -> None:
+        self._inventory.document(id).set(
+            {
+                "id": id,
+                "profile": profile,
+                "state": "ready",
+                "created_at": firestore.SERVER_TIMESTAMP,
+            }
+        )
+
+    def count_inventory(self, profile: str) -> int:
+        result = self._ready_cards(profile).count().get()
+        return int(result[0][0].value)
+
+    def claim_inventory(self, profile: str) -> Optional[Dict]:
+        query = self._ready_cards(profile).order_by("created_at").limit(1)
+        claimed_id = _claim_ready_card(get_firestore_client().transaction(), query)
+        return self.get(claimed_id) if claimed_id else None
+
+
+def create_firestore_store() -> FirestoreGenerationStore:
+    return FirestoreGenerationStore(
+        configs.generation_collection_name,
+        configs.profile_collection_name,
+        configs.inventory_collection_name,
+    )
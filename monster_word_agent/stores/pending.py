@@ -0,0 +1,41 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class PendingGenerations:
+    """
+    Generation records held in memory until their media is ready.
+
+    In SINGLE_WRITE mode `persist_learning_data` parks the record here and
+    `persist_media_paths` writes it together with the media paths, so a card
+    costs one store write instead of a create followed by an update. A card
+    whose media never completes is not persisted; the oldest held records are
+    dropped beyond `max_size` so abandoned ones cannot accumulate.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._records: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def hold(self, doc: Dict) -> None:
+        with self._lock:
+            self._records[doc["id"]] = doc
+            self._records.move_to_end(doc["id"])
+            while len(self._records) > self.max_size:
+                dropped, _ = self._records.popitem(last=False)
+                print(f"⚠️ Dropping pending generation {dropped}: media never completed")
+
+    def get(self, id: str) -> Optional[Dict]:
+        """Returns the held record without releasing it, or None if it was written already."""
+        with self._lock:
+            return self._records.get(id)
+
+    def release(self, id: str) -> Optional[Dict]:
+        """Removes and returns the held record, or None if it was written already."""
+        with self._lock:
+            return self._records.pop(id, None)
+
+
+pending_generations = PendingGenerations()
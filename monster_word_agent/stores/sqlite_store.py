@@ -0,0 +1,265 @@
+import glob
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .base import GenerationStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    id TEXT PRIMARY KEY,
+    language TEXT,
+    age INTEGER,
+    status TEXT,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_generations_profile
+    ON generations (language, age, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_generations_status
+    ON generations (status);
+CREATE TABLE IF NOT EXISTS inventory (
+    id TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    state TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    claimed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_inventory_profile
+    ON inventory (profile, state, created_at);
+"""
+
+
+def _resolve_timestamps(fields: Dict) -> Dict:
+    from google.cloud import firestore
+
+    now = datetime.now().isoformat()
+    return {
+        key: now if value is firestore.SERVER_TIMESTAMP else value
+        for key, value in fields.items()
+    }
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _merge(current: Dict, fields: Dict) -> Dict:
+    """
+    Merges `fields` into a record as Firestore `set(merge=True)` does: nested
+    maps are merged key by key and None values are stored, not deleted (as
+    SQLite's RFC 7396 `json_patch` would).
+    """
+    merged = dict(current)
+    for key, value in fields.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+_WRITE = (
+    "INSERT INTO generations (id, language, age, status, created_at, data) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    "language = excluded.language, "
+    "age = excluded.age, "
+    "status = excluded.status, "
+    "created_at = excluded.created_at, "
+    "data = excluded.data"
+)
+
+
+def _row(doc: Dict) -> tuple:
+    user_input = doc.get("userInput") or {}
+    return (
+        doc["id"],
+        user_input.get("language"),
+        user_input.get("age"),
+        doc.get("status"),
+        doc.get("created_at"),
+        _json(doc),
+    )
+
+
+class SqliteGenerationStore(GenerationStore):
+    """
+    Local implementation for LOCAL_PERSISTENCE mode.
+
+    One SQLite database in WAL mode, with the queried fields (language, age,
+    status, created_at) in indexed columns next to the JSON document, so
+    history lookups and status updates never scan or rewrite files.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread: WAL lets readers run alongside the writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, doc: Dict) -> None:
+        doc = _resolve_timestamps(doc)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO generations (id, language, age, status, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                _row(doc),
+            )
+
+    def _read(self, conn: sqlite3.Connection, id: str) -> Optional[Dict]:
+        row = conn.execute("SELECT data FROM generations WHERE id = ?", (id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, id: str, fields: Dict) -> None:
+        fields = _resolve_timestamps(fields)
+        with self._connect() as conn:
+            # Read-modify-write under the write lock: concurrent writers queue
+            conn.execute("BEGIN IMMEDIATE")
+            doc = self._read(conn, id)
+            if doc is None:
+                raise KeyError(f"No generation with id {id}")
+            # Like Firestore `update`: the given top-level fields are replaced
+            conn.execute(_WRITE, _row({**doc, **fields}))
+
+    def upsert(self, id: str, fields: Dict) -> None:
+        self.bulk_upsert([(id, fields)])
+
+    def bulk_upsert(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        # One transaction for the whole batch: a single WAL commit
+        count = 0
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for id, fields in items:
+                fields = _resolve_timestamps({"id": id, **fields})
+                conn.execute(_WRITE, _row(_merge(self._read(conn, id) or {}, fields)))
+                count += 1
+        return count
+
+    def get(self, id: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            "SELECT data FROM generations WHERE id = ?", (id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def recent(self, language: str, age: int, limit: int) -> List[Dict]:
+        rows = self._connect().execute(
+            "SELECT data FROM generations WHERE language = ? AND age = ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (language, age, limit),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def stream(self, status: Optional[str] = None) -> Iterator[Dict]:
+        # A dedicated connection keeps the cursor independent of other calls
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if status is None:
+                cursor = conn.execute("SELECT data FROM generations ORDER BY created_at")
+            else:
+                cursor = conn.execute(
+                    "SELECT data FROM generations WHERE status = ? ORDER BY created_at",
+                    (status,),
+                )
+            for row in cursor:
+                yield json.loads(row[0])
+        finally:
+            conn.close()
+
+    def scan(self, fields: Sequence[str], limit: int, page_size: int = 500) -> Iterator[Dict]:
+        # Keyset pages on (created_at, id), each reading only the projected paths
+        extracts = ", ".join("json_extract(data, ?)" for _ in fields)
+        paths = [f"$.{path}" for path in fields]
+        columns = f"id, COALESCE(created_at, ''){', ' + extracts if fields else ''}"
+        last = None
+        remaining = limit
+        while remaining > 0:
+            size = min(page_size, remaining)
+            if last is None:
+                rows = self._connect().execute(
+                    f"SELECT {columns} FROM generations "
+                    "ORDER BY COALESCE(created_at, '') DESC, id DESC LIMIT ?",
+                    (*paths, size),
+                ).fetchall()
+            else:
+                rows = self._connect().execute(
+                    f"SELECT {columns} FROM generations "
+                    "WHERE (COALESCE(created_at, ''), id) < (?, ?) "
+                    "ORDER BY COALESCE(created_at, '') DESC, id DESC LIMIT ?",
+                    (*paths, *last, size),
+                ).fetchall()
+            for row in rows:
+                doc = {"id": row[0]}
+                for path, value in zip(fields, row[2:]):
+                    *parents, name = path.split(".")
+                    target = doc
+                    for parent in parents:
+                        target = target.setdefault(parent, {})
+                    target[name] = value
+                yield doc
+            if len(rows) < size:
+                return
+            remaining -= len(rows)
+            last = (rows[-1][1], rows[-1][0])
+
+    def add_to_inventory(self, id: str, profile: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO inventory (id, profile, state, created_at) "
+                "VALUES (?, ?, 'ready', ?)",
+                (id, profile, datetime.now().isoformat()),
+            )
+
+    def count_inventory(self, profile: str) -> int:
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM inventory WHERE profile = ? AND state = 'ready'",
+            (profile,),
+        ).fetchone()
+        return row[0]
+
+    def claim_inventory(self, profile: str) -> Optional[Dict]:
+        # A single UPDATE ... RETURNING: two workers can never claim the same card
+        with self._connect() as conn:
+            row = conn.execute(
+                "UPDATE inventory SET state = 'claimed', claimed_at = ? WHERE id = ("
+                "SELECT id FROM inventory WHERE profile = ? AND state = 'ready' "
+                "ORDER BY created_at LIMIT 1) RETURNING id",
+                (datetime.now().isoformat(), profile),
+            ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def import_json_files(self, directory: str) -> int:
+        """Imports the per-generation JSON files written by older local runs."""
+        imported = 0
+        for file_path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            with open(file_path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+            if "id" not in doc or self.get(doc["id"]) is not None:
+                continue
+            self.create(doc)
+            imported += 1
+        return imported
+
+
+# python -m monster_word_agent.stores.sqlite_store tmp
+if __name__ == "__main__":
+    from ..app_configs import configs
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "tmp"
+    store = SqliteGenerationStore(configs.sqlite_path)
+    print(f"Imported {store.import_json_files(directory)} records into {configs.sqlite_path}")
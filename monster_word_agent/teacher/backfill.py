@@ -0,0 +1,56 @@
+import threading
+import time
+
+from ..app_configs import configs
+from ..stores import get_generation_store
+from .dedup import sentence_index
+from .target_words import target_word_selector
+
+# The record fields the sentence index and the target word coverage read:
+# the scan is projected on them, so each page stays a few kilobytes
+BACKFILL_FIELDS = (
+    "userInput.language",
+    "userInput.age",
+    "userInput.targetWord",
+    "pedagogicalOutput.sentence",
+)
+
+_lock = threading.Lock()
+_started = False
+
+
+def _backfill() -> None:
+    consumers = []
+    if configs.dedup_enabled:
+        consumers.append(sentence_index.add)
+    if configs.target_word_lexicon:
+        consumers.append(target_word_selector.record)
+
+    started = time.monotonic()
+    loaded = 0
+    try:
+        for doc in get_generation_store().scan(BACKFILL_FIELDS, configs.backfill_limit):
+            for consume in consumers:
+                consume(doc)
+            loaded += 1
+        print(f"Backfill: loaded {loaded} generations in {time.monotonic() - started:.1f}s")
+    except Exception as e:
+        print(f"⚠️ Backfill stopped after {loaded} generations, older ones are not indexed: {e}")
+    finally:
+        sentence_index.mark_ready()
+
+
+def start_backfill() -> None:
+    """
+    Loads the newest `BACKFILL_LIMIT` generations into the sentence index and
+    the target word coverage, in one background scan shared by both. Does
+    nothing when neither is enabled, or once the scan has started.
+    """
+    global _started
+    if not (configs.dedup_enabled or configs.target_word_lexicon):
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_backfill, name="backfill", daemon=True).start()
@@ -0,0 +1,185 @@
+import hashlib
+import re
+import struct
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+from ..app_configs import configs
+
+ProfileKey = Tuple[str, int]
+
+# MinHash signatures of NUM_HASHES values, split into NUM_BANDS bands of
+# ROWS_PER_BAND for LSH: sentences with a Jaccard similarity of 0.7 share a
+# band with probability ~0.9, 0.8 with ~0.99, while unrelated ones (~0.1) do
+# not. Candidates are then confirmed on their exact similarity.
+NUM_HASHES = 32
+NUM_BANDS = 8
+ROWS_PER_BAND = NUM_HASHES // NUM_BANDS
+
+# One 64-byte BLAKE2b digest yields 16 hash values; salts make independent ones
+_SALTS = [bytes([i]) * 16 for i in range(NUM_HASHES // 16)]
+_unpack_digest = struct.Struct("<16I").unpack
+
+
+def normalize(sentence: str) -> List[str]:
+    """Lowercases, strips accents and punctuation, and splits into words."""
+    decomposed = unicodedata.normalize("NFKD", sentence.lower())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.findall(r"\w+", stripped)
+
+
+def shingles(sentence: str) -> FrozenSet[str]:
+    """Words and word pairs: short sentences are too small for character shingles."""
+    words = normalize(sentence)
+    return frozenset(words) | frozenset(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(items: FrozenSet[str]) -> Tuple[int, ...]:
+    rows = []
+    for item in items:
+        data = item.encode("utf-8")
+        row: Tuple[int, ...] = ()
+        for salt in _SALTS:
+            row += _unpack_digest(hashlib.blake2b(data, digest_size=64, salt=salt).digest())
+        rows.append(row)
+    return tuple(map(min, zip(*rows)))
+
+
+def band_keys(signature: Tuple[int, ...]) -> List[int]:
+    return [
+        hash(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+        for band in range(NUM_BANDS)
+    ]
+
+
+@dataclass
+class Duplicate:
+    id: str
+    sentence: str
+    similarity: float
+
+
+@dataclass
+class _ProfileIndex:
+    ids: List[str] = field(default_factory=list)
+    sentences: List[str] = field(default_factory=list)
+    # Band key -> entry (most buckets hold one, so no list is allocated for them)
+    bands: List[Dict[int, Union[int, List[int]]]] = field(
+        default_factory=lambda: [{} for _ in range(NUM_BANDS)]
+    )
+
+
+class SentenceIndex:
+    """
+    Near-duplicate index of every generated sentence, per (language, age).
+
+    The newest generations are loaded by the shared backfill scan (see
+    `backfill.start_backfill`), then the index is kept current by `add` when
+    a sentence is persisted. Lookups hash the candidate sentence and check its
+    LSH buckets, so they cost the same with ten or a few hundred thousand
+    sentences. Until the backfill completes, lookups report no duplicate
+    rather than wait.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._profiles: Dict[ProfileKey, _ProfileIndex] = {}
+        self._known_ids = set()
+        self._ready = threading.Event()
+        self._stats = {"lookups": 0, "duplicates": 0, "skipped_loading": 0}
+
+    def _insert(self, key: ProfileKey, id: str, sentence: str, keys: List[int]) -> None:
+        # Caller holds the lock
+        if id in self._known_ids:
+            return
+        profile = self._profiles.setdefault(key, _ProfileIndex())
+        position = len(profile.ids)
+        profile.ids.append(id)
+        profile.sentences.append(sentence)
+        self._known_ids.add(id)
+        for bucket, band_key in zip(profile.bands, keys):
+            entry = bucket.get(band_key)
+            if entry is None:
+                bucket[band_key] = position
+            elif isinstance(entry, list):
+                entry.append(position)
+            else:
+                bucket[band_key] = [entry, position]
+
+    def add(self, doc_data: Dict) -> None:
+        """Indexes a persisted generation."""
+        user_input = doc_data.get("userInput") or {}
+        sentence = (doc_data.get("pedagogicalOutput") or {}).get("sentence")
+        if not sentence:
+            return
+        # Hashed outside the lock: lookups are not held up by a bulk load
+        keys = band_keys(minhash(shingles(sentence)))
+        with self._lock:
+            self._insert((user_input.get("language"), user_input.get("age")), doc_data["id"], sentence, keys)
+
+    def mark_ready(self) -> None:
+        """Called by the backfill once it has loaded (or failed to load) the stored sentences."""
+        self._ready.set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def find_duplicate(self, language: str, age: int, sentence: str, id: Optional[str] = None) -> Optional[Duplicate]:
+        """
+        Returns the most similar indexed sentence of the profile if its
+        Jaccard similarity reaches `threshold`. The record `id` itself (a
+        retried persist) is never reported.
+        """
+        if not self._ready.is_set():
+            with self._lock:
+                self._stats["skipped_loading"] += 1
+            return None
+
+        candidate_shingles = shingles(sentence)
+        keys = band_keys(minhash(candidate_shingles))
+
+        with self._lock:
+            self._stats["lookups"] += 1
+            profile = self._profiles.get((language, age))
+            if profile is None:
+                return None
+            positions = set()
+            for bucket, band_key in zip(profile.bands, keys):
+                entry = bucket.get(band_key)
+                if entry is None:
+                    continue
+                positions.update(entry if isinstance(entry, list) else (entry,))
+            candidates = [(profile.ids[p], profile.sentences[p]) for p in positions]
+
+        best = None
+        for candidate_id, candidate_sentence in candidates:
+            if candidate_id == id:
+                continue
+            similarity = jaccard(candidate_shingles, shingles(candidate_sentence))
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = Duplicate(candidate_id, candidate_sentence, similarity)
+
+        if best is not None:
+            with self._lock:
+                self._stats["duplicates"] += 1
+        return best
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["profiles"] = len(self._profiles)
+            stats["sentences"] = len(self._known_ids)
+        stats["ready"] = self._ready.is_set()
+        return stats
+
+
+sentence_index = SentenceIndex(threshold=configs.dedup_threshold)
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+from ..app_configs import configs
+from ..stores import get_generation_store
+
+ProfileKey = Tuple[str, int]
+
+
+def _history_entry(doc_data: Dict) -> Dict:
+    # Only the fields needed to format the history: keeps buffers and summaries small
+    user_input = doc_data.get("userInput") or {}
+    pedagogical = doc_data.get("pedagogicalOutput") or {}
+    return {
+        "id": doc_data.get("id"),
+        "userInput": {
+            "targetWord": user_input.get("targetWord"),
+            "theme": user_input.get("theme"),
+        },
+        "pedagogicalOutput": {"sentence": pedagogical.get("sentence")},
+    }
+
+
+class HistoryService:
+    """
+    Serves the recent generations of each (language, age) profile.
+
+    Each profile has a bounded in-memory ring buffer, newest first, filled on
+    first use and kept current by `record` (called when a generation is
+    persisted). Buffers are reloaded after `ttl_seconds` to pick up writes made
+    by other workers. With `use_summary`, stores that keep a materialized
+    summary (Firestore) load a profile from a single document instead of a
+    filtered, ordered query.
+    """
+
+    def __init__(self, limit: int, ttl_seconds: float, use_summary: bool):
+        self.limit = limit
+        self.ttl_seconds = ttl_seconds
+        self.use_summary = use_summary
+        self._lock = threading.Lock()
+        self._buffers: Dict[ProfileKey, Deque[Dict]] = {}
+        self._loaded_at: Dict[ProfileKey, float] = {}
+        self._stats = {"hits": 0, "misses": 0, "summary_reads": 0, "query_reads": 0}
+
+    def recent(self, language: str, age: int) -> List[Dict]:
+        """Returns up to `limit` history entries for the profile, newest first."""
+        key = (language, age)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is not None and time.monotonic() - self._loaded_at[key] < self.ttl_seconds:
+                self._stats["hits"] += 1
+                return list(buffer)
+            self._stats["misses"] += 1
+
+        entries = self._load(language, age)
+
+        with self._lock:
+            self._buffers[key] = deque(entries, maxlen=self.limit)
+            self._loaded_at[key] = time.monotonic()
+        return entries
+
+    def record(self, doc_data: Dict) -> None:
+        """Write-through update after a generation has been persisted."""
+        user_input = doc_data.get("userInput") or {}
+        key = (user_input.get("language"), user_input.get("age"))
+        entry = _history_entry(doc_data)
+
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is not None and all(item.get("id") != entry["id"] for item in buffer):
+                buffer.appendleft(entry)
+
+        if self.use_summary:
+            try:
+                get_generation_store().prepend_profile_summary(*key, entry, self.limit)
+            except Exception as e:
+                print(f"⚠️ Failed to update history summary for {key}: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["profiles"] = len(self._buffers)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _load(self, language: str, age: int) -> List[Dict]:
+        store = get_generation_store()
+
+        if self.use_summary:
+            summary = store.load_profile_summary(language, age)
+            if summary is not None:
+                with self._lock:
+                    self._stats["summary_reads"] += 1
+                return summary[: self.limit]
+
+        with self._lock:
+            self._stats["query_reads"] += 1
+        entries = [_history_entry(doc) for doc in store.recent(language, age, self.limit)]
+
+        if self.use_summary:
+            # Backfill so the next cold load costs a single document read
+            store.save_profile_summary(language, age, entries)
+        return entries
+
+
+history_service = HistoryService(
+    limit=configs.history_limit,
+    ttl_seconds=configs.history_cache_ttl_seconds,
+    use_summary=configs.history_summary_enabled,
+)
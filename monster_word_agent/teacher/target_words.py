@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..app_configs import configs
+from .history import history_service
+
+ProfileKey = Tuple[str, int]
+
+LEXICON_DIR = os.path.join(os.path.dirname(__file__), "lexicon")
+
+# The age bands of the designer instructions; a missing age is treated as 6
+DEFAULT_AGE = 6
+
+# Ids already counted, so a generation seen by the history seed, the backfill
+# and `record` counts once. Repeats arrive close together (a retried persist,
+# a backfill page overlapping live writes), so the oldest ids can be dropped.
+MAX_KNOWN_IDS = 50_000
+
+
+def age_band(age: Optional[int]) -> str:
+    age = DEFAULT_AGE if age is None else int(age)
+    if age <= 4:
+        return "2-4"
+    if age <= 7:
+        return "5-7"
+    return "8+"
+
+
+def load_lexicon(lexicon_dir: str = LEXICON_DIR) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Loads the packaged lexicons: one `<language>.json` file per language,
+    mapping each age band to its candidate words in teaching order.
+    """
+    lexicon = {}
+    for filename in sorted(os.listdir(lexicon_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(lexicon_dir, filename), encoding="utf-8") as f:
+                lexicon[filename[: -len(".json")]] = json.load(f)
+    return lexicon
+
+
+@dataclass
+class _ProfileCoverage:
+    # Times each (lowercased) word was taught to the profile
+    counts: Dict[str, int] = field(default_factory=dict)
+    cursor: int = 0
+    # Words taught at most `round` times are still due
+    round: int = 0
+    seeded: bool = False
+
+
+class TargetWordSelector:
+    """
+    Picks the target word of a card from the packaged lexicon, so the
+    designer no longer has to choose (and remember) one itself.
+
+    Each (language, age) profile walks its age band's words in order, skipping
+    words it was already taught, and starts a new round once every word has
+    been taught. The walk only moves forward, so a pick is O(1) amortized and
+    concurrent requests for a profile get different words.
+
+    Coverage is kept current by `record` when a generation is persisted. A
+    profile is seeded from its recent history on first use, and the shared
+    backfill scan (see `backfill.start_backfill`) catches up with older cards
+    and other workers.
+    """
+
+    def __init__(self, lexicon: Dict[str, Dict[str, List[str]]]):
+        self.lexicon = lexicon
+        self._lock = threading.Lock()
+        self._profiles: Dict[ProfileKey, _ProfileCoverage] = {}
+        self._known_ids: "OrderedDict[str, None]" = OrderedDict()
+        self._stats = {"picks": 0, "new_rounds": 0, "unsupported": 0}
+
+    def _count(self, key: ProfileKey, id: Optional[str], word: Optional[str]) -> None:
+        # Caller holds the lock
+        if not word or (id is not None and id in self._known_ids):
+            return
+        if id is not None:
+            self._known_ids[id] = None
+            if len(self._known_ids) > MAX_KNOWN_IDS:
+                self._known_ids.popitem(last=False)
+        counts = self._profiles.setdefault(key, _ProfileCoverage()).counts
+        word = word.strip().lower()
+        counts[word] = counts.get(word, 0) + 1
+
+    def record(self, doc_data: Dict) -> None:
+        """Counts the target word of a persisted generation as taught."""
+        user_input = doc_data.get("userInput") or {}
+        key = (user_input.get("language"), user_input.get("age"))
+        with self._lock:
+            self._count(key, doc_data.get("id"), user_input.get("targetWord"))
+
+    def _seed(self, language: str, age: int) -> None:
+        key = (language, age)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None and profile.seeded:
+                return
+
+        # Served from the history cache, which get_previous_sentences warms anyway
+        entries = history_service.recent(language, age)
+
+        with self._lock:
+            profile = self._profiles.setdefault(key, _ProfileCoverage())
+            if profile.seeded:
+                return
+            profile.seeded = True
+            for entry in entries:
+                self._count(key, entry.get("id"), (entry.get("userInput") or {}).get("targetWord"))
+
+    def pick(self, language: str, age: Optional[int]) -> Optional[str]:
+        """
+        Returns the next target word due for the profile.
+
+        Args:
+            language (str): The ISO code of the card's language.
+            age (Optional[int]): The child's age; None is treated as 6.
+
+        Returns:
+            Optional[str]: The word, or None if the language has no lexicon
+                (the designer then picks one itself).
+        """
+        words = self.lexicon.get(language, {}).get(age_band(age))
+        if not words:
+            with self._lock:
+                self._stats["unsupported"] += 1
+            return None
+
+        self._seed(language, age)
+
+        with self._lock:
+            profile = self._profiles[(language, age)]
+            self._stats["picks"] += 1
+            while True:
+                for _ in range(len(words)):
+                    word = words[profile.cursor % len(words)]
+                    profile.cursor += 1
+                    if profile.counts.get(word.lower(), 0) <= profile.round:
+                        return word
+                # Every word was taught this round
+                profile.round += 1
+                self._stats["new_rounds"] += 1
+
+    def coverage(self, language: str, age: Optional[int]) -> float:
+        """The share of the profile's age band words taught at least once."""
+        words = self.lexicon.get(language, {}).get(age_band(age)) or []
+        with self._lock:
+            profile = self._profiles.get((language, age))
+            if not words or profile is None:
+                return 0.0
+            return sum(1 for word in words if profile.counts.get(word.lower())) / len(words)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            profiles = list(self._profiles)
+        stats["profiles"] = {
+            f"{language}-{age}": round(self.coverage(language, age), 3) for language, age in profiles
+        }
+        return stats
+
+
+target_word_selector = TargetWordSelector(load_lexicon())
+
+
+def _find_user_request(llm_request) -> Optional[Tuple[Any, Dict]]:
+    # The card request is the JSON text of the first user message
+    for content in llm_request.contents or []:
+        if content.role != "user":
+            continue
+        for part in content.parts or []:
+            if not part.text:
+                continue
+            try:
+                request = json.loads(part.text)
+            except ValueError:
+                continue
+            if isinstance(request, dict) and "language" in request:
+                return part, request
+        return None
+    return None
+
+
+async def assign_target_word(callback_context, llm_request) -> None:
+    """
+    `before_model_callback` filling a missing `targetWord` of the card
+    request from the lexicon.
+
+    The word is chosen on the first model call of the run and reused by the
+    later ones (tool call rounds), so the designer sees the same request
+    throughout.
+    """
+    found = _find_user_request(llm_request)
+    if found is None:
+        return None
+    part, request = found
+    if request.get("targetWord"):
+        return None
+
+    state_key = f"temp:target_word:{callback_context.invocation_id}"
+    word = callback_context.state.get(state_key)
+    if word is None:
+        from .backfill import start_backfill
+
+        start_backfill()
+        word = await asyncio.to_thread(target_word_selector.pick, request.get("language"), request.get("age"))
+        if word is None:
+            return None
+        callback_context.state[state_key] = word
+
+    request["targetWord"] = word
+    # ADK builds the request contents from copies: the session event is unchanged
+    part.text = json.dumps(request, ensure_ascii=False)
+    return None
+
+
+def target_word_callbacks() -> List:
+    """The designer's `before_model_callback`s for target word selection, none when disabled."""
+    if not configs.target_word_lexicon:
+        return []
+    return [assign_target_word]
+
+
+def get_target_word_stats() -> Dict:
+    """
+    Reports the lexicon picks and each profile's coverage of its age band.
+
+    Returns:
+        Dict: Picks, new rounds, requests in unsupported languages, and the
+            share of the lexicon taught per profile.
+    """
+    return target_word_selector.stats()
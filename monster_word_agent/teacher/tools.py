@@ -1,14 +1,20 @@
-from typing import TypedDict, Literal, List
+from typing import Dict, NotRequired, TypedDict, Literal, List, Optional
 import uuid
-import json
-import os
-from datetime import datetime
 
-from google.cloud import firestore
-from google.cloud.firestore_v1.base_query import FieldFilter
+from google.adk.tools.tool_context import ToolContext
 
-from ..database import db
+from .. import progress
 from ..app_configs import configs
+from ..cache import content_hash
+from ..stores import get_generation_store
+from ..stores.pending import pending_generations
+from .backfill import start_backfill
+from .dedup import sentence_index
+from .history import history_service
+from .target_words import target_word_selector
+
+GENERATION_NAMESPACE = uuid.UUID("6f1d8e0c-3b52-4f5e-9a57-2d0c9b7f4a11")
+SUPPORTED_LANGUAGES = ("en", "fr", "es")
 
 
 class UserInput(TypedDict):
@@ -18,16 +24,22 @@ class UserInput(TypedDict):
     targetWord: str
 
 
+class Translation(TypedDict):
+    sentence: str
+    targetWord: str
+
+
 class PedagogicalOutput(TypedDict):
     sentence: str
     learningGoal: str
     tags: List[str]
+    translations: NotRequired[Dict[str, Translation]]
 
 
 def get_previous_sentences(userInput) -> str:
     """
     Retrieves the last 25 generated sentences for a specific profile (age + language),
-    sorted by newest first.
+    sorted by newest first. Served from the per-profile history cache.
 
     Args:
         userInput (dict): Must contain 'age' (int) and 'language' (str).
@@ -38,22 +50,11 @@ def get_previous_sentences(userInput) -> str:
     try:
         target_lang = userInput.get("language")
         target_age = userInput.get("age")
-        limit = 25
 
         if not target_lang or not target_age:
             return "Error: userInput must provide 'language' and 'age' to fetch history."
-        
-        ref = db.collection(configs.generation_collection_name)
-        query = (
-            ref
-            .where(filter=FieldFilter("userInput.language", "==", target_lang))
-            .where(filter=FieldFilter("userInput.age", "==", target_age))
-            .order_by("created_at", direction=firestore.Query.DESCENDING)
-            .limit(limit)
-        )
-                
-        docs = query.stream()
-        results = [doc.to_dict() for doc in docs]
+
+        results = history_service.recent(target_lang, target_age)
 
         if not results:
             return "History: No previous sentences found for this profile."
@@ -83,13 +84,61 @@ def get_previous_sentences(userInput) -> str:
         return f"System Error retrieving history: {str(e)}"
 
 
-def persist_learning_data(userInput, pedagogicalOutput) -> str:
+def generation_id(scope: str, userInput, pedagogicalOutput) -> str:
+    """
+    Derives the generation id from the request `scope` (the ADK invocation)
+    and the content, so a retried tool call upserts the same record while
+    two requests producing the same card still get their own.
+    """
+    return str(uuid.uuid5(GENERATION_NAMESPACE, content_hash(scope, userInput, pedagogicalOutput)))
+
+
+def sibling_id(id: str, language: str) -> str:
+    """Id of the card sharing the image of generation `id`, in another language."""
+    return str(uuid.uuid5(GENERATION_NAMESPACE, f"{id}/{language}"))
+
+
+def sibling_translations(language: str, translations: Optional[Dict]) -> Dict[str, Dict]:
+    """The usable translations of a card: supported languages other than its own, with a sentence."""
+    return {
+        sibling_language: translation
+        for sibling_language, translation in (translations or {}).items()
+        if sibling_language in SUPPORTED_LANGUAGES
+        and sibling_language != language
+        and isinstance(translation, dict)
+        and translation.get("sentence")
+    }
+
+
+def _record_generation(doc_data: Dict) -> None:
+    if configs.single_write:
+        # Written once, together with the media paths
+        pending_generations.hold(doc_data)
+    else:
+        get_generation_store().upsert(doc_data["id"], doc_data)
+
+    history_service.record(doc_data)
+    if configs.dedup_enabled:
+        sentence_index.add(doc_data)
+    if configs.target_word_lexicon:
+        target_word_selector.record(doc_data)
+
+    if configs.speculative_tts:
+        # Takes speech off the critical path: the builder picks it up
+        from ..builder.tools.speculative import start_speculative_speech
+
+        start_speculative_speech(
+            doc_data["id"], doc_data["pedagogicalOutput"]["sentence"], doc_data["userInput"]["language"]
+        )
+
+
+def persist_learning_data(userInput, pedagogicalOutput, tool_context: Optional[ToolContext] = None) -> str:
     """
     Persists the generated pedagogical content and user context to the database.
 
     This function acts as a tool for the PedagogicalArchitect agent. It accepts
     the finalized user constraints and the generated learning content and attempts
-    to save them to Firestore.
+    to save them to the generation store (Firestore, or SQLite in local mode).
 
     Args:
         userInput (UserInput): A dictionary containing the learner's profile and
@@ -104,30 +153,77 @@ def persist_learning_data(userInput, pedagogicalOutput) -> str:
             - 'sentence': The generated learning sentence.
             - 'learningGoal': Metadata explaining the pedagogical intent.
             - 'tags': A list of 2-5 lowercase, single-word descriptive tags.
+            May include:
+            - 'translations': For multilingual requests, the sentence and
+              target word in each other requested language, keyed by ISO
+              code. Each one is persisted as a sibling card sharing the image.
+
+        tool_context (Optional[ToolContext]): Set by ADK; its invocation scopes
+            the generation id, so retries within a run are idempotent.
 
     Returns:
         Optional[str]:
             - Returns the **unique document ID (UUID)** if persistence is successful.
+            - Returns an **"Error: near-duplicate..."** message, quoting the earlier
+              sentence, if the sentence is too close to one already generated
+              for this age and language. Nothing is persisted.
             - Returns **None** if the database operation fails.
     """
     try:
-        unique_id = str(uuid.uuid4())
+        store = get_generation_store()
+        # Without an invocation (direct calls) every call is its own request
+        scope = tool_context.invocation_id if tool_context is not None else uuid.uuid4().hex
+        unique_id = generation_id(scope, userInput, pedagogicalOutput)
+
+        if configs.dedup_enabled:
+            start_backfill()
+            duplicate = sentence_index.find_duplicate(
+                userInput.get("language"),
+                userInput.get("age"),
+                pedagogicalOutput.get("sentence") or "",
+                unique_id,
+            )
+            if duplicate is not None:
+                return (
+                    f"Error: near-duplicate sentence, not persisted. It is {duplicate.similarity:.0%} "
+                    f"similar to an earlier card: \"{duplicate.sentence}\". Write a new sentence with a "
+                    f"different structure, action and objects, then call persist_learning_data again."
+                )
 
         doc_data = {
             "id": unique_id,
             "userInput": userInput,
             "pedagogicalOutput": pedagogicalOutput,
             "status": "initialized",
-            "created_at": firestore.SERVER_TIMESTAMP,
+            "created_at": store.server_timestamp(),
         }
 
-        if configs.local_persistence:
-            doc_data["created_at"] = datetime.now().isoformat()
-            with open(os.path.join("tmp", f"{unique_id}.json"), "w",  encoding="utf-8") as f:
-                json.dump(doc_data, f, indent=4)
-        else:
-            doc_ref = db.collection(configs.generation_collection_name).document(unique_id)
-            doc_ref.set(doc_data)
+        _record_generation(doc_data)
+
+        translations = sibling_translations(userInput.get("language"), pedagogicalOutput.get("translations"))
+        for language, translation in translations.items():
+            _record_generation(
+                {
+                    "id": sibling_id(unique_id, language),
+                    "userInput": {**userInput, "language": language, "targetWord": translation.get("targetWord")},
+                    "pedagogicalOutput": {
+                        **{key: value for key, value in pedagogicalOutput.items() if key != "translations"},
+                        "sentence": translation["sentence"],
+                    },
+                    # Siblings are composited from the raw image of the requested card
+                    "sibling_of": unique_id,
+                    "raw_image_id": unique_id,
+                    "status": "initialized",
+                    "created_at": store.server_timestamp(),
+                }
+            )
+
+        progress.emit(
+            progress.SENTENCE_PERSISTED,
+            id=unique_id,
+            sentence=(pedagogicalOutput or {}).get("sentence"),
+            language=(userInput or {}).get("language"),
+        )
 
         return unique_id
 
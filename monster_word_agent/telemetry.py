@@ -0,0 +1,145 @@
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from opentelemetry import trace
+
+# Per-stage spans and Prometheus-style metrics for the card pipeline. Labels
+# that are known only at the top of a request (language, trace id) are bound
+# once in a context variable, which asyncio tasks and `asyncio.to_thread`
+# copy, so nested tools do not need extra arguments.
+
+tracer = trace.get_tracer("monster_word_agent")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+_labels: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar("telemetry_labels", default={})
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{{{_format_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, label_names: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            counts, total = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._values[labels] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                label_text = _format_labels(self.label_names, labels)
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {counts[-1]}')
+                lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+                lines.append(f"{self.name}_count{{{label_text}}} {counts[-1]}")
+        return lines
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+stage_latency = Histogram(
+    "card_stage_latency_seconds", "Latency of each card pipeline stage.", ("stage", "language")
+)
+stage_errors = Counter(
+    "card_stage_errors_total", "Failed card pipeline stages.", ("stage", "language")
+)
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the active OpenTelemetry span, else the one bound to the request."""
+    context = trace.get_current_span().get_span_context()
+    if context.is_valid:
+        return format(context.trace_id, "032x")
+    return _labels.get().get("trace_id")
+
+
+@contextmanager
+def bind(**labels: str) -> Iterator[None]:
+    """Binds labels (e.g. language) to every stage and log line of the current request."""
+    merged = {**_labels.get(), **labels}
+    if "trace_id" not in merged:
+        merged["trace_id"] = current_trace_id() or uuid.uuid4().hex
+    token = _labels.set(merged)
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Times one pipeline stage in a span and in `card_stage_latency_seconds`.
+
+    Exceptions are counted in `card_stage_errors_total` and re-raised.
+    """
+    language = _labels.get().get("language", "unknown")
+    start = time.perf_counter()
+    with tracer.start_as_current_span(f"card.{name}") as span:
+        span.set_attribute("card.stage", name)
+        span.set_attribute("card.language", language)
+        try:
+            yield
+        except BaseException:
+            stage_errors.inc((name, language))
+            raise
+        finally:
+            stage_latency.observe((name, language), time.perf_counter() - start)
+
+
+def count_error(name: str) -> None:
+    """Counts a stage that reported failure through its return value instead of raising."""
+    stage_errors.inc((name, _labels.get().get("language", "unknown")))
+
+
+def log(message: str) -> None:
+    """Prints `message` prefixed with the current trace id, when there is one."""
+    trace_id = current_trace_id()
+    print(f"[trace={trace_id}] {message}" if trace_id else message)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = stage_latency.render() + stage_errors.render()
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,12 @@
+import os
+
+# app_configs reads these at import; the tests never reach the services
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test-project")
+os.environ.setdefault("GOOGLE_CLOUD_LOCATION", "us-central1")
+os.environ.setdefault("GOOGLE_CLOUD_MEDIA_BUCKET", "test-bucket")
+os.environ.setdefault("MEDIA_GENERATION_MODEL", "test-image-model")
+os.environ.setdefault("LLM_MODEL", "test-llm-model")
+os.environ.setdefault(
+    "MEDIA_COMPOSE_FONT_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "Roboto-Regular.ttf"),
+)
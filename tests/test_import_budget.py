@@ -0,0 +1,24 @@
+import os
+import statistics
+
+from benchmarks.bench_import import measure
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ADK and google.genai take seconds to import whatever this package does:
+# they are preloaded, so the budget only covers the package's own modules
+THIRD_PARTY = ["google.adk.agents", "google.adk.models", "google.adk.runners", "google.genai.types"]
+BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "500"))
+
+
+def test_agent_import_stays_within_budget():
+    results = [measure("monster_word_agent.agent", THIRD_PARTY, cwd=REPO_ROOT) for _ in range(3)]
+
+    median_ms = statistics.median(result["import_ms"] for result in results)
+    assert median_ms < BUDGET_MS, f"import took {median_ms:.0f} ms, over the {BUDGET_MS:.0f} ms budget"
+
+
+def test_agent_import_defers_clients_and_pillow():
+    loaded = measure("monster_word_agent.agent", cwd=REPO_ROOT)["loaded"]
+
+    assert loaded == [], f"loaded at import instead of on first use: {', '.join(loaded)}"
@@ -0,0 +1,58 @@
+import os
+import uuid
+
+import pytest
+
+from monster_word_agent.stores.sqlite_store import SqliteGenerationStore
+
+
+def _sqlite_store(tmp_path):
+    return SqliteGenerationStore(str(tmp_path / "generations.db"))
+
+
+def _firestore_store(tmp_path):
+    if not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        pytest.skip("FIRESTORE_EMULATOR_HOST is not set")
+    from monster_word_agent.stores.firestore_store import FirestoreGenerationStore
+
+    suffix = uuid.uuid4().hex
+    return FirestoreGenerationStore(f"generations-{suffix}", f"profiles-{suffix}", f"inventory-{suffix}")
+
+
+@pytest.fixture(params=[_sqlite_store, _firestore_store], ids=["sqlite", "firestore"])
+def store(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def test_upsert_keeps_null_fields(store):
+    store.upsert("a", {"status": "initialized", "userInput": {"theme": "Space", "age": 5}})
+    store.upsert("a", {"userInput": {"theme": None, "targetWord": None, "age": 5}})
+
+    assert store.get("a")["userInput"] == {"theme": None, "targetWord": None, "age": 5}
+
+
+def test_upsert_merges_nested_fields(store):
+    store.upsert("a", {"userInput": {"language": "en", "age": 5}, "final_audio_path": None})
+    store.upsert("a", {"userInput": {"theme": None}, "status": "completed"})
+
+    doc = store.get("a")
+    assert doc["userInput"] == {"language": "en", "age": 5, "theme": None}
+    assert doc["final_audio_path"] is None
+    assert doc["status"] == "completed"
+
+
+def test_update_replaces_top_level_fields(store):
+    store.upsert("a", {"userInput": {"language": "en", "age": 5}})
+    store.update("a", {"userInput": {"language": "fr"}, "status": None})
+
+    doc = store.get("a")
+    assert doc["userInput"] == {"language": "fr"}
+    assert doc["status"] is None
+
+
+def test_bulk_upsert_keeps_null_fields(store):
+    written = store.bulk_upsert([("a", {"status": None}), ("b", {"userInput": {"theme": None}})])
+
+    assert written == 2
+    assert store.get("a")["status"] is None
+    assert store.get("b")["userInput"] == {"theme": None}